@@ -54,6 +54,9 @@ async def connect(url: str = DEFAULT_URL,
             await rmq_client.close()
 
 __all__ = [
+    'bridge',
+    'cache',
+    'channel',
     'client',
     'connect',
     'DEFAULT_PRODUCT',
@@ -61,6 +64,11 @@ __all__ = [
     'DEFAULT_URL',
     'exceptions',
     'message',
+    'metrics',
+    'pool',
+    'template',
+    'tracing',
     'types',
-    'version'
+    'version',
+    'workers'
 ]
@@ -0,0 +1,220 @@
+# coding: utf-8
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import logging
+import typing
+
+from pamqp import frame
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH = 1000
+
+# Queued messages are (frames, future) tuples, a flush marker has no frames
+_Entry = typing.Tuple[typing.Optional[typing.List[frame.FrameTypes]],
+                      typing.Optional[concurrent.futures.Future]]
+
+
+class ThreadSafePublisher:
+    """Publishes messages from threads other than the one running the
+    IOLoop of the :class:`~aiorabbit.client.Client`, created with
+    :meth:`Client.threadsafe_publisher
+    <aiorabbit.client.Client.threadsafe_publisher>`.
+
+    :meth:`publish` validates the message in the calling thread and appends
+    it to a :class:`~collections.deque`, waking the IOLoop with
+    :meth:`~asyncio.loop.call_soon_threadsafe` only if it is not already
+    scheduled to publish. On the IOLoop, all of the queued messages, up to
+    ``max_batch`` at a time, are written to the socket in a single write, so
+    the cost of waking the IOLoop is shared by every message queued while it
+    was busy.
+
+    If the publisher is created with ``futures`` set, :meth:`publish` returns
+    a :class:`concurrent.futures.Future` that resolves to `True` or `False`
+    once RabbitMQ confirms the message if publisher confirms are enabled, or
+    to `None` once the message is written otherwise. If the message can not
+    be published, the future raises the exception. Without ``futures``,
+    publishing errors and negatively acknowledged messages are logged.
+
+    :param client: **For internal use only**
+    :param futures: **For internal use only**
+    :param max_batch: **For internal use only**
+
+    .. code-block:: python3
+       :caption: Example Usage
+
+        publisher = client.threadsafe_publisher(futures=True)
+
+        def handle_request(request):  # Invoked in a WSGI worker thread
+            future = publisher.publish(
+                'events', 'request', json.dumps(request.json))
+            if not future.result(timeout=5):
+                raise RuntimeError('Event was not confirmed')
+
+    """
+    def __init__(self,
+                 client,
+                 futures: bool = False,
+                 max_batch: int = DEFAULT_MAX_BATCH):
+        self._client = client
+        self._futures = futures
+        self._max_batch = max_batch
+        self._queue: typing.Deque[_Entry] = collections.deque()
+        self._scheduled = False
+        self._task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of messages waiting to be written"""
+        return sum(1 for value in list(self._queue) if value[0] is not None)
+
+    def flush(self, timeout: typing.Optional[float] = None) -> None:
+        """Block until the messages queued before invoking flush are
+        written to the socket. Must not be invoked from the thread running
+        the IOLoop of the client.
+
+        :param timeout: The maximum number of seconds to wait
+        :raises RuntimeError: if invoked from the thread running the IOLoop
+        :raises concurrent.futures.TimeoutError: if the timeout is exceeded
+
+        """
+        if self._in_loop_thread():
+            raise RuntimeError('flush must not be invoked in the IOLoop')
+        future = concurrent.futures.Future()
+        self._append((None, future))
+        future.result(timeout)
+
+    def publish(self, *args, **kwargs) \
+            -> typing.Optional[concurrent.futures.Future]:
+        """Queue a message to be published from any thread, returning a
+        :class:`concurrent.futures.Future` for the message if the publisher
+        was created with ``futures``.
+
+        The message is validated before it is queued. Accepts the same
+        arguments as :meth:`Client.publish
+        <aiorabbit.client.Client.publish>`.
+
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if the value of one an argument does not validate
+
+        """
+        frames = self._client._message_frames(*args, **kwargs)
+        future = concurrent.futures.Future() if self._futures else None
+        self._append((frames, future))
+        return future
+
+    def _append(self, value: _Entry) -> None:
+        """Queue the value, waking the IOLoop if it is not already going to
+        process the queue
+
+        """
+        self._queue.append(value)
+        if not self._scheduled:
+            self._scheduled = True
+            self._client._loop.call_soon_threadsafe(self._on_wakeup)
+
+    def _in_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._client._loop
+        except RuntimeError:
+            return False
+
+    def _on_wakeup(self) -> None:
+        """Invoked on the IOLoop to start publishing the queued messages.
+        The flag is cleared before the queue is read, so a message queued
+        after this point schedules another wakeup if it is not published by
+        the running task. The task is cleared as soon as it stops reading the
+        queue, so a wakeup is never ignored for a task that has finished.
+
+        """
+        self._scheduled = False
+        if self._task is None:
+            self._task = self._client._loop.create_task(self._publish())
+            self._task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        if self._task is task:  # Cancelled before it started
+            self._task = None
+        if not task.cancelled() and task.exception():
+            LOGGER.error('Error publishing queued messages: %r',
+                         task.exception())
+
+    async def _publish(self) -> None:
+        """Publish the queued messages until the queue is empty"""
+        try:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self._max_batch:
+                    entry = self._queue.popleft()
+                    if entry[0] is None:  # Flush marker
+                        await self._write(batch)
+                        batch = []
+                        entry[1].set_result(None)
+                        continue
+                    batch.append(entry)
+                await self._write(batch)
+        finally:
+            self._task = None
+
+    async def _write(self, batch: typing.List[_Entry]) -> None:
+        """Write the messages, limited by the ``max_in_flight`` window of
+        :meth:`Client.confirm_select
+        <aiorabbit.client.Client.confirm_select>` if it is set
+
+        """
+        offset = 0
+        while offset < len(batch):
+            try:
+                count = await self._client._wait_on_confirm_window() \
+                    or len(batch)
+                chunk = batch[offset:offset + count]
+                frames = [value for entry in chunk for value in entry[0]]
+                confirmations = await self._client._write_messages(
+                    len(chunk), functools.partial(
+                        self._client._marshal_frames, frames))
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                chunk = batch[offset:]
+                for _frames, future in chunk:
+                    if future is None:
+                        LOGGER.error('Failed to publish message: %r', error)
+                    elif future.set_running_or_notify_cancel():
+                        future.set_exception(error)
+                return
+            for (_frames, future), confirmation in zip(chunk, confirmations):
+                if future is not None \
+                        and not future.set_running_or_notify_cancel():
+                    future = None
+                if confirmation is None:
+                    if future is not None:
+                        future.set_result(None)
+                else:
+                    confirmation.add_done_callback(functools.partial(
+                        self._on_confirmation, future))
+            offset += len(chunk)
+
+    @staticmethod
+    def _on_confirmation(future: typing.Optional[concurrent.futures.Future],
+                         confirmation: asyncio.Future) -> None:
+        """Pass the publisher confirmation to the future for the message,
+        logging failures if there is no future
+
+        """
+        if confirmation.cancelled():
+            result = None
+            error = concurrent.futures.CancelledError()
+        else:
+            error = confirmation.exception()
+            result = None if error else confirmation.result()
+        if future is not None:
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        elif error:
+            LOGGER.error('Failed to publish message: %r', error)
+        elif not result:
+            LOGGER.warning('Published message was negatively acknowledged')
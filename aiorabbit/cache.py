@@ -0,0 +1,108 @@
+# coding: utf-8
+import collections
+import struct
+import typing
+
+from pamqp import commands, constants, header
+
+_CONTENT_HEADER = struct.Struct('>BHIHxxQ')
+
+
+class PropertiesCache:
+    """A bounded, least-recently-used cache of marshalled message properties,
+    used by :class:`~aiorabbit.client.Client` when it is created with a
+    ``properties_cache_size``.
+
+    Marshalling the :class:`~pamqp.commands.Basic.Properties` of a published
+    message, especially a ``headers`` field table with nested values, is a
+    large part of the cost of publishing. When the same properties are
+    published repeatedly, the cache returns the previously marshalled bytes
+    for them instead, keyed by a hashable snapshot of the property values.
+
+    The :attr:`hits` and :attr:`misses` counters can be used to determine if
+    the cache is effective and how large it should be.
+
+    :param max_size: The maximum number of marshalled properties to keep
+    :raises TypeError: if ``max_size`` is not an int
+    :raises ValueError: if ``max_size`` is less than 1
+
+    """
+    def __init__(self, max_size: int):
+        if not isinstance(max_size, int) or isinstance(max_size, bool):
+            raise TypeError('max_size must be of type int')
+        elif max_size < 1:
+            raise ValueError('max_size must be greater than 0')
+        self._max_size = max_size
+        self._values: typing.OrderedDict[tuple, bytes] = \
+            collections.OrderedDict()
+        self.hits = 0
+        """The number of properties returned from the cache"""
+        self.misses = 0
+        """The number of properties that were marshalled and cached"""
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def max_size(self) -> int:
+        """Returns the maximum number of marshalled properties to keep"""
+        return self._max_size
+
+    def clear(self) -> None:
+        """Remove all of the cached properties and reset the counters"""
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def marshal(self, value: header.ContentHeader, channel: int) -> bytes:
+        """Return the marshalled content header frame for the channel,
+        using the cached properties if they were marshalled before.
+
+        :param value: The content header frame to marshal
+        :param channel: The channel the frame is sent on
+
+        """
+        properties = self.marshal_properties(value.properties)
+        return b''.join([
+            _CONTENT_HEADER.pack(
+                constants.FRAME_HEADER, channel, len(properties) + 12,
+                commands.Basic.frame_id, value.body_size),
+            properties, constants.FRAME_END_CHAR])
+
+    def marshal_properties(self, value: commands.Basic.Properties) -> bytes:
+        """Return the marshalled properties, including the property flags
+
+        :param value: The properties to marshal
+
+        """
+        try:
+            key = tuple(_freeze(getattr(value, name))
+                        for name in value.__slots__)
+            result = self._values.get(key)
+        except TypeError:  # Unhashable value, do not cache it
+            return value.marshal()
+        if result is not None:
+            self.hits += 1
+            self._values.move_to_end(key)
+            return result
+        self.misses += 1
+        result = value.marshal()
+        self._values[key] = result
+        if len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+        return result
+
+
+def _freeze(value: typing.Any) -> typing.Hashable:
+    """Return a hashable snapshot of a property value. The type of each
+    value is included since values that compare equal, such as ``1`` and
+    ``True``, are marshalled differently.
+
+    """
+    if isinstance(value, dict):
+        return dict, tuple((k, _freeze(v)) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return value.__class__, tuple(_freeze(v) for v in value)
+    elif isinstance(value, bytearray):
+        return bytearray, bytes(value)
+    return value.__class__, value
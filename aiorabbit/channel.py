@@ -0,0 +1,123 @@
+# coding: utf-8
+import typing
+
+from pamqp import commands, frame
+
+from aiorabbit import client, exceptions, state
+
+
+class Channel(client.Client):
+    """An additional AMQP channel multiplexed over the connection of a
+    :class:`~aiorabbit.client.Client`, created with
+    :meth:`Client.channel <aiorabbit.client.Client.channel>`.
+
+    A channel provides the same AMQ and opinionated methods as the client,
+    but has its own state, RPC lock, publisher confirmation tracking, and
+    consumers. RPCs and publishing on one channel do not wait on those of
+    the client or of any other channel.
+
+    As with the client, if RabbitMQ closes the channel due to an error, the
+    exception is raised and the channel is reopened. Channels are not
+    restored when the connection is closed or reconnects, and using a
+    channel after it is closed raises
+    :exc:`~aiorabbit.exceptions.ChannelClosedException`.
+
+    :param connection: **For internal use only**
+    :param channel_id: **For internal use only**
+    :param on_return: An optional callback method to be invoked if the server
+        returns a message published on the channel.
+
+    """
+    def __init__(self,
+                 connection: client.Client,
+                 channel_id: int,
+                 on_return: typing.Optional[typing.Callable] = None):
+        super().__init__(str(connection._url),
+                         connection._defaults.locale,
+                         connection._defaults.product,
+                         connection._loop,
+                         on_return,
+                         connection._ssl_context)
+        # Exceptions on the IOLoop belong to the client that owns it
+        self._loop.set_exception_handler(connection._on_exception)
+        self._channel = channel_id
+        self._channel0 = connection._channel0
+        self._client = connection
+        self._max_frame_size = connection._max_frame_size
+        self._frame_received_callbacks = \
+            connection._frame_received_callbacks
+        self._frame_sent_callbacks = connection._frame_sent_callbacks
+        self._metrics = connection._metrics
+        self._properties_cache = connection._properties_cache
+        self._protocol = connection._protocol
+        self._transport = connection._transport
+        self._reset_state(client.STATE_OPENED)
+
+    async def connect(self) -> None:
+        """Channels are opened by
+        :meth:`Client.channel <aiorabbit.client.Client.channel>`
+
+        :raises RuntimeError: when invoked
+
+        """
+        raise RuntimeError('Channels are opened with Client.channel()')
+
+    async def close(self) -> None:
+        """Close the channel, leaving the connection open"""
+        async with self._close_lock:
+            if self.is_closed:
+                self._logger.warning('Close called when channel is not open')
+                return
+            if self._channel_open.is_set():
+                await self._send_rpc(
+                    commands.Channel.Close(200, 'Client Requested', 0, 0),
+                    client.STATE_CHANNEL_CLOSE_SENT,
+                    client.STATE_CHANNEL_CLOSEOK_RECEIVED)
+            self._release(exceptions.ChannelClosedException('Channel closed'))
+
+    async def channel(self,
+                      on_return: typing.Optional[typing.Callable] = None) \
+            -> 'Channel':
+        """Open a new channel on the connection the channel belongs to
+
+        .. seealso:: :meth:`Client.channel <aiorabbit.client.Client.channel>`
+
+        """
+        return await self._client.channel(on_return)
+
+    def _next_channel(self) -> int:
+        return self._channel
+
+    def _on_connection_closed(
+            self, exc: exceptions.AIORabbitException) -> None:
+        """Invoked by the client when the connection is closed, releasing the
+        channel and raising the exception in any waiters
+
+        """
+        self._release(exc)
+        self._set_state(state.STATE_EXCEPTION, exc)
+
+    async def _reconnect(self) -> None:
+        """The client owns the connection, so a channel can not reconnect"""
+        raise exceptions.ConnectionClosedException('Connection closed')
+
+    def _release(self, exc: exceptions.AIORabbitException) -> None:
+        self._client._channels.pop(self._channel, None)
+        self._channel_open.clear()
+        self._fail_confirmations(exc)
+        self._wake_consumers()
+        self._channel0 = None
+        self._protocol = None
+        self._transport = None
+
+    async def _send_rpc(self, value: frame.FrameTypes,
+                        new_state: int,
+                        *states: int) -> int:
+        if self.is_closed:
+            raise exceptions.ChannelClosedException('Channel is closed')
+        return await super()._send_rpc(value, new_state, *states)
+
+    def _write(self, data: typing.List[bytes]) -> None:
+        if self.is_closed:
+            raise exceptions.ChannelClosedException('Channel is closed')
+        super()._write(data)
@@ -5,7 +5,7 @@ import typing
 
 from pamqp import commands, constants, frame, header, heartbeat
 
-from aiorabbit import exceptions, state
+from aiorabbit import exceptions, metrics, state, tracing
 from aiorabbit.__version__ import version
 
 COMMANDS = typing.Union[commands.Connection.Blocked,
@@ -119,9 +119,13 @@ class Channel0(state.StateManager):
                  loop: asyncio.AbstractEventLoop,
                  max_channels: int,
                  product: str,
-                 on_remote_close: typing.Callable):
+                 on_remote_close: typing.Callable,
+                 metrics: typing.Optional[metrics.Metrics] = None,
+                 frame_callbacks: typing.Optional[
+                     typing.List[tracing.FrameCallback]] = None):
         super().__init__(loop)
         self.blocked = blocked
+        self._blocked_at: typing.Optional[float] = None
         self.max_channels = max_channels
         self.max_frame_size = constants.FRAME_MAX_SIZE
         self.properties: dict = {}
@@ -129,7 +133,9 @@ class Channel0(state.StateManager):
         self._heartbeat_timer: typing.Optional[asyncio.TimerHandle] = None
         self._last_error: typing.Tuple[int, typing.Optional[str]] = (0, None)
         self._last_heartbeat: int = 0
+        self._frame_callbacks = frame_callbacks
         self._locale = locale
+        self._metrics = metrics
         self._on_remote_close = on_remote_close
         self._password = password
         self._product = product
@@ -149,13 +155,16 @@ class Channel0(state.StateManager):
         elif isinstance(value, commands.Connection.Blocked):
             self._set_state(STATE_BLOCKED_RECEIVED)
             self.blocked.set()
+            if self._metrics is not None and self._blocked_at is None:
+                self._blocked_at = self._loop.time()
+                self._metrics.blocked += 1
         elif isinstance(value, commands.Connection.Unblocked):
             self._set_state(STATE_UNBLOCKED_RECEIVED)
             self.blocked.clear()
+            self._on_unblocked()
         elif isinstance(value, commands.Connection.Close):
             self._set_state(STATE_CLOSE_RECEIVED)
-            self._transport.write(
-                frame.marshal(commands.Connection.CloseOk(), 0))
+            self._write(commands.Connection.CloseOk())
             self._set_state(STATE_CLOSEOK_SENT)
             self._on_remote_close(value.reply_code, value.reply_text)
         elif isinstance(value, commands.Connection.CloseOk):
@@ -163,7 +172,7 @@ class Channel0(state.StateManager):
         elif isinstance(value, heartbeat.Heartbeat):
             self._set_state(STATE_HEARTBEAT_RECEIVED)
             self._last_heartbeat = self._loop.time()
-            self._transport.write(frame.marshal(heartbeat.Heartbeat(), 0))
+            self._write(heartbeat.Heartbeat())
             self._set_state(STATE_HEARTBEAT_SENT)
         else:
             self._set_state(state.STATE_EXCEPTION,
@@ -172,7 +181,7 @@ class Channel0(state.StateManager):
 
     async def open(self, transport: asyncio.Transport) -> bool:
         self._transport = transport
-        self._transport.write(frame.marshal(header.ProtocolHeader(), 0))
+        self._write(header.ProtocolHeader())
         self._set_state(STATE_PROTOCOL_HEADER_SENT)
         result = await self._wait_on_state(
             STATE_OPENOK_RECEIVED, STATE_CLOSEOK_SENT)
@@ -187,8 +196,8 @@ class Channel0(state.StateManager):
         if self._heartbeat_timer is not None:
             self._heartbeat_timer.cancel()
             self._heartbeat_timer = None
-        self._transport.write(frame.marshal(
-            commands.Connection.Close(code, 'Client Requested', 0, 0), 0))
+        self._write(
+            commands.Connection.Close(code, 'Client Requested', 0, 0))
         self._set_state(STATE_CLOSE_SENT)
         await self._wait_on_state(STATE_CLOSEOK_RECEIVED)
 
@@ -197,6 +206,7 @@ class Channel0(state.StateManager):
         if self._heartbeat_timer is not None:
             self._heartbeat_timer.cancel()
             self._heartbeat_timer = None
+        self._on_unblocked()
         self._reset_state(state.STATE_UNINITIALIZED)
         self._last_heartbeat = 0
         self._transport: typing.Optional[asyncio.Transport] = None
@@ -226,6 +236,13 @@ class Channel0(state.StateManager):
             self._heartbeat_timer = self._loop.call_later(
                 self._heartbeat_interval, self._heartbeat_check)
 
+    def _on_unblocked(self) -> None:
+        """Count the time the connection was blocked"""
+        if self._blocked_at is not None:
+            self._metrics.blocked_seconds += \
+                self._loop.time() - self._blocked_at
+            self._blocked_at = None
+
     @staticmethod
     def _negotiate(client: int, server: int) -> int:
         """Return the negotiated value between what the client has requested
@@ -258,7 +275,7 @@ class Channel0(state.StateManager):
                         capability, self.properties[key][capability])
             else:
                 self._logger.debug('Server %s: %r', key, self.properties[key])
-        self._transport.write(frame.marshal(
+        self._write(
             commands.Connection.StartOk(
                 client_properties={
                     'product': self._product,
@@ -274,7 +291,7 @@ class Channel0(state.StateManager):
                     'information': 'See https://aiorabbit.readthedocs.io',
                     'version': version},
                 response='\0{}\0{}'.format(self._username, self._password),
-                locale=self._locale), 0))
+                locale=self._locale))
         self._set_state(STATE_STARTOK_SENT)
 
     def _process_tune(self, value: commands.Connection.Tune) -> None:
@@ -286,11 +303,20 @@ class Channel0(state.StateManager):
             self._heartbeat_interval = value.heartbeat
         elif not self._heartbeat_interval and not value.heartbeat:
             self._heartbeat_interval = 0
-        self._transport.write(frame.marshal(
+        self._write(
             commands.Connection.TuneOk(
                 self.max_channels, self.max_frame_size,
-                self._heartbeat_interval), 0))
+                self._heartbeat_interval))
         self._set_state(STATE_TUNEOK_SENT)
-        self._transport.write(
-            frame.marshal(commands.Connection.Open(self._virtual_host), 0))
+        self._write(commands.Connection.Open(self._virtual_host))
         self._set_state(STATE_OPEN_SENT)
+
+    def _write(self, value: frame.FrameTypes) -> None:
+        data = frame.marshal(value, 0)
+        if self._metrics is not None:
+            self._metrics.frames_sent += 1
+            self._metrics.bytes_sent += len(data)
+        if self._frame_callbacks:
+            tracing.invoke(
+                self._frame_callbacks, ((0, value.name, len(data)),))
+        self._transport.write(data)
@@ -1,8 +1,12 @@
 # coding: utf-8
 import asyncio
 import collections
+import concurrent.futures
 import dataclasses
 import datetime
+import functools
+import heapq
+import logging
 import math
 import re
 import ssl
@@ -12,8 +16,10 @@ from urllib import parse
 from pamqp import base, body, commands, frame, header
 import yarl
 
-from aiorabbit import (channel0, DEFAULT_LOCALE, DEFAULT_PRODUCT, DEFAULT_URL,
-                       exceptions, message, protocol, state, types)
+from aiorabbit import (bridge, cache, channel0, DEFAULT_LOCALE,
+                       DEFAULT_PRODUCT, DEFAULT_URL, exceptions, message,
+                       metrics, protocol, state, template, tracing, types,
+                       workers)
 
 NamePattern = re.compile(r'^[\w:.-]+$', flags=re.UNICODE)
 
@@ -300,6 +306,49 @@ _STATE_TRANSITIONS = {
 }
 
 
+# The message attributes that can be passed to a consume_in_executor handler
+_EXECUTOR_PROPERTIES = {
+    'app_id', 'content_encoding', 'content_type', 'correlation_id',
+    'delivery_mode', 'exchange', 'expiration', 'headers', 'message_id',
+    'message_type', 'priority', 'redelivered', 'reply_to', 'routing_key',
+    'timestamp', 'user_id'}
+
+# Maps the frame classes received on the channel to the Client method that
+# handles them, or to the state set when the frame is received if the frame
+# only completes an RPC
+_FRAME_HANDLERS = {
+    commands.Basic.Ack: '_on_basic_ack',
+    commands.Basic.CancelOk: '_on_basic_cancelok',
+    commands.Basic.ConsumeOk: '_on_basic_consumeok',
+    commands.Basic.Deliver: '_on_basic_deliver',
+    commands.Basic.GetEmpty: '_on_basic_getempty',
+    commands.Basic.GetOk: '_on_basic_getok',
+    commands.Basic.Nack: '_on_basic_nack',
+    commands.Basic.QosOk: STATE_BASIC_QOSOK_RECEIVED,
+    commands.Basic.RecoverOk: STATE_BASIC_RECOVEROK_RECEIVED,
+    commands.Basic.Reject: '_on_basic_reject',
+    commands.Basic.Return: '_on_basic_return',
+    commands.Channel.Close: '_on_channel_close',
+    commands.Channel.CloseOk: '_on_channel_closeok',
+    commands.Channel.OpenOk: '_on_channel_openok',
+    commands.Confirm.SelectOk: STATE_CONFIRM_SELECTOK_RECEIVED,
+    commands.Exchange.BindOk: STATE_EXCHANGE_BINDOK_RECEIVED,
+    commands.Exchange.DeclareOk: STATE_EXCHANGE_DECLAREOK_RECEIVED,
+    commands.Exchange.DeleteOk: STATE_EXCHANGE_DELETEOK_RECEIVED,
+    commands.Exchange.UnbindOk: STATE_EXCHANGE_UNBINDOK_RECEIVED,
+    commands.Queue.BindOk: STATE_QUEUE_BINDOK_RECEIVED,
+    commands.Queue.DeclareOk: STATE_QUEUE_DECLAREOK_RECEIVED,
+    commands.Queue.DeleteOk: STATE_QUEUE_DELETEOK_RECEIVED,
+    commands.Queue.PurgeOk: STATE_QUEUE_PURGEOK_RECEIVED,
+    commands.Queue.UnbindOk: STATE_QUEUE_UNBINDOK_RECEIVED,
+    commands.Tx.CommitOk: STATE_TX_COMMITOK_RECEIVED,
+    commands.Tx.RollbackOk: STATE_TX_ROLLBACKOK_RECEIVED,
+    commands.Tx.SelectOk: '_on_tx_selectok',
+    body.ContentBody: '_on_content_body',
+    header.ContentHeader: '_on_content_header'
+}
+
+
 @dataclasses.dataclass()
 class _Defaults:
     locale: str
@@ -326,7 +375,11 @@ class Client(state.StateManager):
         :meth:`Client.qos_prefetch` provide a higher-level and more opinionated
         implementation than their respected AMQ RPC methods.
 
-    :param url: The URL to connect to RabbitMQ with
+    :param url: The URL to connect to RabbitMQ with. The ``channel_max``,
+        ``connection_timeout``, and ``heartbeat`` query parameters tune the
+        connection, while ``high_water_mark`` and ``low_water_mark`` set the
+        write buffer limits, in bytes, at which writes to RabbitMQ are paused
+        and resumed.
     :param locale: The locale to specify for the RabbitMQ connection
     :param product: The project name to specify for the RabbitMQ connection
     :param loop: An optional IO Loop to specify, if unspecified,
@@ -336,6 +389,12 @@ class Client(state.StateManager):
         returns a published method. Can also be set using the
         :meth:`~Client.register_basic_return_callback` method.
     :type on_return: :class:`~collections.abc.Callable`
+    :param properties_cache_size: Optionally cache up to this many marshalled
+        message properties, for applications that publish messages with the
+        same properties and headers repeatedly. See
+        :class:`~aiorabbit.cache.PropertiesCache`.
+    :param metrics: Optionally collect counters and latency histograms for
+        the client in the :class:`~aiorabbit.metrics.Metrics` instance
 
     .. code-block:: python3
        :caption: Example Usage
@@ -356,29 +415,56 @@ class Client(state.StateManager):
                  product: str = DEFAULT_PRODUCT,
                  loop: typing.Optional[asyncio.AbstractEventLoop] = None,
                  on_return: typing.Optional[typing.Callable] = None,
-                 ssl_context: typing.Optional[ssl.SSLContext] = None):
+                 ssl_context: typing.Optional[ssl.SSLContext] = None,
+                 properties_cache_size: int = 0,
+                 metrics: typing.Optional[metrics.Metrics] = None):
         super().__init__(loop or asyncio.get_running_loop())
+        self._ack_flush_interval = 0.0
+        self._ack_floor = 0
+        self._ack_max_pending = 0
+        self._ack_pending: typing.Set[int] = set()
+        self._ack_settled: typing.List[int] = []
+        self._ack_timer: typing.Optional[asyncio.TimerHandle] = None
         self._blocked = asyncio.Event()
         self._block_write = asyncio.Event()
         self._channel: int = 0
         self._channel0: typing.Optional[channel0.Channel0] = None
         self._channel_open = asyncio.Event()
-        self._confirmation_result: typing.Dict[int, bool] = {}
+        self._channels: typing.Dict[int, 'Client'] = {}
+        self._confirm_window = asyncio.Event()
         self._connected = asyncio.Event()
+        self._confirmed_tag = 0
+        self._consume_queues: typing.Set[asyncio.Queue] = set()
         self._consumers: typing.Dict[str, typing.Callable] = {}
         self._delivery_tag = 0
-        self._delivery_tags: typing.Dict[int, asyncio.Event] = {}
+        self._delivery_tags: typing.Dict[int, asyncio.Future] = {}
         self._defaults = _Defaults(locale, product)
+        self._frame_received_callbacks: typing.List[
+            tracing.FrameCallback] = []
+        self._frame_sent_callbacks: typing.List[tracing.FrameCallback] = []
+        self._frame_handlers: typing.Dict[type, typing.Callable] = {
+            key: getattr(self, value) if isinstance(value, str)
+            else functools.partial(self._on_rpc_response, value)
+            for key, value in _FRAME_HANDLERS.items()}
         self._get_future: typing.Optional[asyncio.Future] = None
         self._last_error: typing.Tuple[int, typing.Optional[str]] = (0, None)
         self._last_frame: typing.Optional[base.Frame] = None
+        self._lazy_consumers: typing.Set[str] = set()
         self._max_frame_size: typing.Optional[float] = None
+        self._max_in_flight: typing.Optional[int] = None
         self._message: typing.Optional[message.Message] = None
+        self._metrics = metrics
+        self._no_ack_consumers: typing.Set[str] = set()
         self._on_channel_close: typing.Optional[typing.Callable] = None
         self._on_message_return: typing.Optional[typing.Callable] = on_return
         self._pending_consumers: typing.Deque[
-            (asyncio.Future, typing.Callable)] = collections.deque([])
-        self._protocol: typing.Optional[asyncio.Protocol] = None
+            (asyncio.Future, typing.Callable, bool, bool)] = \
+            collections.deque([])
+        self._properties_cache: typing.Optional[cache.PropertiesCache] = \
+            cache.PropertiesCache(properties_cache_size) \
+            if properties_cache_size else None
+        self._protocol: typing.Optional[protocol.AMQP] = None
+        self._publish_times: typing.Dict[int, float] = {}
         self._publisher_confirms = False
         self._rpc_lock = asyncio.Lock()
         self._close_lock = asyncio.Lock()
@@ -456,6 +542,23 @@ class Client(state.StateManager):
                                    state.STATE_UNINITIALIZED]
                 or not self._transport)
 
+    @property
+    def metrics(self) -> typing.Optional['metrics.Metrics']:
+        """Returns the :class:`~aiorabbit.metrics.Metrics` the client was
+        created with, if any
+
+        """
+        return self._metrics
+
+    @property
+    def properties_cache(self) -> typing.Optional[cache.PropertiesCache]:
+        """Returns the cache of marshalled message properties if the client
+        was created with a ``properties_cache_size``, for inspecting its
+        hit and miss counters
+
+        """
+        return self._properties_cache
+
     @property
     def server_capabilities(self) -> typing.List[str]:
         """Contains the capabilities of the currently connected
@@ -509,12 +612,99 @@ class Client(state.StateManager):
         """
         return self._channel0.properties
 
+    async def channel(self,
+                      on_return: typing.Optional[typing.Callable] = None) \
+            -> 'Client':
+        """Open an additional channel on the connection, returning a
+        :class:`~aiorabbit.channel.Channel` that provides the same methods
+        as the client.
+
+        Each channel has its own state, RPC lock, publisher confirmation
+        tracking, and consumers, so a slow RPC on one channel does not block
+        RPCs or publishing on the client or on other channels.
+
+        :param on_return: An optional callback method to be invoked if the
+            server returns a message published on the channel.
+        :type on_return: :class:`~collections.abc.Callable`
+        :rtype: aiorabbit.channel.Channel
+        :raises aiorabbit.exceptions.ConnectionClosedException:
+            when the connection is closed
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            channel = await client.channel()
+            await asyncio.gather(
+                client.queue_declare('slow-queue', arguments=arguments),
+                channel.publish('', 'fast-queue', b'Hello World!'))
+            await channel.close()
+
+        """
+        from aiorabbit import channel
+
+        if self.is_closed:
+            raise exceptions.ConnectionClosedException('Connection is closed')
+        value = channel.Channel(self, self._next_channel(), on_return)
+        self._channels[value._channel] = value
+        await value._open_channel()
+        return value
+
+    def coalesce_acks(self,
+                      max_pending: int = 1000,
+                      flush_interval: float = 0.005) -> None:
+        """Buffer the acknowledgements sent with :meth:`Client.basic_ack`,
+        writing them in batches instead of one at a time.
+
+        Buffered acknowledgements are flushed when ``max_pending`` are
+        buffered, ``flush_interval`` seconds after the first one was
+        buffered, and before any other AMQ method is sent on the channel,
+        including ``Basic.Nack``, ``Basic.Reject``, and ``Channel.Close``.
+        When flushed, the acknowledgements up to the highest delivery tag
+        that has every lower delivery tag acknowledged, negatively
+        acknowledged, or rejected are sent as a single ``Basic.Ack`` with
+        ``multiple`` set. Delivery tags beyond that are acknowledged
+        individually.
+
+        Coalescing should be enabled before messages are received on the
+        channel, since the delivery tags settled earlier are not known. The
+        delivery tags of messages received with ``no_ack`` are treated as
+        settled when they are received.
+        Acknowledgements buffered when RabbitMQ closes the channel are not
+        sent, and the messages will be redelivered.
+
+        :param max_pending: Flush when this many acknowledgements are buffered
+        :param flush_interval: Maximum seconds to buffer an acknowledgement
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if ``max_pending`` is less than 1 or
+            ``flush_interval`` is negative
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            client.coalesce_acks(max_pending=500, flush_interval=0.01)
+            async for msg in client.consume('test'):
+                await client.basic_ack(msg.delivery_tag)
+
+        """
+        if not isinstance(max_pending, int) or isinstance(max_pending, bool):
+            raise TypeError('max_pending must be of type int')
+        elif not isinstance(flush_interval, (float, int)) \
+                or isinstance(flush_interval, bool):
+            raise TypeError('flush_interval must be of type float')
+        elif max_pending < 1:
+            raise ValueError('max_pending must be greater than 0')
+        elif flush_interval < 0:
+            raise ValueError('flush_interval must not be negative')
+        self._ack_max_pending = max_pending
+        self._ack_flush_interval = flush_interval
+
     async def consume(self,
                       queue: str = '',
                       no_local: bool = False,
                       no_ack: bool = False,
                       exclusive: bool = False,
-                      arguments: types.Arguments = None) \
+                      arguments: types.Arguments = None,
+                      lazy_properties: bool = False) \
             -> typing.AsyncGenerator[message.Message, None]:
         """Generator function that consumes from a queue, yielding a
         :class:`~aiorabbit.message.Message` and automatically cancels when
@@ -530,6 +720,9 @@ class Client(state.StateManager):
         :param arguments: A set of arguments for the consume. The syntax and
             semantics of these arguments depends on the server implementation.
         :type arguments: :data:`~aiorabbit.types.Arguments`
+        :param lazy_properties: Decode the properties of each message when
+            they are first accessed instead of when the message is received.
+            See :meth:`Client.basic_consume`.
 
         :rtype: typing.AsyncGenerator[aiorabbit.message.Message, None]
 
@@ -548,22 +741,129 @@ class Client(state.StateManager):
         messages = asyncio.Queue()
         consumer_tag = await self.basic_consume(
             queue, no_local, no_ack, exclusive, arguments,
-            lambda m: self._execute_callback(messages.put, m))
+            messages.put_nowait, lazy_properties=lazy_properties)
+        self._consume_queues.add(messages)
         try:
             while not self.is_closed:
-                try:
-                    msg = await asyncio.wait_for(
-                        messages.get(), timeout=0.1)
-                except asyncio.TimeoutError:
-                    continue
-                else:
-                    yield msg
+                msg = await messages.get()
+                if msg is None:  # Woken when the connection is closed
+                    break
+                yield msg
         finally:
+            self._consume_queues.discard(messages)
             if self._exception:
                 raise self._exception
             if not self.is_closed:
                 await self.basic_cancel(consumer_tag)
 
+    async def consume_in_executor(
+            self,
+            queue: str = '',
+            handler: typing.Callable = None,
+            executor: concurrent.futures.Executor = None,
+            max_in_flight: int = 10,
+            properties: typing.Sequence[str] = (
+                'content_type', 'content_encoding', 'headers'),
+            on_result: typing.Optional[typing.Callable] = None,
+            on_error: typing.Optional[typing.Callable] = None,
+            no_local: bool = False,
+            exclusive: bool = False,
+            arguments: types.Arguments = None) -> str:
+        """Consume from a queue, invoking ``handler`` for each message in
+        the ``executor``, such as a
+        :class:`~concurrent.futures.ProcessPoolExecutor`, so that CPU-bound
+        message processing does not block the IOLoop that reads from
+        RabbitMQ and sends heartbeats.
+
+        The handler is invoked with the message body as :class:`bytes`,
+        however many frames it was received in, and a :class:`dict` of the
+        message ``properties`` requested, which are the only properties
+        of the message that are decoded. When using a process pool, the
+        handler must be picklable, such as a module level function, as must
+        its arguments and its return value.
+
+        When the handler returns, the message is acknowledged, or, if
+        ``on_result`` is set, it is invoked on the IOLoop with the message and
+        the returned value to acknowledge, negatively acknowledge, or reject
+        the message. When the handler raises an exception, the exception is
+        logged and the message is rejected without being requeued, or, if
+        ``on_error`` is set, it is invoked with the message and the exception
+        to settle the message instead.
+
+        No more than ``max_in_flight`` messages are processed at the same
+        time, and messages received while all of them are in flight are
+        queued. The QoS prefetch count is not changed, so set it with
+        :meth:`Client.qos_prefetch` before consuming to bound the number of
+        queued messages.
+
+        The consumer is cancelled with :meth:`Client.basic_cancel`.
+
+        :param queue: Specifies the name of the queue to consume from
+        :param handler: The picklable function to invoke for each message
+        :type handler: :class:`~collections.abc.Callable`
+        :param executor: The executor to invoke the handler in
+        :type executor: :class:`concurrent.futures.Executor`
+        :param max_in_flight: The maximum number of messages to process
+        :param properties: The message properties to pass to the handler
+        :param on_result: Invoked with the message and the handler result
+        :type on_result: :class:`~collections.abc.Callable`
+        :param on_error: Invoked with the message and the handler exception
+        :type on_error: :class:`~collections.abc.Callable`
+        :param no_local: Do not deliver own messages
+        :param exclusive: Request exclusive access
+        :param arguments: A set of arguments for the consume. The syntax and
+            semantics of these arguments depends on the server implementation.
+        :type arguments: :data:`~aiorabbit.types.Arguments`
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if ``max_in_flight`` is less than 1 or a value in
+            ``properties`` is not a message property
+        :returns: the consumer tag value
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            def transform(body: bytes, properties: dict) -> bytes:
+                return json.dumps(expensive(json.loads(body))).encode()
+
+            async def on_result(msg, value):
+                await client.publish('results', msg.routing_key, value)
+                await client.basic_ack(msg.delivery_tag)
+
+            await client.qos_prefetch(16)
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                consumer_tag = await client.consume_in_executor(
+                    'work', transform, executor, max_in_flight=8,
+                    on_result=on_result)
+
+        """
+        if handler is None:
+            raise ValueError('handler must be specified')
+        elif not callable(handler):
+            raise TypeError('handler must be a callable')
+        elif not isinstance(executor, concurrent.futures.Executor):
+            raise TypeError('executor must be of type Executor')
+        elif not isinstance(max_in_flight, int) \
+                or isinstance(max_in_flight, bool):
+            raise TypeError('max_in_flight must be of type int')
+        elif max_in_flight < 1:
+            raise ValueError('max_in_flight must be greater than 0')
+        elif isinstance(properties, str):
+            raise TypeError('properties must be a sequence of str')
+        elif on_result is not None and not callable(on_result):
+            raise TypeError('on_result must be a callable')
+        elif on_error is not None and not callable(on_error):
+            raise TypeError('on_error must be a callable')
+        for name in properties:
+            if name not in _EXECUTOR_PROPERTIES:
+                raise ValueError(
+                    '{!r} is not a message property'.format(name))
+        return await self.basic_consume(
+            queue, no_local, False, exclusive, arguments,
+            workers.ExecutorWorkerPool(
+                self, handler, max_in_flight, executor, properties,
+                on_result, on_error),
+            lazy_properties=True)
+
     async def publish(self,
                       exchange: str = 'amq.direct',
                       routing_key: str = '',
@@ -631,104 +931,159 @@ class Client(state.StateManager):
             published to does not exist.
 
         """
-        self._validate_exchange_name('exchange', exchange)
-        self._validate_short_str('routing_key', routing_key)
-        if not isinstance(message_body, (bytes, str)):
-            raise TypeError('message_body must be of types bytes or str')
-        self._validate_bool('mandatory', mandatory)
-        if app_id is not None:
-            self._validate_short_str('app_id', app_id)
-        if content_encoding is not None:
-            self._validate_short_str('content_encoding', content_encoding)
-        if content_type is not None:
-            self._validate_short_str('content_type', content_type)
-        if correlation_id is not None:
-            self._validate_short_str('correlation_id', correlation_id)
-        if delivery_mode is not None:
-            if not isinstance(delivery_mode, int):
-                raise TypeError('delivery_mode must be of type int')
-            elif not 0 < delivery_mode < 3:
-                raise ValueError('delivery_mode must be 1 or 2')
-        if expiration is not None:
-            self._validate_short_str('expiration', expiration)
-        if headers is not None:
-            self._validate_field_table('headers', headers)
-        if message_id is not None:
-            self._validate_short_str('message_id', message_id)
-        if message_type is not None:
-            self._validate_short_str('message_type', message_type)
-        if priority is not None:
-            if not isinstance(priority, int):
-                raise TypeError('priority must be of type int')
-            elif not 0 <= priority <= 255:
-                raise ValueError('priority must be between 0 and 255')
-        if message_type:
-            self._validate_short_str('message_type', message_type)
-        if reply_to:
-            self._validate_short_str('reply_to', reply_to)
-        if timestamp and not isinstance(timestamp, datetime.datetime):
-            raise TypeError('timestamp must be of type datetime.datetime')
-        if user_id:
-            self._validate_short_str('user_id', user_id)
+        future = await self._publish(
+            exchange, routing_key, message_body, mandatory, app_id,
+            content_encoding, content_type, correlation_id, delivery_mode,
+            expiration, headers, message_id, message_type, priority,
+            reply_to, timestamp, user_id)
+        if future is not None:
+            return await self._wait_on_confirmation(future)
+
+    async def publish_pipelined(
+            self,
+            exchange: str = 'amq.direct',
+            routing_key: str = '',
+            message_body: typing.Union[bytes, str] = b'',
+            mandatory: bool = False,
+            app_id: typing.Optional[str] = None,
+            content_encoding: typing.Optional[str] = None,
+            content_type: typing.Optional[str] = None,
+            correlation_id: typing.Optional[str] = None,
+            delivery_mode: typing.Optional[int] = None,
+            expiration: typing.Optional[str] = None,
+            headers: typing.Optional[types.FieldTable] = None,
+            message_id: typing.Optional[str] = None,
+            message_type: typing.Optional[str] = None,
+            priority: typing.Optional[int] = None,
+            reply_to: typing.Optional[str] = None,
+            timestamp: typing.Optional[datetime.datetime] = None,
+            user_id: typing.Optional[str] = None) -> asyncio.Future:
+        """Publish a message to RabbitMQ without waiting for the publisher
+        confirmation, returning a :class:`~asyncio.Future` that resolves to
+        `True` or `False` once RabbitMQ acknowledges or negatively
+        acknowledges the message.
+
+        This allows many messages to be in flight at once instead of waiting
+        a full round trip for each confirmation. If the ``max_in_flight``
+        window passed to :meth:`Client.confirm_select` is full, this method
+        waits for a confirmation to free a slot before publishing.
+
+        If the channel or connection is closed before the confirmation is
+        received, the future raises the exception for the closure.
+
+        Accepts the same arguments as :meth:`Client.publish`.
+
+        :raises RuntimeError: if publisher confirms are not enabled
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if the value of one an argument does not validate
 
-        if isinstance(message_body, str):
-            message_body = message_body.encode('utf-8')
-        self._delivery_tag += 1
-        if self._publisher_confirms:
-            self._delivery_tags[self._delivery_tag] = asyncio.Event()
-        delivery_tag = self._delivery_tag
-        body_size = len(message_body)
+        .. code-block:: python3
+           :caption: Example Usage
 
-        frames = [
-            commands.Basic.Publish(
-                exchange=exchange,
-                routing_key=routing_key,
-                mandatory=mandatory),
-            header.ContentHeader(
-                body_size=body_size,
-                properties=commands.Basic.Properties(
-                    app_id=app_id,
-                    content_encoding=content_encoding,
-                    content_type=content_type,
-                    correlation_id=correlation_id,
-                    delivery_mode=delivery_mode,
-                    expiration=expiration,
-                    headers=headers,
-                    message_id=message_id,
-                    message_type=message_type,
-                    priority=priority,
-                    reply_to=reply_to,
-                    timestamp=timestamp,
-                    user_id=user_id))]
+            await client.confirm_select(max_in_flight=1000)
+            confirmations = [
+                await client.publish_pipelined('amq.direct', 'key', body)
+                for body in bodies]
+            results = await asyncio.gather(*confirmations)
 
-        # Calculate how many body frames are needed
-        chunks = int(math.ceil(body_size / self._max_frame_size))
-        for offset in range(0, chunks):  # Send the message
-            start = int(self._max_frame_size * offset)
-            end = int(start + self._max_frame_size)
-            if end > body_size:
-                end = int(body_size)
-            frames.append(body.ContentBody(message_body[start:end]))
-        self._write_frames(*frames)
-        self._set_state(STATE_MESSAGE_PUBLISHED)
+        """
+        if not self._publisher_confirms:
+            raise RuntimeError('Publisher confirms are not enabled')
+        return await self._publish(
+            exchange, routing_key, message_body, mandatory, app_id,
+            content_encoding, content_type, correlation_id, delivery_mode,
+            expiration, headers, message_id, message_type, priority,
+            reply_to, timestamp, user_id)
+
+    async def publish_many(
+            self, messages: typing.Iterable[typing.Mapping[str, typing.Any]]) \
+            -> typing.Optional[typing.List[bool]]:
+        """Publish a batch of messages to RabbitMQ, writing them to the
+        socket in a single write.
+
+        Each message is a mapping of the keyword arguments accepted by
+        :meth:`Client.publish`. All of the messages are validated before any
+        of them is published, so a message that does not validate raises
+        without publishing the batch.
+
+        If publisher confirms are enabled, waits for all of the
+        confirmations, returning a list of `True` or `False` values in the
+        order the messages were given. If the ``max_in_flight`` window passed
+        to :meth:`Client.confirm_select` is smaller than the batch, the batch
+        is written as room in the window becomes available.
+
+        :param messages: The keyword arguments for each message to publish
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if the value of one an argument does not validate
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            await client.confirm_select()
+            results = await client.publish_many(
+                {'exchange': 'amq.direct',
+                 'routing_key': 'key',
+                 'message_body': body} for body in bodies)
 
+        """
+        batch = [self._message_frames(**value) for value in messages]
+        futures, offset = [], 0
+        while offset < len(batch):
+            count = await self._wait_on_confirm_window() or len(batch)
+            chunk = batch[offset:offset + count]
+            frames = [value for message in chunk for value in message]
+            futures += await self._write_messages(
+                len(chunk), functools.partial(self._marshal_frames, frames))
+            offset += count
         if self._publisher_confirms:
-            result = await self._wait_on_state(
-                STATE_BASIC_ACK_RECEIVED,
-                STATE_BASIC_NACK_RECEIVED,
-                STATE_BASIC_REJECT_RECEIVED)
-            if result == STATE_CHANNEL_CLOSE_RECEIVED:
-                del self._delivery_tags[delivery_tag]
-                err = self._get_last_error()
-                exc_class = exceptions.CLASS_MAPPING.get(
-                    err[0], exceptions.UnknownError)
-                raise exc_class(err[1])
-            else:
-                await self._delivery_tags[delivery_tag].wait()
-                result = self._confirmation_result[delivery_tag]
-                del self._delivery_tags[delivery_tag]
-                del self._confirmation_result[delivery_tag]
-                return result
+            return [await self._wait_on_confirmation(future)
+                    for future in futures]
+
+    def publish_template(
+            self,
+            exchange: str = 'amq.direct',
+            routing_key: str = '',
+            mandatory: bool = False,
+            app_id: typing.Optional[str] = None,
+            content_encoding: typing.Optional[str] = None,
+            content_type: typing.Optional[str] = None,
+            correlation_id: typing.Optional[str] = None,
+            delivery_mode: typing.Optional[int] = None,
+            expiration: typing.Optional[str] = None,
+            message_type: typing.Optional[str] = None,
+            priority: typing.Optional[int] = None,
+            reply_to: typing.Optional[str] = None,
+            user_id: typing.Optional[str] = None) \
+            -> template.PublishTemplate:
+        """Create a :class:`~aiorabbit.template.PublishTemplate` for
+        publishing messages that share the exchange, routing key, and
+        properties, validating and marshalling them once instead of for
+        every message published.
+
+        The ``headers``, ``message_id``, and ``timestamp`` properties are
+        passed per message to
+        :meth:`PublishTemplate.publish
+        <aiorabbit.template.PublishTemplate.publish>`.
+
+        Accepts the same arguments as :meth:`Client.publish`.
+
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if the value of one an argument does not validate
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            template = client.publish_template(
+                'amq.direct', 'key', content_type='text/plain')
+            await template.publish('Hello World!', message_id='1')
+
+        """
+        method, content_header = self._message_frames(
+            exchange, routing_key, b'', mandatory, app_id, content_encoding,
+            content_type, correlation_id, delivery_mode, expiration, None,
+            None, message_type, priority, reply_to, None, user_id)
+        return template.PublishTemplate(
+            self, method, content_header.properties)
 
     async def qos_prefetch(self, count=0, per_consumer=True) -> None:
         """Specify the number of messages to pre-allocate for a consumer.
@@ -784,6 +1139,108 @@ class Client(state.StateManager):
         """
         self._on_message_return = value
 
+    def register_frame_received_callback(
+            self, value: tracing.FrameCallback) -> None:
+        """Register a callback that is invoked for every frame received on
+        the connection, including the frames for channel 0 and the channels
+        opened with :meth:`Client.channel`.
+
+        The callback is invoked with the channel, the frame type name such as
+        ``Basic.Deliver``, ``ContentHeader``, ``ContentBody``, or
+        ``Heartbeat``, the size of the frame in bytes, and the
+        :func:`time.monotonic` timestamp of when it was read from the socket.
+        It is invoked before the frame is processed, so it must not block.
+
+        When no callbacks are registered, frames are not traced.
+
+        :param value: The function to invoke as a callback
+        :type value: :data:`~aiorabbit.tracing.FrameCallback`
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            def on_frame(channel, frame_type, size, timestamp):
+                histogram.labels(frame_type).observe(size)
+
+            client.register_frame_received_callback(on_frame)
+
+        """
+        self._frame_received_callbacks.append(value)
+
+    def register_frame_sent_callback(
+            self, value: tracing.FrameCallback) -> None:
+        """Register a callback that is invoked for every frame written to
+        the connection, including the frames for channel 0 and the channels
+        opened with :meth:`Client.channel`.
+
+        The callback is invoked with the same arguments as the callbacks
+        registered with :meth:`Client.register_frame_received_callback`, with
+        the timestamp of when the frame was marshalled to be written.
+
+        When no callbacks are registered, frames are not traced.
+
+        :param value: The function to invoke as a callback
+        :type value: :data:`~aiorabbit.tracing.FrameCallback`
+
+        """
+        self._frame_sent_callbacks.append(value)
+
+    def threadsafe_publisher(
+            self, futures: bool = False,
+            max_batch: int = bridge.DEFAULT_MAX_BATCH) \
+            -> bridge.ThreadSafePublisher:
+        """Create a :class:`~aiorabbit.bridge.ThreadSafePublisher` for
+        publishing messages with the client from other threads.
+
+        Messages published from other threads are queued and written to the
+        socket in batches of up to ``max_batch`` messages, waking the IOLoop
+        once per batch instead of once per message.
+
+        :param futures: Return a :class:`concurrent.futures.Future` for each
+            message published, resolving once it is confirmed or written
+        :param max_batch: The maximum number of messages to write at once
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if ``max_batch`` is less than 1
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            await client.confirm_select()
+            publisher = client.threadsafe_publisher(futures=True)
+
+            def publish_events(events):  # Invoked in another thread
+                futures = [publisher.publish('events', 'key', event)
+                           for event in events]
+                return all(future.result() for future in futures)
+
+        """
+        if not isinstance(futures, bool):
+            raise TypeError('futures must be of type bool')
+        elif not isinstance(max_batch, int) or isinstance(max_batch, bool):
+            raise TypeError('max_batch must be of type int')
+        elif max_batch < 1:
+            raise ValueError('max_batch must be greater than 0')
+        return bridge.ThreadSafePublisher(self, futures, max_batch)
+
+    def unregister_frame_callback(self, value: tracing.FrameCallback) -> None:
+        """Remove a callback registered with
+        :meth:`Client.register_frame_received_callback` or
+        :meth:`Client.register_frame_sent_callback`
+
+        :param value: The callback to remove
+        :type value: :data:`~aiorabbit.tracing.FrameCallback`
+        :raises ValueError: if the callback is not registered
+
+        """
+        registered = False
+        for callbacks in (self._frame_received_callbacks,
+                          self._frame_sent_callbacks):
+            while value in callbacks:
+                callbacks.remove(value)
+                registered = True
+        if not registered:
+            raise ValueError('{!r} is not registered'.format(value))
+
     async def basic_qos(self) -> None:
         """This method is not implemented, as RabbitMQ does not fully implement
         it and changes the of the semantic meaning of how it is used.
@@ -808,8 +1265,13 @@ class Client(state.StateManager):
                             exclusive: bool = False,
                             arguments: types.Arguments = None,
                             callback: typing.Callable = None,
-                            consumer_tag: typing.Optional[str] = None) \
-            -> str:
+                            consumer_tag: typing.Optional[str] = None,
+                            lazy_properties: bool = False,
+                            concurrency: typing.Optional[int] = None,
+                            on_error: typing.Optional[
+                                typing.Callable] = None,
+                            partition_key: typing.Optional[
+                                typing.Callable] = None) -> str:
         """Start a queue consumer
 
         This method asks the server to start a “consumer”, which is a transient
@@ -836,8 +1298,43 @@ class Client(state.StateManager):
             consumer tag is local to a channel, so two clients can use the same
             consumer tags. If this field is empty the server will generate a
             unique tag.
+        :param lazy_properties: Keep the marshalled properties of each message
+            and decode each property the first time it is accessed, instead
+            of decoding all of them when the message is received. Consumers
+            that only use some of the properties, such as those routing on
+            the message body or a single header, avoid decoding the rest.
+            A property that can not be decoded raises
+            :exc:`pamqp.exceptions.UnmarshalingException` when accessed.
+        :param concurrency: Invoke the callback for up to this many messages
+            at the same time, each in its own task, queuing messages received
+            while all of them are busy until one is available. The number
+            of queued messages is limited by the QoS prefetch count, which
+            is not changed, so set it with :meth:`Client.qos_prefetch` before
+            consuming to bound the queue. By default, an async callback is
+            scheduled for every message as it is received, without limit.
+        :param on_error: Invoked with the message and the exception when the
+            callback raises an exception while using ``concurrency``. If it
+            is not set, the exception is logged.
+        :type on_error: :class:`~collections.abc.Callable`
+        :param partition_key: Invoked with each message to return the
+            hashable key its processing must be ordered by when using
+            ``concurrency``, such as the routing key or a header value.
+            Messages are partitioned into ``concurrency`` lanes by key and
+            the callback is invoked for one message at a time in each lane,
+            in the order the messages were received. Since messages in
+            other lanes may still be processing, messages should be
+            acknowledged individually instead of with ``multiple``.
+        :type partition_key: :class:`~collections.abc.Callable`
         :returns: the consumer tag value
 
+        .. code-block:: python3
+           :caption: Example Usage
+
+            await client.qos_prefetch(16)
+            await client.basic_consume(
+                'orders', callback=on_order, concurrency=8,
+                partition_key=lambda msg: msg.headers['customer_id'])
+
         """
         if not isinstance(queue, str):
             raise TypeError('queue must be of type str')
@@ -855,8 +1352,28 @@ class Client(state.StateManager):
             raise TypeError('callback must be a callable')
         elif consumer_tag is not None and not isinstance(consumer_tag, str):
             raise TypeError('consumer_tag must be of type str')
+        self._validate_bool('lazy_properties', lazy_properties)
+        if concurrency is not None:
+            if not isinstance(concurrency, int) \
+                    or isinstance(concurrency, bool):
+                raise TypeError('concurrency must be of type int')
+            elif concurrency < 1:
+                raise ValueError('concurrency must be greater than 0')
+            elif on_error is not None and not callable(on_error):
+                raise TypeError('on_error must be a callable')
+            elif partition_key is not None and not callable(partition_key):
+                raise TypeError('partition_key must be a callable')
+            elif partition_key is not None:
+                callback = workers.PartitionedWorkerPool(
+                    self, callback, concurrency, partition_key, on_error)
+            else:
+                callback = workers.WorkerPool(
+                    self, callback, concurrency, on_error)
+        elif partition_key is not None:
+            raise ValueError('partition_key requires concurrency')
         consumer_tag_future = asyncio.Future()
-        self._pending_consumers.append((consumer_tag_future, callback))
+        self._pending_consumers.append(
+            (consumer_tag_future, callback, lazy_properties, no_ack))
         await self._send_rpc(
             commands.Basic.Consume(
                 0, queue, consumer_tag or '', no_local, no_ack, exclusive,
@@ -919,6 +1436,8 @@ class Client(state.StateManager):
             STATE_BASIC_GETOK_RECEIVED)
         await future
         self._get_future = None
+        if no_ack and future.result() is not None:
+            self._settle_no_ack_delivery_tag(future.result().delivery_tag)
         return future.result()
 
     async def basic_ack(self,
@@ -939,8 +1458,15 @@ class Client(state.StateManager):
             raise TypeError('delivery_tag must be of type int')
         elif not isinstance(multiple, bool):
             raise TypeError('multiple must be of type bool')
+        await self._drain()
+        if self._metrics is not None:
+            self._metrics.acks += 1
+        if self._ack_max_pending and not multiple:
+            self._buffer_ack(delivery_tag)
+            return
+        self._settle_delivery_tag(delivery_tag, multiple)
         self._write_frames(commands.Basic.Ack(delivery_tag, multiple))
-        self._set_state(STATE_BASIC_ACK_SENT)
+        self._set_settled_state(STATE_BASIC_ACK_SENT)
 
     async def basic_nack(self,
                          delivery_tag: int,
@@ -963,9 +1489,13 @@ class Client(state.StateManager):
             raise TypeError('multiple must be of type bool')
         elif not isinstance(requeue, bool):
             raise TypeError('requeue must be of type bool')
+        await self._drain()
+        if self._metrics is not None:
+            self._metrics.nacks += 1
+        self._settle_delivery_tag(delivery_tag, multiple)
         self._write_frames(
             commands.Basic.Nack(delivery_tag, multiple, requeue))
-        self._set_state(STATE_BASIC_NACK_SENT)
+        self._set_settled_state(STATE_BASIC_NACK_SENT)
 
     async def basic_reject(self,
                            delivery_tag: int,
@@ -984,8 +1514,12 @@ class Client(state.StateManager):
             raise TypeError('delivery_tag must be of type int')
         elif not isinstance(requeue, bool):
             raise TypeError('requeue must be of type bool')
+        await self._drain()
+        if self._metrics is not None:
+            self._metrics.rejects += 1
+        self._settle_delivery_tag(delivery_tag, False)
         self._write_frames(commands.Basic.Reject(delivery_tag, requeue))
-        self._set_state(STATE_BASIC_REJECT_SENT)
+        self._set_settled_state(STATE_BASIC_REJECT_SENT)
 
     async def basic_publish(self) -> None:
         """This method is not implemented and the more opinionated
@@ -1015,10 +1549,16 @@ class Client(state.StateManager):
             STATE_BASIC_RECOVER_SENT,
             STATE_BASIC_RECOVEROK_RECEIVED)
 
-    async def confirm_select(self) -> None:
+    async def confirm_select(self,
+                             max_in_flight: typing.Optional[int] = None) \
+            -> None:
         """Enable `Publisher Confirms
         <https://www.rabbitmq.com/confirms.html>`_
 
+        When publishing with :meth:`Client.publish_pipelined`, the
+        ``max_in_flight`` window limits how many published messages may be
+        awaiting confirmation at once.
+
         .. warning::
 
             RabbitMQ will only indicate a publishing failure via publisher
@@ -1028,11 +1568,20 @@ class Client(state.StateManager):
             message is routed into an exchange, but not that it is published
             into a queue.
 
+        :param max_in_flight: The maximum quantity of unconfirmed messages,
+            unlimited if not specified
+        :raises TypeError: if max_in_flight is not an int
+        :raises ValueError: if max_in_flight is less than 1
         :raises RuntimeError: if publisher confirms are already enabled
         :raises aiorabbit.exceptions.NotImplemented:
             if publisher confirms are not available on the RabbitMQ server
 
         """
+        if max_in_flight is not None:
+            if not isinstance(max_in_flight, int):
+                raise TypeError('max_in_flight must be of type int')
+            elif max_in_flight < 1:
+                raise ValueError('max_in_flight must be greater than 0')
         if 'publisher_confirms' not in self.server_capabilities:
             raise exceptions.NotImplemented(
                 'Server does not support publisher confirms')
@@ -1043,6 +1592,7 @@ class Client(state.StateManager):
                 commands.Confirm.Select(),
                 STATE_CONFIRM_SELECT_SENT,
                 STATE_CONFIRM_SELECTOK_RECEIVED)
+            self._max_in_flight = max_in_flight
             self._publisher_confirms = True
 
     async def exchange_declare(self,
@@ -1392,6 +1942,18 @@ class Client(state.StateManager):
             STATE_TX_ROLLBACK_SENT,
             STATE_TX_ROLLBACKOK_RECEIVED)
 
+    def _buffer_ack(self, delivery_tag: int) -> None:
+        """Buffer an acknowledgement when :meth:`Client.coalesce_acks` is
+        enabled, flushing when enough are buffered or scheduling the flush
+
+        """
+        self._ack_pending.add(delivery_tag)
+        if len(self._ack_pending) >= self._ack_max_pending:
+            self._flush_acks()
+        elif self._ack_timer is None:
+            self._ack_timer = self._loop.call_later(
+                self._ack_flush_interval, self._flush_acks)
+
     async def _close(self) -> None:
         self._set_state(STATE_CLOSING)
         await self._channel0.close()
@@ -1420,19 +1982,29 @@ class Client(state.StateManager):
             self._loop,
             int(self._url.query.get('channel_max', '32768')),
             self._defaults.product,
-            self._on_remote_close)
+            self._on_remote_close,
+            self._metrics,
+            self._frame_sent_callbacks)
         self._max_frame_size = float(self._channel0.max_frame_size)
         ssl_enabled = self._url.scheme == 'amqps'
         future = self._loop.create_connection(
             lambda: protocol.AMQP(
                 self._on_connected,
                 self._on_disconnected,
-                self._on_frame,
+                self._on_frames,
+                metrics=self._metrics,
+                frame_callbacks=self._frame_received_callbacks,
             ), self._url.host, port,
             server_hostname=self._url.host if ssl_enabled else None,
             ssl=self._ssl_context or ssl_enabled)
         self._transport, self._protocol = await asyncio.wait_for(
             future, timeout=self._connect_timeout)
+        high_water_mark = self._url.query.get('high_water_mark')
+        low_water_mark = self._url.query.get('low_water_mark')
+        if high_water_mark or low_water_mark:
+            self._transport.set_write_buffer_limits(
+                int(high_water_mark) if high_water_mark else None,
+                int(low_water_mark) if low_water_mark else None)
         self._max_frame_size = float(self._channel0.max_frame_size)
         if await self._channel0.open(self._transport):
             return self._set_state(STATE_OPENED)
@@ -1442,6 +2014,24 @@ class Client(state.StateManager):
     def _connect_timeout(self) -> float:
         return float(self._url.query.get('connection_timeout', '3.0'))
 
+    async def _drain(self) -> None:
+        """Wait for the transport's write buffer to drain if it is over its
+        high-water mark, so writers apply backpressure instead of buffering
+        without bound.
+
+        """
+        if self._protocol is not None and self._protocol.is_paused:
+            await self._protocol.drain()
+
+    def _close_channels(self, exc: exceptions.AIORabbitException) -> None:
+        """Release the channels opened with :meth:`Client.channel` when the
+        connection is closed
+
+        """
+        for value in list(self._channels.values()):
+            value._on_connection_closed(exc)
+        self._channels.clear()
+
     def _execute_callback(self, callback: typing.Callable, *args) -> None:
         """Sync wrapper for invoking a sync/async callback and invoking
         the callback on the IOLoop if it returned a coroutine (async def).
@@ -1451,122 +2041,363 @@ class Client(state.StateManager):
         if asyncio.iscoroutine(result):
             self._loop.call_soon(asyncio.ensure_future, result)
 
+    def _fail_confirmations(self, exc: exceptions.AIORabbitException) -> None:
+        """Fail all of the outstanding publisher confirmations with the
+        exception, resetting the delivery tag sequence which restarts when
+        the channel is reopened.
+
+        """
+        for future in self._delivery_tags.values():
+            if not future.done():
+                future.set_exception(exc)
+                # Mark as retrieved so an unawaited pipelined confirmation is
+                # not passed to the IOLoop exception handler when collected
+                future.exception()
+        self._delivery_tags.clear()
+        self._publish_times.clear()
+        self._confirmed_tag = self._delivery_tag = 0
+        self._confirm_window.set()
+
+    def _flush_acks(self) -> None:
+        """Write the buffered acknowledgements, acknowledging the delivery
+        tags up to the highest one with all lower delivery tags settled in
+        a single ``Basic.Ack`` and the rest individually
+
+        """
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+            self._ack_timer = None
+        if not self._ack_pending:
+            return
+        elif not self._channel_open.is_set() or self.is_closed:
+            self._ack_pending.clear()
+            return
+        pending, self._ack_pending = self._ack_pending, set()
+        floor = self._raise_ack_floor(self._ack_floor, pending)
+        frames = [commands.Basic.Ack(floor, True)] \
+            if floor > self._ack_floor else []
+        for delivery_tag in sorted(pending):
+            if delivery_tag > floor:
+                frames.append(commands.Basic.Ack(delivery_tag, False))
+                heapq.heappush(self._ack_settled, delivery_tag)
+        self._ack_floor = floor
+        self._write_frames(*frames)
+
     def _get_last_error(self) -> typing.Tuple[int, typing.Optional[str]]:
         err = self._last_error
         self._last_error = (0, None)
         return err
 
+    def _marshal_frames(self, frames: typing.Sequence[frame.FrameTypes],
+                        channel: int) -> typing.List[bytes]:
+        if self._logger.isEnabledFor(logging.DEBUG):
+            for value in frames:
+                self._logger.debug('Writing frame: %r', value)
+        if self._metrics is not None:
+            self._metrics.frames_sent += len(frames)
+        if self._properties_cache is None:
+            data = [frame.marshal(value, channel) for value in frames]
+        else:
+            data = [self._properties_cache.marshal(value, channel)
+                    if isinstance(value, header.ContentHeader)
+                    else frame.marshal(value, channel) for value in frames]
+        if self._frame_sent_callbacks:
+            tracing.invoke(self._frame_sent_callbacks, (
+                (channel, value.name, len(marshalled))
+                for value, marshalled in zip(frames, data)))
+        return data
+
+    def _message_frames(
+            self,
+            exchange: str = 'amq.direct',
+            routing_key: str = '',
+            message_body: typing.Union[bytes, str] = b'',
+            mandatory: bool = False,
+            app_id: typing.Optional[str] = None,
+            content_encoding: typing.Optional[str] = None,
+            content_type: typing.Optional[str] = None,
+            correlation_id: typing.Optional[str] = None,
+            delivery_mode: typing.Optional[int] = None,
+            expiration: typing.Optional[str] = None,
+            headers: typing.Optional[types.FieldTable] = None,
+            message_id: typing.Optional[str] = None,
+            message_type: typing.Optional[str] = None,
+            priority: typing.Optional[int] = None,
+            reply_to: typing.Optional[str] = None,
+            timestamp: typing.Optional[datetime.datetime] = None,
+            user_id: typing.Optional[str] = None) \
+            -> typing.List[frame.FrameTypes]:
+        """Validate the arguments of :meth:`Client.publish`, returning the
+        frames to write for the message
+
+        """
+        self._validate_exchange_name('exchange', exchange)
+        self._validate_short_str('routing_key', routing_key)
+        if not isinstance(message_body, (bytes, str)):
+            raise TypeError('message_body must be of types bytes or str')
+        self._validate_bool('mandatory', mandatory)
+        if app_id is not None:
+            self._validate_short_str('app_id', app_id)
+        if content_encoding is not None:
+            self._validate_short_str('content_encoding', content_encoding)
+        if content_type is not None:
+            self._validate_short_str('content_type', content_type)
+        if correlation_id is not None:
+            self._validate_short_str('correlation_id', correlation_id)
+        if delivery_mode is not None:
+            if not isinstance(delivery_mode, int):
+                raise TypeError('delivery_mode must be of type int')
+            elif not 0 < delivery_mode < 3:
+                raise ValueError('delivery_mode must be 1 or 2')
+        if expiration is not None:
+            self._validate_short_str('expiration', expiration)
+        if headers is not None:
+            self._validate_field_table('headers', headers)
+        if message_id is not None:
+            self._validate_short_str('message_id', message_id)
+        if message_type is not None:
+            self._validate_short_str('message_type', message_type)
+        if priority is not None:
+            if not isinstance(priority, int):
+                raise TypeError('priority must be of type int')
+            elif not 0 <= priority <= 255:
+                raise ValueError('priority must be between 0 and 255')
+        if message_type:
+            self._validate_short_str('message_type', message_type)
+        if reply_to:
+            self._validate_short_str('reply_to', reply_to)
+        if timestamp and not isinstance(timestamp, datetime.datetime):
+            raise TypeError('timestamp must be of type datetime.datetime')
+        if user_id:
+            self._validate_short_str('user_id', user_id)
+
+        if isinstance(message_body, str):
+            message_body = message_body.encode('utf-8')
+        body_size = len(message_body)
+
+        frames = [
+            commands.Basic.Publish(
+                exchange=exchange,
+                routing_key=routing_key,
+                mandatory=mandatory),
+            header.ContentHeader(
+                body_size=body_size,
+                properties=commands.Basic.Properties(
+                    app_id=app_id,
+                    content_encoding=content_encoding,
+                    content_type=content_type,
+                    correlation_id=correlation_id,
+                    delivery_mode=delivery_mode,
+                    expiration=expiration,
+                    headers=headers,
+                    message_id=message_id,
+                    message_type=message_type,
+                    priority=priority,
+                    reply_to=reply_to,
+                    timestamp=timestamp,
+                    user_id=user_id))]
+
+        # Calculate how many body frames are needed
+        chunks = int(math.ceil(body_size / self._max_frame_size))
+        body_view = memoryview(message_body)
+        for offset in range(0, chunks):  # Send the message
+            start = int(self._max_frame_size * offset)
+            end = int(start + self._max_frame_size)
+            if end > body_size:
+                end = int(body_size)
+            frames.append(body.ContentBody(body_view[start:end]))
+        return frames
+
+    def _observe_confirmations(self, tags: typing.Iterable[int],
+                               ack: bool) -> None:
+        """Count the publisher confirmations and their latency"""
+        now = self._loop.time()
+        for tag in tags:
+            start = self._publish_times.pop(tag, None)
+            if start is None:
+                continue
+            if ack:
+                self._metrics.confirmed += 1
+            else:
+                self._metrics.confirm_nacks += 1
+            self._metrics.confirm_latency.observe(now - start)
+
+    def _observe_published(self, count: int) -> None:
+        """Count the published messages, recording when they were published
+        for the confirmation latency if publisher confirms are enabled
+
+        """
+        self._metrics.published += count
+        if self._publisher_confirms:
+            now = self._loop.time()
+            for tag in range(self._delivery_tag - count + 1,
+                             self._delivery_tag + 1):
+                self._publish_times[tag] = now
+
+    def _next_channel(self) -> int:
+        """Return the next channel number after the current one that is not
+        in use by the client or one of its channels
+
+        """
+        value = self._channel
+        for _offset in range(self._channel0.max_channels):
+            value = value + 1 if value < self._channel0.max_channels else 1
+            if value != self._channel and value not in self._channels:
+                return value
+        raise RuntimeError('No channels available')
+
     def _on_connected(self):
         self._set_state(STATE_CONNECTED)
 
+    def _on_connection_closed(
+            self, exc: exceptions.AIORabbitException) -> None:
+        """Fail the outstanding publisher confirmations, release the channels
+        opened with :meth:`Client.channel`, and wake the :meth:`consume`
+        generators when the connection is closed
+
+        """
+        self._fail_confirmations(exc)
+        self._close_channels(exc)
+        self._reset_acks()
+        self._wake_consumers()
+
     def _on_disconnected(self, exc: typing.Optional[Exception]) -> None:
         self._logger.debug('Disconnected: %r', exc)
         if not self.is_closed:
-            self._set_state(
-                state.STATE_EXCEPTION,
-                exceptions.ConnectionClosedException(
-                    'Socket closed' if not exc else str(exc)))
+            exc = exceptions.ConnectionClosedException(
+                'Socket closed' if not exc else str(exc))
+            self._on_connection_closed(exc)
+            self._set_state(state.STATE_EXCEPTION, exc)
 
     def _on_frame(self, channel: int, value: frame.FrameTypes) -> None:
         if channel == 0:
             return self._channel0.process(value)
+        elif channel in self._channels:
+            return self._channels[channel]._on_frame(channel, value)
         self._last_frame = value
 
         # Reset last heartbeat timestamp since a frame was received
         self._channel0.update_last_heartbeat()
 
-        if isinstance(value, commands.Basic.Ack):
-            self._set_delivery_tag_result(value.delivery_tag, True)
-            self._set_state(STATE_BASIC_ACK_RECEIVED)
-        elif isinstance(value, commands.Basic.CancelOk):
-            del self._consumers[value.consumer_tag]
-            self._set_state(STATE_BASIC_CANCELOK_RECEIVED)
-        elif isinstance(value, commands.Basic.ConsumeOk):
-            future, callback = self._pending_consumers.popleft()
-            future.set_result(value.consumer_tag)
-            self._consumers[value.consumer_tag] = callback
-            self._set_state(STATE_BASIC_CONSUMEOK_RECEIVED)
-        elif isinstance(value, commands.Basic.Deliver):
-            self._set_state(STATE_BASIC_DELIVER_RECEIVED)
-            self._message = message.Message(value)
-        elif isinstance(value, commands.Basic.GetEmpty):
-            self._set_state(STATE_BASIC_GETEMPTY_RECEIVED)
-            self._get_future.set_result(None)
-        elif isinstance(value, commands.Basic.GetOk):
-            self._set_state(STATE_BASIC_GETOK_RECEIVED)
-            self._message = message.Message(value)
-        elif isinstance(value, commands.Basic.Nack):
-            self._set_delivery_tag_result(value.delivery_tag, False)
-            self._set_state(STATE_BASIC_NACK_RECEIVED)
-        elif isinstance(value, commands.Basic.QosOk):
-            self._set_state(STATE_BASIC_QOSOK_RECEIVED)
-        elif isinstance(value, commands.Basic.RecoverOk):
-            self._set_state(STATE_BASIC_RECOVEROK_RECEIVED)
-        elif isinstance(value, commands.Basic.Reject):
-            self._set_delivery_tag_result(value.delivery_tag, False)
-            self._set_state(STATE_BASIC_REJECT_RECEIVED)
-        elif isinstance(value, commands.Basic.Return):
-            self._set_state(STATE_BASIC_RETURN_RECEIVED)
-            self._message = message.Message(value)
-        elif isinstance(value, commands.Channel.Close):
-            self._set_state(STATE_CHANNEL_CLOSE_RECEIVED)
-            self._write_frames(commands.Channel.CloseOk())
-            self._last_error = value.reply_code, value.reply_text
-            self._channel_open.clear()
-            self._set_state(STATE_CHANNEL_CLOSEOK_SENT)
-        elif isinstance(value, commands.Channel.CloseOk):
-            self._channel_open.clear()
-            self._set_state(STATE_CHANNEL_CLOSEOK_RECEIVED)
-        elif isinstance(value, commands.Channel.OpenOk):
-            self._channel_open.set()
-            self._set_state(STATE_CHANNEL_OPENOK_RECEIVED)
-        elif isinstance(value, commands.Confirm.SelectOk):
-            self._set_state(STATE_CONFIRM_SELECTOK_RECEIVED)
-        elif isinstance(value, header.ContentHeader):
-            self._set_state(STATE_CONTENT_HEADER_RECEIVED)
-            self._message.header = value
-        elif value.name == 'ContentBody':
-            self._set_state(STATE_CONTENT_BODY_RECEIVED)
-            self._message.body_frames.append(value)
-            if self._message.is_complete:
-                self._set_state(STATE_MESSAGE_ASSEMBLED)
-                if isinstance(self._message.method, commands.Basic.Deliver):
-                    self._execute_callback(
-                        self._consumers[self._message.consumer_tag],
-                        self._pop_message())
-                elif isinstance(self._message.method, commands.Basic.GetOk):
-                    self._get_future.set_result(self._pop_message())
-                else:  # This will always be Basic.Return
-                    self._execute_callback(
-                        self._on_message_return, self._pop_message())
-        elif isinstance(value, commands.Exchange.BindOk):
-            self._set_state(STATE_EXCHANGE_BINDOK_RECEIVED)
-        elif isinstance(value, commands.Exchange.DeclareOk):
-            self._set_state(STATE_EXCHANGE_DECLAREOK_RECEIVED)
-        elif isinstance(value, commands.Exchange.DeleteOk):
-            self._set_state(STATE_EXCHANGE_DELETEOK_RECEIVED)
-        elif isinstance(value, commands.Exchange.UnbindOk):
-            self._set_state(STATE_EXCHANGE_UNBINDOK_RECEIVED)
-        elif isinstance(value, commands.Queue.BindOk):
-            self._set_state(STATE_QUEUE_BINDOK_RECEIVED)
-        elif isinstance(value, commands.Queue.DeclareOk):
-            self._set_state(STATE_QUEUE_DECLAREOK_RECEIVED)
-        elif isinstance(value, commands.Queue.DeleteOk):
-            self._set_state(STATE_QUEUE_DELETEOK_RECEIVED)
-        elif isinstance(value, commands.Queue.PurgeOk):
-            self._set_state(STATE_QUEUE_PURGEOK_RECEIVED)
-        elif isinstance(value, commands.Queue.UnbindOk):
-            self._set_state(STATE_QUEUE_UNBINDOK_RECEIVED)
-        elif isinstance(value, commands.Tx.SelectOk):
-            self._transactional = True
-            self._set_state(STATE_TX_SELECTOK_RECEIVED)
-        elif isinstance(value, commands.Tx.CommitOk):
-            self._set_state(STATE_TX_COMMITOK_RECEIVED)
-        elif isinstance(value, commands.Tx.RollbackOk):
-            self._set_state(STATE_TX_ROLLBACKOK_RECEIVED)
-        else:
-            self._set_state(state.STATE_EXCEPTION,
-                            RuntimeError('Unsupported AMQ method'))
+        handler = self._frame_handlers.get(value.__class__)
+        if handler is None:
+            return self._set_state(state.STATE_EXCEPTION,
+                                   RuntimeError('Unsupported AMQ method'))
+        handler(value)
+
+    def _on_frames(self,
+                   frames: typing.List[typing.Tuple[int, frame.FrameTypes]]) \
+            -> None:
+        """Process all of the frames received in a single read, in order,
+        passing any exception raised by a frame to the IOLoop exception
+        handler so that the remaining frames are still processed.
+
+        """
+        for channel, value in frames:
+            try:
+                self._on_frame(channel, value)
+            except Exception as exc:
+                self._loop.call_exception_handler({
+                    'message': 'Exception processing {}'.format(value.name),
+                    'exception': exc})
+
+    def _on_basic_ack(self, value: commands.Basic.Ack) -> None:
+        self._set_delivery_tag_result(
+            value.delivery_tag, value.multiple, True)
+
+    def _on_basic_cancelok(self, value: commands.Basic.CancelOk) -> None:
+        callback = self._consumers.pop(value.consumer_tag)
+        if isinstance(callback, workers.WorkerPool):
+            callback.close()
+        self._lazy_consumers.discard(value.consumer_tag)
+        self._no_ack_consumers.discard(value.consumer_tag)
+        self._set_state(STATE_BASIC_CANCELOK_RECEIVED)
+
+    def _on_basic_consumeok(self, value: commands.Basic.ConsumeOk) -> None:
+        future, callback, lazy, no_ack = self._pending_consumers.popleft()
+        future.set_result(value.consumer_tag)
+        self._consumers[value.consumer_tag] = callback
+        if lazy:
+            self._lazy_consumers.add(value.consumer_tag)
+        if no_ack:
+            self._no_ack_consumers.add(value.consumer_tag)
+        self._set_state(STATE_BASIC_CONSUMEOK_RECEIVED)
+
+    def _on_basic_deliver(self, value: commands.Basic.Deliver) -> None:
+        self._set_state(STATE_BASIC_DELIVER_RECEIVED)
+        self._message = message.Message(value)
+        if self._metrics is not None:
+            self._metrics.deliveries += 1
+        if value.consumer_tag in self._no_ack_consumers:
+            self._settle_no_ack_delivery_tag(value.delivery_tag)
+
+    def _on_basic_getempty(self, _value: commands.Basic.GetEmpty) -> None:
+        self._set_state(STATE_BASIC_GETEMPTY_RECEIVED)
+        self._get_future.set_result(None)
+
+    def _on_basic_getok(self, value: commands.Basic.GetOk) -> None:
+        self._set_state(STATE_BASIC_GETOK_RECEIVED)
+        self._message = message.Message(value)
+
+    def _on_basic_nack(self, value: commands.Basic.Nack) -> None:
+        self._set_delivery_tag_result(
+            value.delivery_tag, value.multiple, False)
+
+    def _on_basic_reject(self, value: commands.Basic.Reject) -> None:
+        self._set_delivery_tag_result(value.delivery_tag, False, False)
+
+    def _on_basic_return(self, value: commands.Basic.Return) -> None:
+        self._set_state(STATE_BASIC_RETURN_RECEIVED)
+        self._message = message.Message(value)
+
+    def _on_channel_close(self, value: commands.Channel.Close) -> None:
+        self._set_state(STATE_CHANNEL_CLOSE_RECEIVED)
+        self._write_frames(commands.Channel.CloseOk())
+        self._last_error = value.reply_code, value.reply_text
+        self._channel_open.clear()
+        self._reset_acks()
+        self._fail_confirmations(exceptions.CLASS_MAPPING.get(
+            value.reply_code, exceptions.UnknownError)(value.reply_text))
+        self._set_state(STATE_CHANNEL_CLOSEOK_SENT)
+
+    def _on_channel_closeok(self, _value: commands.Channel.CloseOk) -> None:
+        self._channel_open.clear()
+        self._set_state(STATE_CHANNEL_CLOSEOK_RECEIVED)
+
+    def _on_channel_openok(self, _value: commands.Channel.OpenOk) -> None:
+        self._channel_open.set()
+        self._reset_acks()  # Delivery tags start over on the new channel
+        self._set_state(STATE_CHANNEL_OPENOK_RECEIVED)
+
+    def _on_content_body(self, value: body.ContentBody) -> None:
+        self._set_state(STATE_CONTENT_BODY_RECEIVED)
+        self._message.add_body_frame(value)
+        if self._message.is_complete:
+            self._set_state(STATE_MESSAGE_ASSEMBLED)
+            if isinstance(self._message.method, commands.Basic.Deliver):
+                self._execute_callback(
+                    self._consumers[self._message.consumer_tag],
+                    self._pop_message())
+            elif isinstance(self._message.method, commands.Basic.GetOk):
+                self._get_future.set_result(self._pop_message())
+            else:  # This will always be Basic.Return
+                self._execute_callback(
+                    self._on_message_return, self._pop_message())
+
+    def _on_content_header(self, value: header.ContentHeader) -> None:
+        self._set_state(STATE_CONTENT_HEADER_RECEIVED)
+        if isinstance(value.properties, message.LazyProperties) \
+                and self._message.consumer_tag not in self._lazy_consumers:
+            value.properties = value.properties.decoded()
+        self._message.header = value
+
+    def _on_rpc_response(self, new_state: int,
+                         _value: frame.FrameTypes) -> None:
+        self._set_state(new_state)
+
+    def _on_tx_selectok(self, _value: commands.Tx.SelectOk) -> None:
+        self._transactional = True
+        self._set_state(STATE_TX_SELECTOK_RECEIVED)
 
     def _on_remote_close(self,
                          reply_code: int = 0,
@@ -1575,24 +2406,30 @@ class Client(state.StateManager):
                           reply_code, reply_text)
         self._last_error = (reply_code, reply_text)
         if reply_code < 300:
+            self._on_connection_closed(
+                exceptions.ConnectionClosedException(reply_text))
             return self._set_state(STATE_CLOSED)
         elif reply_code == 599:
-            self._set_state(
-                STATE_CLOSED, exceptions.ConnectionClosedException(reply_text))
+            exc = exceptions.ConnectionClosedException(reply_text)
+            self._on_connection_closed(exc)
+            self._set_state(STATE_CLOSED, exc)
         else:
-            exc_class = exceptions.CLASS_MAPPING.get(
-                reply_code, exceptions.UnknownError)
-            self._set_state(state.STATE_EXCEPTION, exc_class(reply_text))
+            exc = exceptions.CLASS_MAPPING.get(
+                reply_code, exceptions.UnknownError)(reply_text)
+            self._on_connection_closed(exc)
+            self._set_state(state.STATE_EXCEPTION, exc)
 
     async def _open_channel(self) -> None:
         self._set_state(STATE_OPENING_CHANNEL)
-        self._channel += 1
-        if self._channel > self._channel0.max_channels:
-            self._channel = 1
-        self._transport.write(
-            frame.marshal(commands.Channel.Open(), self._channel))
+        self._channel = self._next_channel()
+        self._write_frames(commands.Channel.Open())
         self._set_state(STATE_CHANNEL_OPEN_SENT)
         await self._channel_open.wait()
+        if self._publisher_confirms:  # Reopened after a channel error
+            await self._send_rpc(
+                commands.Confirm.Select(),
+                STATE_CONFIRM_SELECT_SENT,
+                STATE_CONFIRM_SELECTOK_RECEIVED)
 
     def _pop_message(self) -> message.Message:
         if not self._message:
@@ -1625,14 +2462,79 @@ class Client(state.StateManager):
                                  *self._last_error)
         return result
 
+    async def _publish(self,
+                       exchange: str,
+                       routing_key: str,
+                       message_body: typing.Union[bytes, str],
+                       mandatory: bool,
+                       app_id: typing.Optional[str],
+                       content_encoding: typing.Optional[str],
+                       content_type: typing.Optional[str],
+                       correlation_id: typing.Optional[str],
+                       delivery_mode: typing.Optional[int],
+                       expiration: typing.Optional[str],
+                       headers: typing.Optional[types.FieldTable],
+                       message_id: typing.Optional[str],
+                       message_type: typing.Optional[str],
+                       priority: typing.Optional[int],
+                       reply_to: typing.Optional[str],
+                       timestamp: typing.Optional[datetime.datetime],
+                       user_id: typing.Optional[str]) \
+            -> typing.Optional[asyncio.Future]:
+        """Validate and write the message, returning the future for its
+        confirmation if publisher confirms are enabled
+
+        """
+        frames = self._message_frames(
+            exchange, routing_key, message_body, mandatory, app_id,
+            content_encoding, content_type, correlation_id, delivery_mode,
+            expiration, headers, message_id, message_type, priority,
+            reply_to, timestamp, user_id)
+        await self._wait_on_confirm_window()
+        futures = await self._write_messages(
+            1, functools.partial(self._marshal_frames, frames))
+        return futures[0]
+
     async def _reconnect(self) -> None:
         self._logger.debug('Reconnecting to RabbitMQ')
+        if self._metrics is not None:
+            self._metrics.reconnects += 1
         publisher_confirms = self._publisher_confirms
         self._reset()
         await self._connect()
         await self._open_channel()
         if publisher_confirms:
-            await self.confirm_select()
+            await self.confirm_select(self._max_in_flight)
+
+    def _raise_ack_floor(self, floor: int,
+                         pending: typing.AbstractSet[int] = frozenset()) \
+            -> int:
+        """Return the highest delivery tag with it and all lower delivery
+        tags above ``floor`` either in ``pending`` or settled, removing the
+        settled delivery tags at or below it.
+
+        The settled delivery tags are kept in a heap, so each one is only
+        visited when the floor reaches it, keeping the cost of a flush
+        independent of the number of delivery tags settled above the floor.
+
+        """
+        settled = self._ack_settled
+        while True:
+            while settled and settled[0] <= floor:
+                heapq.heappop(settled)
+            if floor + 1 in pending or (settled and settled[0] == floor + 1):
+                floor += 1
+            else:
+                return floor
+
+    def _reset_acks(self) -> None:
+        """Discard the buffered acknowledgements and settled delivery tags"""
+        if self._ack_timer is not None:
+            self._ack_timer.cancel()
+            self._ack_timer = None
+        self._ack_floor = 0
+        self._ack_pending.clear()
+        self._ack_settled.clear()
 
     def _reset(self) -> None:
         self._logger.debug('Resetting internal state')
@@ -1642,6 +2544,8 @@ class Client(state.StateManager):
         self._channel0 = None
         self._connected.clear()
         self._exception = None
+        self._on_connection_closed(
+            exceptions.ConnectionClosedException('Connection reset'))
         self._protocol = None
         self._publisher_confirms = False
         self._transport = None
@@ -1658,22 +2562,80 @@ class Client(state.StateManager):
         states = list(states) + [STATE_CHANNEL_CLOSE_RECEIVED]
         exc, result = None, 0
         async with self._rpc_lock:
+            await self._drain()
             if not self.is_closed:
+                self._flush_acks()
                 self._write_frames(value)
                 self._set_state(new_state)
+                start = self._loop.time()
                 try:
                     result = await super()._wait_on_state(*states)
                 except exceptions.AIORabbitException as err:
                     exc = err
+                else:
+                    if self._metrics is not None:
+                        self._metrics.observe_rpc(
+                            value.name, self._loop.time() - start)
         return await self._post_wait_on_state(result, exc, True)
 
-    def _set_delivery_tag_result(self, delivery_tag: int, ack: bool):
-        if not self._delivery_tags:
+    def _set_settled_state(self, value: int) -> None:
+        """Set the state after sending a ``Basic.Ack``, ``Basic.Nack``, or
+        ``Basic.Reject``, unless a message is being received or an RPC is
+        in progress. Messages are settled without a reply from RabbitMQ, so
+        they may be settled by concurrent consumer callbacks at any time.
+
+        """
+        if value in self.STATE_TRANSITIONS[self._state]:
+            self._set_state(value)
+
+    def _set_delivery_tag_result(self, delivery_tag: int,
+                                 multiple: bool, ack: bool) -> None:
+        """Resolve the confirmation future for the delivery tag, or for all
+        delivery tags up to and including it if ``multiple`` is set.
+
+        Tags at or below ``_confirmed_tag`` have all been resolved, so a
+        multiple acknowledgement only visits the tags above it and each tag
+        is visited at most once, making the cost amortized O(1) per message.
+
+        """
+        if multiple:
+            tags = range(self._confirmed_tag + 1, delivery_tag + 1)
+            self._confirmed_tag = max(self._confirmed_tag, delivery_tag)
+        else:
+            tags = (delivery_tag,)
+        for tag in tags:
+            future = self._delivery_tags.pop(tag, None)
+            if future is not None and not future.done():
+                future.set_result(ack)
+        if self._metrics is not None:
+            self._observe_confirmations(tags, ack)
+        self._confirm_window.set()
+
+    def _settle_delivery_tag(self, delivery_tag: int, multiple: bool) -> None:
+        """Flush the buffered acknowledgements and track the delivery tags
+        settled by a ``Basic.Ack``, ``Basic.Nack``, or ``Basic.Reject`` that
+        is not buffered, when :meth:`Client.coalesce_acks` is enabled
+
+        """
+        if not self._ack_max_pending:
             return
-        for tag in range(min(self._delivery_tags.keys()), delivery_tag + 1):
-            if tag in self._delivery_tags:
-                self._confirmation_result[tag] = ack
-                self._delivery_tags[tag].set()
+        self._flush_acks()
+        if multiple:
+            self._ack_floor = max(self._ack_floor, delivery_tag)
+        else:
+            heapq.heappush(self._ack_settled, delivery_tag)
+        self._ack_floor = self._raise_ack_floor(self._ack_floor)
+
+    def _settle_no_ack_delivery_tag(self, delivery_tag: int) -> None:
+        """Track the delivery tag of a message delivered with ``no_ack`` as
+        settled when :meth:`Client.coalesce_acks` is enabled, since it is
+        never acknowledged and would otherwise keep the delivery tags after
+        it from being acknowledged with ``multiple``
+
+        """
+        if self._ack_max_pending:
+            heapq.heappush(self._ack_settled, delivery_tag)
+            self._ack_floor = self._raise_ack_floor(self._ack_floor)
 
     @staticmethod
     def _validate_bool(name: str, value: typing.Any) -> None:
@@ -1704,11 +2666,88 @@ class Client(state.StateManager):
         elif len(value) > 256:
             raise ValueError('{} must not exceed 256 characters'.format(name))
 
+    async def _wait_on_confirm_window(self) -> typing.Optional[int]:
+        """Wait until there is room in the ``max_in_flight`` window of
+        unconfirmed messages, returning the number of messages that can be
+        published, or `None` if the window is not limited
+
+        """
+        if not self._publisher_confirms or not self._max_in_flight:
+            return None
+        while len(self._delivery_tags) >= self._max_in_flight:
+            self._confirm_window.clear()
+            await self._confirm_window.wait()
+        return self._max_in_flight - len(self._delivery_tags)
+
+    def _write(self, data: typing.List[bytes]) -> None:
+        """Write the marshalled frames to the socket in a single call"""
+        if self._metrics is not None:
+            self._metrics.bytes_sent += sum(len(value) for value in data)
+        self._transport.writelines(data)
+
     def _write_frames(self, *frames: frame.FrameTypes) -> None:
-        """Write one or more frames to the socket, marshalling on the way"""
-        for value in frames:
-            self._logger.debug('Writing frame: %r', value)
-            self._transport.write(frame.marshal(value, self._channel))
+        """Write one or more frames to the socket, marshalling on the way.
+        All of the frames are handed to the transport in a single call.
+
+        """
+        self._write(self._marshal_frames(frames, self._channel))
+
+    def _wake_consumers(self) -> None:
+        """Wake the :meth:`consume` generators so they can exit and cancel
+        the workers of consumers started with ``concurrency``
+
+        """
+        for messages in self._consume_queues:
+            messages.put_nowait(None)
+        for callback in self._consumers.values():
+            if isinstance(callback, workers.WorkerPool):
+                callback.cancel()
+
+    async def _write_messages(
+            self, count: int,
+            marshal: typing.Callable[[int], typing.List[bytes]]) \
+            -> typing.List[typing.Optional[asyncio.Future]]:
+        """Write the frames of one or more messages in a single write,
+        returning the future for the confirmation of each message if
+        publisher confirms are enabled.
+
+        The frames are marshalled by invoking ``marshal`` with the channel
+        number once the channel is open, since it may be reopened on a new
+        channel number if it was closed by RabbitMQ.
+
+        """
+        await self._drain()
+        if self._state == STATE_CHANNEL_CLOSEOK_SENT:  # Closed by RabbitMQ
+            await self._post_wait_on_state(STATE_CHANNEL_CLOSE_RECEIVED)
+        futures = []
+        for _offset in range(count):
+            future = None
+            self._delivery_tag += 1
+            if self._publisher_confirms:
+                future = self._loop.create_future()
+                self._delivery_tags[self._delivery_tag] = future
+            futures.append(future)
+        if self._metrics is not None:
+            self._observe_published(count)
+        self._write(marshal(self._channel))
+        self._set_state(STATE_MESSAGE_PUBLISHED)
+        return futures
+
+    async def _wait_on_confirmation(self, future: asyncio.Future) -> bool:
+        """Wait on a publisher confirmation, reopening the channel or
+        reconnecting if it failed due to the channel or connection closing
+
+        """
+        try:
+            return await future
+        except self.CONNECTING_EXCEPTIONS:
+            raise
+        except exceptions.AIORabbitException as exc:
+            if self.is_closed:
+                await self._post_wait_on_state(exc=exc)
+            await self._post_wait_on_state(
+                STATE_CHANNEL_CLOSE_RECEIVED, raise_on_channel_close=True)
+            raise
 
     async def _wait_on_state(self, *args: int) -> int:
         args = list(args) + [STATE_CHANNEL_CLOSE_RECEIVED]
@@ -182,6 +182,13 @@ class ConnectionClosedException(AIORabbitException):
     """
 
 
+class ChannelClosedException(AIORabbitException):
+    """A :class:`~aiorabbit.channel.Channel` was used after it was closed,
+    either explicitly or because the connection it belongs to was closed.
+
+    """
+
+
 class StateTransitionError(AIORabbitException):
     """The client implements a strict state machine for what is currently
     happening in the communication with RabbitMQ.
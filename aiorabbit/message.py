@@ -1,24 +1,141 @@
 # coding: utf-8
 import datetime
+import struct
 import typing
 
-from pamqp import body, commands, header
+from pamqp import body, commands, decode, exceptions, header
 
 METHODS = typing.Union[commands.Basic.Deliver,
                        commands.Basic.GetOk,
                        commands.Basic.Return]
 
+_CONTENT_HEADER = struct.Struct('>HHQH')
+_DEFAULTS = commands.Basic.Properties()
+_TABLE_SIZE = struct.Struct('>I')
+
+
+class LazyProperties(commands.Basic.Properties):
+    """:class:`~pamqp.commands.Basic.Properties` that keep the marshalled
+    property data received from RabbitMQ, decoding each property the first
+    time it is accessed.
+
+    Properties are only located in the data when the first one is accessed,
+    which skips over the preceding values by their encoded size without
+    decoding them, so unread properties, such as a large ``headers`` table,
+    are never decoded.
+
+    :param flags: **For internal use only**
+    :param data: **For internal use only**
+
+    """
+    # Not slotted, since pamqp iterates ``__slots__`` to marshal and compare
+    # properties and it must remain the Basic.Properties attribute list
+
+    def __init__(self, flags: int, data: bytes) -> None:
+        # Basic.Properties.__init__ is not invoked, leaving the slots unset
+        # so that __getattr__ is invoked the first time each one is accessed
+        self._raw_flags = flags
+        self._raw_data = data
+        self._raw_offsets: typing.Optional[
+            typing.Dict[str, typing.Tuple[int, int]]] = None
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name not in _DEFAULTS.flags:
+            raise AttributeError(name)
+        if self._raw_offsets is None:
+            self._raw_offsets = self._locate()
+        if name in self._raw_offsets:
+            start, end = self._raw_offsets[name]
+            try:
+                _consumed, value = decode.by_type(
+                    self._raw_data[start:end], self.amqp_type(name))
+            except (struct.error, ValueError) as error:
+                raise exceptions.UnmarshalingException(
+                    'Basic.Properties', error)
+        else:
+            value = getattr(_DEFAULTS, name)
+        setattr(self, name, value)
+        return value
+
+    def decode(self) -> None:
+        """Decode all of the properties that are not yet decoded"""
+        for name in self.__slots__:
+            getattr(self, name)
+
+    def decoded(self) -> commands.Basic.Properties:
+        """Return a :class:`~pamqp.commands.Basic.Properties` with all of the
+        properties decoded, which does not keep the marshalled data
+
+        """
+        value = commands.Basic.Properties()
+        try:
+            value.unmarshal(self._raw_flags, self._raw_data)
+        except (IndexError, struct.error, ValueError) as error:
+            raise exceptions.UnmarshalingException('Basic.Properties', error)
+        return value
+
+    def _locate(self) -> typing.Dict[str, typing.Tuple[int, int]]:
+        """Return the start and end offsets of each property in the data"""
+        data, offset, offsets = self._raw_data, 0, {}
+        try:
+            for name in self.__slots__:
+                if not self._raw_flags & self.flags[name]:
+                    continue
+                data_type = self.amqp_type(name)
+                if data_type == 'shortstr':
+                    size = 1 + data[offset]
+                elif data_type == 'table':
+                    size = 4 + _TABLE_SIZE.unpack_from(data, offset)[0]
+                else:
+                    size = 1 if data_type == 'octet' else 8
+                offsets[name] = offset, offset + size
+                offset += size
+        except (IndexError, struct.error) as error:
+            raise exceptions.UnmarshalingException('Basic.Properties', error)
+        if offset > len(data):
+            raise exceptions.UnmarshalingException(
+                'Basic.Properties', 'Property data is truncated')
+        return offsets
+
+
+def unmarshal_content_header(data: bytes) -> header.ContentHeader:
+    """Unmarshal the payload of a content header frame, returning a content
+    header with :class:`LazyProperties` instead of decoded properties.
+
+    :param data: **For internal use only**
+    :raises pamqp.exceptions.UnmarshalingException: if the data is invalid
+
+    """
+    try:
+        class_id, weight, body_size, flags = \
+            _CONTENT_HEADER.unpack_from(data)
+    except struct.error as error:
+        raise exceptions.UnmarshalingException('ContentHeader', error)
+    value = header.ContentHeader(
+        weight, body_size,
+        LazyProperties(flags, data[_CONTENT_HEADER.size:]))
+    value.class_id = class_id
+    return value
+
 
 class Message:
     """Represents a message received from RabbitMQ
 
+    Messages are slotted to keep the memory used by each message small when
+    many messages are in flight, such as with a large prefetch count. Only
+    the method frame, the content header, and the body are kept.
+
     :param method: **For internal use only**
 
     """
+    __slots__ = ('method', 'header', '_body', '_buffer', '_received')
+
     def __init__(self, method: METHODS) -> None:
         self.method = method
+        self._body: typing.Optional[bytes] = None
+        self._buffer: typing.Optional[bytearray] = None
+        self._received = 0
         self.header: typing.Optional[header.ContentHeader] = None
-        self.body_frames: typing.List[body.ContentBody] = []
 
     def __bytes__(self) -> bytes:
         """Return the message body if the instance is accessed using
@@ -31,6 +148,30 @@ class Message:
         """Return the length of the message body"""
         return len(self.body)
 
+    def add_body_frame(self, value: body.ContentBody) -> None:
+        """Add the content of a body frame to the message body.
+
+        A body received in a single frame is used as is. Otherwise, the
+        frames are copied into a buffer allocated for the size of the body
+        given in the header, which is turned into the immutable body once,
+        when the last frame is added. The body is always :class:`bytes`, so
+        it can be published as is and can not be changed by the consumer.
+
+        :param value: **For internal use only**
+
+        """
+        size = len(value.value)
+        if not self._received and size == self.header.body_size:
+            self._body, self._received = bytes(value.value), size
+            return
+        elif self._buffer is None:
+            self._buffer = bytearray(self.header.body_size)
+        end = self._received + size
+        self._buffer[self._received:end] = value.value
+        self._received = end
+        if self.is_complete:
+            self._body, self._buffer = bytes(self._buffer), None
+
     @property
     def consumer_tag(self) -> typing.Optional[str]:
         """If the delivered via ``Basic.Deliver``, this provides the
@@ -168,14 +309,18 @@ class Message:
     @property
     def body(self) -> bytes:
         """Provides the message body"""
-        return b''.join([b.value for b in self.body_frames])
+        if self._body is not None:
+            return self._body
+        elif self._buffer is not None:  # Incomplete
+            return bytes(self._buffer[:self._received])
+        return b''
 
     @property
     def body_size(self) -> int:
         """Return the current size of received body data"""
-        return sum(len(b.value) for b in self.body_frames)
+        return self._received
 
     @property
-    def is_complete(self):
+    def is_complete(self) -> bool:
         #  Used when receiving frames from RabbitMQ
-        return self.body_size == self.header.body_size
+        return self._received == self.header.body_size
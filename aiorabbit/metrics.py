@@ -0,0 +1,181 @@
+# coding: utf-8
+import array
+import bisect
+import typing
+
+# The default upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_COUNTERS = ('frames_received', 'bytes_received', 'frames_sent',
+             'bytes_sent', 'published', 'confirmed', 'confirm_nacks',
+             'deliveries', 'acks', 'nacks', 'rejects', 'reconnects',
+             'blocked')
+
+
+class Histogram:
+    """A fixed-bucket histogram, counting the observed values in an
+    :class:`array.array` with a slot for each bucket upper bound and one for
+    values greater than the last bound.
+
+    :param bounds: The ascending upper bounds of the buckets
+    :raises ValueError: if ``bounds`` is empty or not in ascending order
+
+    """
+    __slots__ = ('bounds', 'count', 'counts', 'sum')
+
+    def __init__(self, bounds: typing.Sequence[float] = DEFAULT_BUCKETS):
+        if not bounds or list(bounds) != sorted(set(bounds)):
+            raise ValueError('bounds must be unique values in ascending order')
+        self.bounds = tuple(bounds)
+        self.count = 0
+        self.counts = array.array('Q', bytes(8 * (len(self.bounds) + 1)))
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Count the value in the first bucket with a bound that is greater
+        than or equal to it
+
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, value: float) -> typing.Optional[float]:
+        """Return the estimated percentile of the observed values, linearly
+        interpolated within the bucket it falls in, or `None` if no values
+        were observed. Values in the overflow bucket are estimated as the
+        last bucket upper bound.
+
+        :param value: The percentile to return, from `0` to `100`
+
+        """
+        if not self.count:
+            return None
+        rank, seen = self.count * value / 100, 0
+        for offset, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if offset == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[offset - 1] if offset else 0.0
+                return lower + (self.bounds[offset] - lower) * (
+                    (rank - seen) / count)
+            seen += count
+        return self.bounds[-1]
+
+    def reset(self) -> None:
+        """Discard the observed values"""
+        for offset in range(len(self.counts)):
+            self.counts[offset] = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def snapshot(self) -> dict:
+        """Return the observed values as a :class:`dict` with the ``count``,
+        ``sum``, estimated ``p50``, ``p90``, and ``p99`` percentiles, and the
+        count for each bucket keyed by its upper bound, with ``+Inf`` for
+        values greater than the last bound
+
+        """
+        buckets = {repr(bound): count
+                   for bound, count in zip(self.bounds, self.counts)}
+        buckets['+Inf'] = self.counts[-1]
+        return {'count': self.count,
+                'sum': self.sum,
+                'p50': self.percentile(50),
+                'p90': self.percentile(90),
+                'p99': self.percentile(99),
+                'buckets': buckets}
+
+
+class Metrics:
+    """Counters and latency histograms for a
+    :class:`~aiorabbit.client.Client` created with ``metrics``, shared with
+    the channels opened with :meth:`Client.channel
+    <aiorabbit.client.Client.channel>`.
+
+    The counters are plain attributes incremented by the client, and the
+    latencies are counted in :class:`Histogram` instances, so collecting
+    them only costs an addition or a bisect of the bucket bounds. Latencies
+    are in seconds, measured with the IOLoop clock. Subclasses can extend
+    :meth:`snapshot` to export additional values.
+
+    :param buckets: The upper bounds of the latency histogram buckets
+
+    .. code-block:: python3
+       :caption: Example Usage
+
+        client = aiorabbit.client.Client(
+            RABBITMQ_URL, metrics=aiorabbit.metrics.Metrics())
+        await client.connect()
+        ...
+        LOGGER.info('Metrics: %r', client.metrics.snapshot())
+
+    """
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS):
+        self.frames_received = 0
+        """The number of frames received"""
+        self.bytes_received = 0
+        """The number of bytes received"""
+        self.frames_sent = 0
+        """The number of frames sent"""
+        self.bytes_sent = 0
+        """The number of bytes sent"""
+        self.published = 0
+        """The number of messages published"""
+        self.confirmed = 0
+        """The number of published messages acknowledged by RabbitMQ"""
+        self.confirm_nacks = 0
+        """The number of published messages negatively acknowledged"""
+        self.deliveries = 0
+        """The number of messages delivered to consumers"""
+        self.acks = 0
+        """The number of delivered messages acknowledged"""
+        self.nacks = 0
+        """The number of delivered messages negatively acknowledged"""
+        self.rejects = 0
+        """The number of delivered messages rejected"""
+        self.reconnects = 0
+        """The number of times the client reconnected"""
+        self.blocked = 0
+        """The number of times RabbitMQ blocked the connection"""
+        self.blocked_seconds = 0.0
+        """The time the connection spent blocked by RabbitMQ"""
+        self.confirm_latency = Histogram(buckets)
+        """The time from publishing a message to its confirmation"""
+        self.rpc_latency: typing.Dict[str, Histogram] = {}
+        """The time from sending an RPC to its response, by method name"""
+        self._buckets = tuple(buckets)
+
+    def observe_rpc(self, name: str, value: float) -> None:
+        """Count the latency of an RPC
+
+        :param name: The AMQ method name, such as ``Queue.Declare``
+        :param value: The latency in seconds
+
+        """
+        histogram = self.rpc_latency.get(name)
+        if histogram is None:
+            histogram = self.rpc_latency[name] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def reset(self) -> None:
+        """Reset all of the counters and histograms"""
+        for name in _COUNTERS:
+            setattr(self, name, 0)
+        self.blocked_seconds = 0.0
+        self.confirm_latency.reset()
+        self.rpc_latency.clear()
+
+    def snapshot(self) -> dict:
+        """Return the current values as a :class:`dict` of the counters, with
+        :meth:`Histogram.snapshot` values for the latency histograms
+
+        """
+        values = {name: getattr(self, name) for name in _COUNTERS}
+        values['blocked_seconds'] = self.blocked_seconds
+        values['confirm_latency'] = self.confirm_latency.snapshot()
+        values['rpc_latency'] = {
+            name: histogram.snapshot()
+            for name, histogram in sorted(self.rpc_latency.items())}
+        return values
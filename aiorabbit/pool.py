@@ -0,0 +1,181 @@
+# coding: utf-8
+import asyncio
+import contextlib
+import dataclasses
+import logging
+import ssl
+import typing
+
+from aiorabbit import client, DEFAULT_LOCALE, DEFAULT_PRODUCT, DEFAULT_URL
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass()
+class _Connection:
+    client: client.Client
+    leases: int = 0
+    last_used: float = 0.0
+
+
+class Pool:
+    """A pool of connected :class:`~aiorabbit.client.Client` instances
+    shared by the code acquiring them.
+
+    Connections are opened lazily: the pool connects ``min_size`` clients
+    the first time a client is acquired, and adds clients up to ``max_size``
+    when every client in the pool is in use. Each acquisition is given the
+    least-loaded client, which may be shared with other acquisitions since
+    the client serializes its RPCs.
+
+    Clients that are no longer connected are removed from the pool, and
+    clients over ``min_size`` that have not been used for ``idle_timeout``
+    seconds are closed, when a client is acquired.
+
+    :param url: The URL to connect to RabbitMQ with
+    :param min_size: The number of clients to keep connected
+    :param max_size: The maximum number of clients to connect
+    :param idle_timeout: Seconds an unused client over ``min_size`` is kept
+    :param locale: The locale to specify for the RabbitMQ connection
+    :param product: The project name to specify for the RabbitMQ connection
+    :param loop: An optional IO Loop to specify, if unspecified,
+        :func:`asyncio.get_running_loop` will be used to determine the IO Loop.
+    :type loop: :class:`~asyncio.AbstractEventLoop`
+    :param on_return: An optional callback method to be invoked if the server
+        returns a message published by one of the clients
+    :type on_return: :class:`~collections.abc.Callable`
+    :param ssl_context: Optional :class:`ssl.SSLContext` for the connections
+    :raises TypeError: if ``min_size`` or ``max_size`` is not an int
+    :raises ValueError: if ``max_size`` is less than 1 or ``min_size``
+        is negative or greater than ``max_size``
+
+    .. code-block:: python3
+       :caption: Example Usage
+
+        pool = aiorabbit.pool.Pool(RABBITMQ_URL, min_size=2, max_size=10)
+        async with pool.acquire() as client:
+            await client.publish('amq.topic', 'routing-key', b'Hello')
+        await pool.close()
+
+    """
+    def __init__(self,
+                 url: str = DEFAULT_URL,
+                 min_size: int = 1,
+                 max_size: int = 10,
+                 idle_timeout: float = 60.0,
+                 locale: str = DEFAULT_LOCALE,
+                 product: str = DEFAULT_PRODUCT,
+                 loop: typing.Optional[asyncio.AbstractEventLoop] = None,
+                 on_return: typing.Optional[typing.Callable] = None,
+                 ssl_context: typing.Optional[ssl.SSLContext] = None):
+        if not isinstance(min_size, int) or isinstance(min_size, bool):
+            raise TypeError('min_size must be of type int')
+        elif not isinstance(max_size, int) or isinstance(max_size, bool):
+            raise TypeError('max_size must be of type int')
+        elif max_size < 1:
+            raise ValueError('max_size must be greater than 0')
+        elif not 0 <= min_size <= max_size:
+            raise ValueError('min_size must be between 0 and max_size')
+        self._clients: typing.List[_Connection] = []
+        self._closed = False
+        self._idle_timeout = idle_timeout
+        self._locale = locale
+        self._lock = asyncio.Lock()
+        self._loop = loop or asyncio.get_running_loop()
+        self._max_size = max_size
+        self._min_size = min_size
+        self._on_return = on_return
+        self._product = product
+        self._ssl_context = ssl_context
+        self._url = url
+
+    @property
+    def in_use(self) -> int:
+        """Returns the number of active acquisitions across all clients"""
+        return sum(value.leases for value in self._clients)
+
+    @property
+    def is_closed(self) -> bool:
+        """Indicates if the pool is closed"""
+        return self._closed
+
+    @property
+    def size(self) -> int:
+        """Returns the number of clients in the pool"""
+        return len(self._clients)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> typing.AsyncGenerator[client.Client, None]:
+        """Asynchronous :ref:`context-manager <python:typecontextmanager>`
+        that acquires the least-loaded client in the pool, connecting a new
+        client if needed, and releases it when complete.
+
+        :raises RuntimeError: if the pool is closed
+
+        .. code-block:: python3
+           :caption: Example Usage
+
+            async with pool.acquire() as client:
+                await client.queue_declare('test')
+
+        """
+        connection = await self._acquire()
+        try:
+            yield connection.client
+        finally:
+            connection.leases -= 1
+            connection.last_used = self._loop.time()
+
+    async def close(self) -> None:
+        """Close all of the clients in the pool"""
+        self._closed = True
+        async with self._lock:
+            clients, self._clients = self._clients, []
+            for connection in clients:
+                await self._close(connection)
+
+    async def _acquire(self) -> _Connection:
+        if self._closed:
+            raise RuntimeError('Pool is closed')
+        async with self._lock:
+            await self._prune()
+            while len(self._clients) < self._min_size:
+                await self._connect()
+            connection = min(self._clients, default=None,
+                             key=lambda value: value.leases)
+            if (connection is None or connection.leases) \
+                    and len(self._clients) < self._max_size:
+                connection = await self._connect()
+            connection.leases += 1
+            return connection
+
+    @staticmethod
+    async def _close(connection: _Connection) -> None:
+        if not connection.client.is_closed:
+            await connection.client.close()
+
+    async def _connect(self) -> _Connection:
+        value = client.Client(self._url, self._locale, self._product,
+                              self._loop, self._on_return, self._ssl_context)
+        await value.connect()
+        connection = _Connection(value, 0, self._loop.time())
+        self._clients.append(connection)
+        LOGGER.debug('Added client %i to the pool', len(self._clients))
+        return connection
+
+    async def _prune(self) -> None:
+        """Remove clients that are no longer connected and close clients
+        over the minimum size that have been idle for too long
+
+        """
+        now = self._loop.time()
+        for connection in list(self._clients):
+            if not connection.client.is_connected:
+                LOGGER.debug('Removing disconnected client from the pool')
+                self._clients.remove(connection)
+            elif len(self._clients) > self._min_size \
+                    and not connection.leases \
+                    and now - connection.last_used > self._idle_timeout:
+                LOGGER.debug('Closing idle client in the pool')
+                self._clients.remove(connection)
+                await self._close(connection)
@@ -1,48 +1,177 @@
 # coding: utf-8
 import asyncio
 import logging
+import struct
 import typing
 
-from pamqp import exceptions, frame
+from pamqp import body, constants, exceptions, frame
+
+from aiorabbit import message, metrics, tracing
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_BUFFER_SIZE = constants.FRAME_MAX_SIZE
+MIN_READ_SIZE = 4096
+
+_CONTENT_FRAMES = {constants.FRAME_BODY, constants.FRAME_HEADER}
+_FRAME_HEADER = struct.Struct('>BHI')
+
+
+class AMQP(asyncio.BufferedProtocol):
+    """AMQP Protocol adapter for AsyncIO
+
+    Data is read directly into a reusable :class:`bytearray` and frames are
+    parsed from it by offset. Unparsed data is only moved to the front of the
+    buffer when there is not enough room left to read into, and the buffer
+    is only grown when a frame is larger than its capacity.
 
-class AMQP(asyncio.Protocol):
-    """AMQP Protocol adapter for AsyncIO"""
+    Content header frames are parsed with
+    :func:`~aiorabbit.message.unmarshal_content_header`, leaving the message
+    properties to be decoded when they are accessed.
+
+    All of the frames parsed from a single read are passed in order, as a
+    list of ``(channel, frame)`` tuples, to ``on_frames_received`` in a
+    single callback scheduled on the IOLoop.
+
+    When the transport's write buffer goes over its high-water mark, writers
+    can wait on :meth:`drain` until it is back under the low-water mark.
+
+    If ``metrics`` is set, the frames and bytes received are counted in it,
+    and if ``frame_callbacks`` has any callbacks, they are invoked with the
+    channel, type, and size of each frame received.
+
+    """
     def __init__(self,
                  on_connected: callable,
                  on_disconnected: callable,
-                 on_frame_received: callable):
-        self.buffer: bytes = b''
+                 on_frames_received: callable,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 metrics: typing.Optional[metrics.Metrics] = None,
+                 frame_callbacks: typing.Optional[
+                     typing.List[tracing.FrameCallback]] = None):
+        self.buffer = bytearray(buffer_size)
+        self.frame_callbacks = \
+            [] if frame_callbacks is None else frame_callbacks
+        self.metrics = metrics
         self.loop = asyncio.get_running_loop()
         self.on_connected = on_connected
         self.on_disconnected = on_disconnected
-        self.on_frame_received = on_frame_received
+        self.on_frames_received = on_frames_received
         self.transport: typing.Optional[asyncio.Transport] = None
+        self._needed = 0
+        self._read_offset = 0
+        self._view = memoryview(self.buffer)
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._write_offset = 0
+
+    @property
+    def is_paused(self) -> bool:
+        """Indicates if writing is paused due to the transport's write
+        buffer being over its high-water mark
+
+        """
+        return not self._writable.is_set()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of bytes received that are not yet parsed"""
+        return self._write_offset - self._read_offset
 
     def connection_made(self, transport) -> None:
         self.transport = transport
         self.on_connected()
 
     def connection_lost(self, exc: typing.Optional[Exception]) -> None:
+        self._writable.set()  # Release any writers waiting to drain
         self.on_disconnected(exc)
 
-    def data_received(self, data: bytes) -> None:
-        self.buffer += data
-        while self.buffer:
+    async def drain(self) -> None:
+        """Wait until the transport's write buffer is under its low-water
+        mark if writing is paused, returning immediately otherwise
+
+        """
+        if not self._writable.is_set():
+            await self._writable.wait()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        wanted = max(sizehint, self._needed - self.pending, MIN_READ_SIZE)
+        if len(self.buffer) - self._write_offset < wanted:
+            self._compact(self.pending + wanted)
+        return self._view[self._write_offset:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._write_offset += nbytes
+        frames, traced, view, self._needed = [], [], self._view, 0
+        while self._read_offset < self._write_offset:
+            offset = self._read_offset
+            available = self._write_offset - offset
+            if available < 8:  # Smallest frame is the heartbeat frame
+                self._needed = 8
+                break
+            frame_type, channel, size = _FRAME_HEADER.unpack_from(
+                self.buffer, offset)
+            count = constants.FRAME_HEADER_SIZE + size + 1
+            if view[offset:offset + 4] == constants.AMQP:
+                count = 8
+            elif available < count:
+                self._needed = count
+                break
             try:
-                count, channel, value = frame.unmarshal(self.buffer)
+                if frame_type not in _CONTENT_FRAMES \
+                        or self.buffer[offset + count - 1] != \
+                        constants.FRAME_END:
+                    count, channel, value = frame.unmarshal(
+                        bytes(view[offset:offset + count]))
+                elif frame_type == constants.FRAME_BODY:
+                    value = body.ContentBody(bytes(view[
+                        offset + constants.FRAME_HEADER_SIZE:
+                        offset + count - 1]))
+                else:
+                    value = message.unmarshal_content_header(bytes(view[
+                        offset + constants.FRAME_HEADER_SIZE:
+                        offset + count - 1]))
             except exceptions.UnmarshalingException as error:
                 LOGGER.warning('Failed to unmarshal a frame: %r', error)
-                LOGGER.debug('Bad frame: %r', self.buffer)
+                LOGGER.debug('Bad frame: %r', bytes(view[offset:]))
                 break
-            else:
-                self.buffer = self.buffer[count:]
-                self.loop.call_soon(self.on_frame_received, channel, value)
+            self._read_offset += count
+            frames.append((channel, value))
+            if self.frame_callbacks:
+                traced.append((channel, value.name, count))
+        if self._read_offset == self._write_offset:
+            self._read_offset = self._write_offset = 0
+        if traced:
+            tracing.invoke(self.frame_callbacks, traced)
+        if self.metrics is not None:
+            self.metrics.bytes_received += nbytes
+            self.metrics.frames_received += len(frames)
+        if frames:
+            self.loop.call_soon(self.on_frames_received, frames)
+
+    def pause_writing(self) -> None:
+        LOGGER.debug('Write buffer is over the high-water mark, pausing')
+        self._writable.clear()
+
+    def resume_writing(self) -> None:
+        LOGGER.debug('Write buffer is under the low-water mark, resuming')
+        self._writable.set()
 
-    def pause_writing(self) -> None:  # pragma: nocover
-        LOGGER.critical('Should pause writing, but it is not implemented')
+    def _compact(self, capacity: int) -> None:
+        """Move unparsed data to the front of the buffer, allocating a larger
+        buffer if the requested capacity exceeds the current one. A new
+        buffer is allocated instead of resizing in place, since the transport
+        may still hold a view of the buffer returned by the last
+        :meth:`get_buffer` call.
 
-    def resume_writing(self) -> None:  # pragma: nocover
-        LOGGER.info('Can resume writing, but it is not implemented')
+        """
+        pending = self.pending
+        if capacity > len(self.buffer):
+            buffer = bytearray(max(capacity, len(self.buffer) * 2))
+            buffer[:pending] = self._view[
+                self._read_offset:self._write_offset]
+            self.buffer, self._view = buffer, memoryview(buffer)
+        elif self._read_offset:
+            self._view[:pending] = self._view[
+                self._read_offset:self._write_offset]
+        self._read_offset, self._write_offset = 0, pending
@@ -52,9 +52,21 @@ class StateManager:
         return self._loop.time() - self._state_start
 
     def _clear_waits(self, wait_id: int) -> None:
-        for state in self._waits.keys():
-            if wait_id in self._waits[state].keys():
-                del self._waits[state][wait_id]
+        for waits in self._waits.values():
+            waits.pop(wait_id, None)
+
+    def _notify_waiters(self, value: int, everyone: bool = False) -> None:
+        """Resolve the futures of waiters blocked on the state value, or of
+        all waiters when ``everyone`` is set so they can pick up an exception
+
+        """
+        if everyone:
+            futures = [f for w in self._waits.values() for f in w.values()]
+        else:
+            futures = self._waits.get(value, {}).values()
+        for future in futures:
+            if not future.done():
+                future.set_result(value)
 
     def _on_exception(self,
                       _loop: asyncio.AbstractEventLoop,
@@ -85,6 +97,7 @@ class StateManager:
                 'Invalid state transition from {!r} to {!r}'.format(
                     self.state, self.state_description(value)))
             self._exception = exc
+            self._notify_waiters(self._state, True)
             raise exc
         self._logger.debug(
             'Transition to 0x%x: %s from 0x%x: %s after %.4f seconds',
@@ -93,39 +106,30 @@ class StateManager:
         self._exception = exc
         self._state = value
         self._state_start = self._loop.time()
-        if self._state in self._waits:
-            [self._loop.call_soon(event.set)
-             for event in self._waits[self._state].values()]
+        self._notify_waiters(value, exc is not None)
 
     async def _wait_on_state(self, *args) -> int:
         """Wait on a specific state value to transition"""
-        wait_id, waits = time.monotonic_ns(), []
+        wait_id = time.monotonic_ns()
         self._logger.debug(
             'Waiter %i waiting on (%s) while in 0x%x: %s',
             wait_id, ' || '.join(
                 '{}: {}'.format(s, self.state_description(s))
                 for s in args), self._state, self.state)
-        for state in args:
-            if state not in self._waits:
-                self._waits[state] = {}
-            self._waits[state][wait_id] = asyncio.Event()
-            waits.append((state, self._waits[state][wait_id]))
-        while True:
-            for state, event in waits:
-                if event.is_set():
+        try:
+            while True:
+                if self._exception:
+                    exc = self._exception
+                    self._exception = None
+                    raise exc
+                future = self._loop.create_future()
+                for state in args:
+                    self._waits.setdefault(state, {})[wait_id] = future
+                result = await future
+                if result in args and not self._exception:
                     self._logger.debug(
-                        'Waiter %r wait on 0x%x: %s has finished [%r]',
-                        wait_id, state, self.state_description(state),
-                        self._exception)
-                    self._clear_waits(wait_id)
-                    if self._exception:
-                        exc = self._exception
-                        self._exception = None
-                        raise exc
-                    return state
-            if self._exception:
-                self._clear_waits(wait_id)
-                exc = self._exception
-                self._exception = None
-                raise exc
-            await asyncio.sleep(0.001)
+                        'Waiter %r wait on 0x%x: %s has finished',
+                        wait_id, result, self.state_description(result))
+                    return result
+        finally:
+            self._clear_waits(wait_id)
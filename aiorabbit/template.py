@@ -0,0 +1,190 @@
+# coding: utf-8
+import asyncio
+import datetime
+import functools
+import struct
+import typing
+
+from pamqp import commands, constants, encode, frame
+
+from aiorabbit import tracing, types
+
+_CONTENT_HEADER = struct.Struct('>HxxQH')
+_FRAME_HEADER = struct.Struct('>BHI')
+
+# The properties that are set per message, in the order they are marshalled
+_VARIABLE_PROPERTIES = tuple(
+    (name, commands.Basic.Properties.flags[name], encoder) for name, encoder in
+    (('headers', encode.field_table),
+     ('message_id', encode.short_string),
+     ('timestamp', encode.timestamp)))
+
+
+class PublishTemplate:
+    """A precompiled message publisher for messages that share their
+    exchange, routing key, and most of their properties, created with
+    :meth:`Client.publish_template
+    <aiorabbit.client.Client.publish_template>`.
+
+    The ``Basic.Publish`` method frame is marshalled once for the channel
+    and the constant properties are validated and marshalled once when the
+    template is created. Publishing a message only validates and encodes the
+    body and the per-message ``headers``, ``message_id``, and ``timestamp``
+    properties, splicing them in between the constant property bytes.
+
+    :param client: **For internal use only**
+    :param method: **For internal use only**
+    :param properties: **For internal use only**
+
+    .. code-block:: python3
+       :caption: Example Usage
+
+        template = client.publish_template(
+            'events', 'user.created', app_id='users',
+            content_type='application/json', delivery_mode=2)
+        for event in events:
+            await template.publish(
+                json.dumps(event), message_id=event['id'],
+                timestamp=datetime.datetime.now(datetime.timezone.utc))
+
+    """
+    def __init__(self,
+                 client,
+                 method: commands.Basic.Publish,
+                 properties: commands.Basic.Properties):
+        self._client = client
+        self._flags = 0
+        self._method = method
+        self._method_frames: typing.Dict[int, bytes] = {}
+        self._segments: typing.List[bytes] = []
+        variable = {value[0] for value in _VARIABLE_PROPERTIES}
+        segment = []
+        for name in properties.__slots__:
+            if name in variable:
+                self._segments.append(b''.join(segment))
+                segment = []
+                continue
+            value = getattr(properties, name)
+            if value is not None and value != '':
+                self._flags |= properties.flags[name]
+                segment.append(properties.encode_property(name, value))
+        self._segments.append(b''.join(segment))
+
+    async def publish(self,
+                      message_body: typing.Union[bytes, str] = b'',
+                      message_id: typing.Optional[str] = None,
+                      timestamp: typing.Optional[datetime.datetime] = None,
+                      headers: typing.Optional[types.FieldTable] = None) \
+            -> typing.Optional[bool]:
+        """Publish a message using the template
+
+        If publisher confirms are enabled, will return `True` or `False`
+        indicating success or failure.
+
+        :param message_body: The message body to publish. Default: ``
+        :param message_id: Application message identifier
+        :param datetime.datetime timestamp: Message timestamp
+        :param headers: Message header field table
+        :type headers: typing.Optional[:data:`~aiorabbit.types.FieldTable`]
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if the value of one an argument does not validate
+
+        """
+        future = await self._publish(
+            message_body, message_id, timestamp, headers)
+        if future is not None:
+            return await self._client._wait_on_confirmation(future)
+
+    async def publish_pipelined(
+            self,
+            message_body: typing.Union[bytes, str] = b'',
+            message_id: typing.Optional[str] = None,
+            timestamp: typing.Optional[datetime.datetime] = None,
+            headers: typing.Optional[types.FieldTable] = None) \
+            -> asyncio.Future:
+        """Publish a message using the template without waiting for the
+        publisher confirmation, returning a :class:`~asyncio.Future` that
+        resolves to `True` or `False` once RabbitMQ confirms the message.
+
+        .. seealso:: :meth:`Client.publish_pipelined
+            <aiorabbit.client.Client.publish_pipelined>`
+
+        :raises RuntimeError: if publisher confirms are not enabled
+        :raises TypeError: if an argument is of the wrong data type
+        :raises ValueError: if the value of one an argument does not validate
+
+        """
+        if not self._client._publisher_confirms:
+            raise RuntimeError('Publisher confirms are not enabled')
+        return await self._publish(
+            message_body, message_id, timestamp, headers)
+
+    def _marshal(self,
+                 message_body: bytes,
+                 message_id: typing.Optional[str],
+                 timestamp: typing.Optional[datetime.datetime],
+                 headers: typing.Optional[types.FieldTable],
+                 channel: int) -> typing.List[bytes]:
+        """Return the marshalled frames for the message on the channel"""
+        method = self._method_frames.get(channel)
+        if method is None:
+            method = frame.marshal(self._method, channel)
+            self._method_frames[channel] = method
+        flags, parts = self._flags, [self._segments[0]]
+        for (_name, flag, encoder), value, segment in zip(
+                _VARIABLE_PROPERTIES, (headers, message_id, timestamp),
+                self._segments[1:]):
+            if value is not None and value != '':
+                flags |= flag
+                parts.append(encoder(value))
+            parts.append(segment)
+        properties = b''.join(parts)
+        body_size = len(message_body)
+        data = [
+            method,
+            _FRAME_HEADER.pack(constants.FRAME_HEADER, channel,
+                               _CONTENT_HEADER.size + len(properties)),
+            _CONTENT_HEADER.pack(
+                commands.Basic.frame_id, body_size, flags),
+            properties,
+            constants.FRAME_END_CHAR]
+        max_frame_size = int(self._client._max_frame_size)
+        body_view = memoryview(message_body)
+        for offset in range(0, body_size, max_frame_size):
+            chunk = body_view[offset:offset + max_frame_size]
+            data += [_FRAME_HEADER.pack(
+                constants.FRAME_BODY, channel, len(chunk)),
+                chunk, constants.FRAME_END_CHAR]
+        if self._client._metrics is not None:
+            self._client._metrics.frames_sent += 2 + (len(data) - 5) // 3
+        if self._client._frame_sent_callbacks:
+            tracing.invoke(self._client._frame_sent_callbacks, [
+                (channel, self._method.name, len(method)),
+                (channel, 'ContentHeader',
+                 sum(len(value) for value in data[1:5]))] + [
+                (channel, 'ContentBody',
+                 sum(len(value) for value in data[offset:offset + 3]))
+                for offset in range(5, len(data), 3)])
+        return data
+
+    async def _publish(self,
+                       message_body: typing.Union[bytes, str],
+                       message_id: typing.Optional[str],
+                       timestamp: typing.Optional[datetime.datetime],
+                       headers: typing.Optional[types.FieldTable]) \
+            -> typing.Optional[asyncio.Future]:
+        if not isinstance(message_body, (bytes, str)):
+            raise TypeError('message_body must be of types bytes or str')
+        if message_id is not None:
+            self._client._validate_short_str('message_id', message_id)
+        if timestamp and not isinstance(timestamp, datetime.datetime):
+            raise TypeError('timestamp must be of type datetime.datetime')
+        if headers is not None:
+            self._client._validate_field_table('headers', headers)
+        if isinstance(message_body, str):
+            message_body = message_body.encode('utf-8')
+        await self._client._wait_on_confirm_window()
+        futures = await self._client._write_messages(
+            1, functools.partial(
+                self._marshal, message_body, message_id, timestamp, headers))
+        return futures[0]
@@ -0,0 +1,35 @@
+# coding: utf-8
+import logging
+import time
+import typing
+
+LOGGER = logging.getLogger(__name__)
+
+FrameCallback = typing.Callable[[int, str, int, float], typing.Any]
+"""A callback registered with :meth:`Client.register_frame_sent_callback
+<aiorabbit.client.Client.register_frame_sent_callback>` or
+:meth:`Client.register_frame_received_callback
+<aiorabbit.client.Client.register_frame_received_callback>`, invoked with
+the channel, the frame type name such as ``Basic.Publish``,
+``ContentHeader``, ``ContentBody``, or ``Heartbeat``, the size of the
+marshalled frame in bytes, and the :func:`time.monotonic` timestamp of when
+the frame was sent or received.
+
+"""
+
+
+def invoke(callbacks: typing.List[FrameCallback],
+           frames: typing.Iterable[typing.Tuple[int, str, int]]) -> None:
+    """Invoke the callbacks for each of the ``(channel, frame type, size)``
+    tuples, with the same timestamp for all of them. Exceptions raised by a
+    callback are logged so they do not interrupt reading or writing.
+
+    """
+    timestamp = time.monotonic()
+    for channel, frame_type, size in frames:
+        for callback in callbacks:
+            try:
+                callback(channel, frame_type, size, timestamp)
+            except Exception as error:
+                LOGGER.exception('Error invoking frame callback %r: %r',
+                                 callback, error)
@@ -0,0 +1,217 @@
+# coding: utf-8
+import asyncio
+import concurrent.futures
+import logging
+import typing
+
+from aiorabbit import message
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """Invokes the callback of a consumer started with
+    :meth:`Client.basic_consume <aiorabbit.client.Client.basic_consume>`
+    using ``concurrency`` for each message, with at most ``concurrency``
+    invocations running at the same time.
+
+    Messages received while all of the workers are busy are queued until a
+    worker is available. Reading from the connection is never paused, so
+    callbacks can still wait on RPC responses and publisher confirmations,
+    and the number of queued messages is instead limited by the QoS prefetch
+    count the application sets with :meth:`Client.qos_prefetch
+    <aiorabbit.client.Client.qos_prefetch>`. Exceptions raised by the
+    callback are passed to ``on_error`` along with the message, or are
+    logged if ``on_error`` is not set.
+
+    :param client: **For internal use only**
+    :param callback: **For internal use only**
+    :param concurrency: **For internal use only**
+    :param on_error: **For internal use only**
+
+    """
+    def __init__(self,
+                 client,
+                 callback: typing.Callable,
+                 concurrency: int,
+                 on_error: typing.Optional[typing.Callable] = None):
+        self._callback = callback
+        self._client = client
+        self._closing = False
+        self._concurrency = concurrency
+        self._on_error = on_error
+        self._pending = 0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: typing.Dict[asyncio.Task, asyncio.Queue] = {}
+
+    def __call__(self, value: message.Message) -> None:
+        """Queue a message for a worker"""
+        self._pending += 1
+        self._dispatch(value)
+
+    @property
+    def busy(self) -> int:
+        """Returns the number of messages being processed or waiting"""
+        return self._pending
+
+    def cancel(self) -> None:
+        """Cancel the workers, discarding any queued messages"""
+        self._closing = True
+        for worker in self._workers:
+            worker.cancel()
+
+    def close(self) -> None:
+        """Stop the workers once the queued messages are processed"""
+        self._closing = True
+        for queue in self._workers.values():
+            queue.put_nowait(None)
+
+    def _dispatch(self, value: message.Message) -> None:
+        """Queue the message, starting another worker if all are busy"""
+        self._queue.put_nowait(value)
+        if len(self._workers) < min(self._pending, self._concurrency):
+            self._start_worker(self._queue)
+
+    def _done(self) -> None:
+        self._pending -= 1
+
+    def _error(self, value: message.Message, error: Exception) -> None:
+        if self._on_error is None:
+            LOGGER.error('Error processing message %r from %r: %r',
+                         value.delivery_tag, value.consumer_tag, error,
+                         exc_info=error)
+        else:
+            self._client._execute_callback(self._on_error, value, error)
+
+    async def _invoke(self, value: message.Message) -> None:
+        try:
+            result = self._callback(value)
+            if asyncio.iscoroutine(result):
+                await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self._error(value, error)
+
+    def _start_worker(self, queue: asyncio.Queue) -> None:
+        worker = self._client._loop.create_task(self._work(queue))
+        worker.add_done_callback(lambda task: self._workers.pop(task, None))
+        self._workers[worker] = queue
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            if self._closing and queue.empty():
+                break
+            value = await queue.get()
+            if value is None:  # Closed
+                break
+            try:
+                await self._invoke(value)
+            finally:
+                self._done()
+
+
+class PartitionedWorkerPool(WorkerPool):
+    """A :class:`WorkerPool` that invokes the callback of a consumer started
+    with ``partition_key`` in order for the messages with the same key.
+
+    Each message is queued in one of ``concurrency`` lanes chosen by the
+    hash of the value returned by invoking ``key`` with the message, and
+    each lane has a single worker. Messages with the same key are processed
+    one at a time in the order they were received, while messages in
+    different lanes are processed concurrently. If ``key`` raises an
+    exception, the message is handled as if the callback raised it.
+
+    Like :class:`WorkerPool`, reading from the connection is never paused
+    while lanes are busy. The QoS prefetch count limits the number of
+    messages queued across all of the lanes, so messages for a busy key can
+    hold all of the prefetched deliveries while the other lanes are idle.
+
+    :param client: **For internal use only**
+    :param callback: **For internal use only**
+    :param concurrency: **For internal use only**
+    :param key: **For internal use only**
+    :param on_error: **For internal use only**
+
+    """
+    def __init__(self,
+                 client,
+                 callback: typing.Callable,
+                 concurrency: int,
+                 key: typing.Callable[[message.Message], typing.Hashable],
+                 on_error: typing.Optional[typing.Callable] = None):
+        super().__init__(client, callback, concurrency, on_error)
+        self._key = key
+        self._lanes = [asyncio.Queue() for _offset in range(concurrency)]
+        self._started: typing.Set[int] = set()
+
+    def _dispatch(self, value: message.Message) -> None:
+        """Queue the message in the lane for its key, starting the worker
+        for the lane if it is not running
+
+        """
+        try:
+            lane = hash(self._key(value)) % self._concurrency
+        except Exception as error:
+            self._error(value, error)
+            self._done()
+            return
+        self._lanes[lane].put_nowait(value)
+        if lane not in self._started:
+            self._started.add(lane)
+            self._start_worker(self._lanes[lane])
+
+
+class ExecutorWorkerPool(WorkerPool):
+    """A :class:`WorkerPool` for a consumer started with
+    :meth:`Client.consume_in_executor
+    <aiorabbit.client.Client.consume_in_executor>`, invoking the handler in
+    a :class:`concurrent.futures.Executor` with the message body and the
+    selected properties, and settling the message on the IOLoop with the
+    result.
+
+    :param client: **For internal use only**
+    :param handler: **For internal use only**
+    :param concurrency: **For internal use only**
+    :param executor: **For internal use only**
+    :param properties: **For internal use only**
+    :param on_result: **For internal use only**
+    :param on_error: **For internal use only**
+
+    """
+    def __init__(self,
+                 client,
+                 handler: typing.Callable,
+                 concurrency: int,
+                 executor: concurrent.futures.Executor,
+                 properties: typing.Sequence[str],
+                 on_result: typing.Optional[typing.Callable] = None,
+                 on_error: typing.Optional[typing.Callable] = None):
+        super().__init__(client, handler, concurrency, on_error)
+        self._executor = executor
+        self._on_result = on_result
+        self._properties = tuple(properties)
+
+    async def _invoke(self, value: message.Message) -> None:
+        try:
+            result = await self._client._loop.run_in_executor(
+                self._executor, self._callback, value.body,
+                {name: getattr(value, name) for name in self._properties})
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self._error(value, error)
+            if self._on_error is None:
+                await self._client.basic_reject(value.delivery_tag, False)
+            return
+        try:
+            if self._on_result is None:
+                await self._client.basic_ack(value.delivery_tag)
+                return
+            result = self._on_result(value, result)
+            if asyncio.iscoroutine(result):
+                await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self._error(value, error)
@@ -0,0 +1,112 @@
+"""Measure the throughput of consuming messages with Client.consume and
+Client.basic_consume.
+
+For each mode, ``--count`` messages are published to a temporary queue with
+publisher confirms, and then consumed and acknowledged one at a time with a
+QoS prefetch count of ``--prefetch``. The interval between the deliveries is
+summarized in percentiles.
+
+    python -m benchmarks.consume --count 10000 --body-size 1024
+
+"""
+import argparse
+import asyncio
+import time
+import typing
+import uuid
+
+import aiorabbit
+from aiorabbit import client, message
+import benchmarks
+
+BATCH_SIZE = 1000
+
+
+async def prepare(rabbitmq: client.Client, queue: str, count: int,
+                  body_size: int) -> None:
+    """Declare the queue and publish the messages to consume"""
+    await rabbitmq.queue_declare(queue, auto_delete=True)
+    await rabbitmq.confirm_select()
+    message_body = b'.' * body_size
+    for offset in range(0, count, BATCH_SIZE):
+        await rabbitmq.publish_many(
+            {'exchange': '', 'routing_key': queue,
+             'message_body': message_body}
+            for _offset in range(min(BATCH_SIZE, count - offset)))
+
+
+async def consume(rabbitmq: client.Client, queue: str, count: int) \
+        -> typing.List[float]:
+    """Consume the messages with the async generator, returning the time
+    each message was received
+
+    """
+    received = []
+    async for msg in rabbitmq.consume(queue):
+        received.append(time.perf_counter())
+        await rabbitmq.basic_ack(msg.delivery_tag)
+        if len(received) == count:
+            break
+    return received
+
+
+async def basic_consume(rabbitmq: client.Client, queue: str, count: int) \
+        -> typing.List[float]:
+    """Consume the messages with a callback, returning the time each message
+    was received
+
+    """
+    done = asyncio.Event()
+    received = []
+
+    async def on_message(msg: message.Message) -> None:
+        received.append(time.perf_counter())
+        await rabbitmq.basic_ack(msg.delivery_tag)
+        if len(received) == count:
+            done.set()
+
+    consumer_tag = await rabbitmq.basic_consume(queue, callback=on_message)
+    await done.wait()
+    await rabbitmq.basic_cancel(consumer_tag)
+    return received
+
+
+async def measure(url: str, count: int, body_size: int, prefetch: int) \
+        -> typing.List[typing.Dict[str, typing.Any]]:
+    results = []
+    for mode in (consume, basic_consume):
+        queue = 'benchmark-{}'.format(uuid.uuid4())
+        async with aiorabbit.connect(url) as publisher:
+            await prepare(publisher, queue, count, body_size)
+            async with aiorabbit.connect(url) as rabbitmq:
+                await rabbitmq.qos_prefetch(prefetch)
+                start = time.perf_counter()
+                received = await mode(rabbitmq, queue, count)
+                duration = received[-1] - start
+            await publisher.queue_delete(queue)
+        results.append({
+            'name': 'consume',
+            'mode': mode.__name__,
+            'body_size': body_size,
+            'count': count,
+            'prefetch': prefetch,
+            **benchmarks.throughput(count, body_size, duration),
+            'interval': benchmarks.summarize(
+                [second - first
+                 for first, second in zip(received, received[1:])])})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    benchmarks.add_url_argument(parser)
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--body-size', type=int, default=1024)
+    parser.add_argument('--prefetch', type=int, default=100)
+    args = parser.parse_args()
+    benchmarks.emit(asyncio.run(measure(
+        args.url, args.count, args.body_size, args.prefetch)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Measure the time it takes to assemble received messages from their
+frames, with the properties decoded eagerly and lazily, across a range of
+message body sizes.
+
+Messages are assembled in batches of ``--batch`` messages and the time per
+message of each batch is summarized in percentiles. Each message gets its own
+copy of the body frame payloads, as it does when the frames are read from the
+socket, so the time includes allocating the body.
+
+    python -m benchmarks.message_assembly --count 100000 --batch 100
+
+"""
+import argparse
+import time
+import typing
+
+import benchmarks
+from benchmarks import message_memory
+
+DEFAULT_SIZES = (0, 1024, 65536, 1048576)
+MAX_BYTES_PER_SIZE = 256 * 1048576
+
+
+def measure(count: int, batch: int,
+            sizes: typing.Sequence[int] = DEFAULT_SIZES) \
+        -> typing.List[typing.Dict[str, typing.Any]]:
+    results = []
+    for body_size in sizes:
+        properties = message_memory.content_header(body_size)
+        message_body = b'.' * body_size
+        total = max(batch, min(
+            count, MAX_BYTES_PER_SIZE // max(body_size, 1)))
+        for lazy in (False, True):
+            samples = []
+            for offset in range(0, total, batch):
+                start = time.perf_counter()
+                for delivery_tag in range(offset, offset + batch):
+                    message_memory.deliver(
+                        delivery_tag, properties, message_body, lazy)
+                samples.append((time.perf_counter() - start) / batch)
+            results.append({'name': 'message_assembly',
+                            'lazy_properties': lazy,
+                            'body_size': body_size,
+                            'count': len(samples) * batch,
+                            'latency': benchmarks.summarize(samples)})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=100)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=DEFAULT_SIZES)
+    args = parser.parse_args()
+    benchmarks.emit(measure(args.count, args.batch, args.sizes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Measure the memory used by each received message while it is held by the
+application, such as when a consumer has a large prefetch window.
+
+Messages are assembled the way the client assembles them, from a
+``Basic.Deliver`` method frame, a content header frame, and body frames, and
+the memory allocated for them is measured with :mod:`tracemalloc`.
+
+    python -m benchmarks.message_memory --count 10000 --body-size 512
+
+"""
+import argparse
+import tracemalloc
+import typing
+
+from pamqp import body, commands, frame, header
+
+from aiorabbit import message
+import benchmarks
+
+
+def deliver(delivery_tag: int, properties: bytes, message_body: bytes,
+            lazy: bool = False) -> message.Message:
+    """Assemble a message from its frames, as the client does. Each body
+    frame payload is copied from ``message_body``, the way a new payload is
+    unmarshalled from each frame read from the socket, since slicing the
+    whole of a :class:`bytes` value returns the same object.
+
+    """
+    msg = message.Message(commands.Basic.Deliver(
+        'ctag0', delivery_tag, False, 'exchange', 'routing-key'))
+    msg.header = message.unmarshal_content_header(properties)
+    if not lazy:
+        msg.header.properties = msg.header.properties.decoded()
+    view = memoryview(message_body)
+    for offset in range(0, len(message_body), 131072):
+        msg.add_body_frame(
+            body.ContentBody(bytes(view[offset:offset + 131072])))
+    return msg
+
+
+def content_header(body_size: int) -> bytes:
+    """Return the marshalled content header frame payload for a message"""
+    return frame.marshal(header.ContentHeader(
+        0, body_size, commands.Basic.Properties(
+            content_type='application/json', delivery_mode=2,
+            headers={'version': 2}, message_id='1')), 1)[7:-1]
+
+
+def measure(count: int, body_size: int) -> typing.Dict[str, typing.Any]:
+    properties = content_header(body_size)
+    message_body = b'.' * body_size
+    tracemalloc.start()
+    before, _peak = tracemalloc.get_traced_memory()
+    messages = [deliver(delivery_tag, properties, message_body)
+                for delivery_tag in range(1, count + 1)]
+    after, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(messages) == count
+    return {
+        'name': 'message_memory',
+        'count': count,
+        'body_size': body_size,
+        'bytes_per_message': (after - before) / count,
+        'overhead_per_message': (after - before) / count - body_size}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--body-size', type=int, default=512)
+    args = parser.parse_args()
+    benchmarks.emit(measure(args.count, args.body_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Measure the throughput and latency of Client.publish, with and without
+publisher confirms, across a range of message body sizes.
+
+Each size publishes up to ``--count`` messages to a temporary queue, fewer
+for large bodies so each size publishes about the same number of bytes, and
+the latency of each ``publish`` call is summarized in percentiles.
+
+    python -m benchmarks.publish --count 10000 --sizes 0 1024 10485760
+
+"""
+import argparse
+import asyncio
+import time
+import typing
+import uuid
+
+import aiorabbit
+from aiorabbit import client
+import benchmarks
+
+DEFAULT_SIZES = (0, 1024, 65536, 1048576, 10485760)
+MAX_BYTES_PER_SIZE = 100 * 1048576
+
+
+async def publish(rabbitmq: client.Client, queue: str, count: int,
+                  size: int, confirm: bool) -> typing.Dict[str, typing.Any]:
+    message_body = b'.' * size
+    latencies = []
+    start = time.perf_counter()
+    for _offset in range(count):
+        published = time.perf_counter()
+        await rabbitmq.publish('', queue, message_body)
+        latencies.append(time.perf_counter() - published)
+    duration = time.perf_counter() - start
+    await rabbitmq.queue_purge(queue)
+    return {'name': 'publish',
+            'confirm': confirm,
+            'body_size': size,
+            'count': count,
+            **benchmarks.throughput(count, size, duration),
+            'latency': benchmarks.summarize(latencies)}
+
+
+async def measure(url: str, count: int,
+                  sizes: typing.Sequence[int] = DEFAULT_SIZES) \
+        -> typing.List[typing.Dict[str, typing.Any]]:
+    results = []
+    queue = 'benchmark-{}'.format(uuid.uuid4())
+    for confirm in (False, True):
+        async with aiorabbit.connect(url) as rabbitmq:
+            await rabbitmq.queue_declare(queue, auto_delete=True)
+            if confirm:
+                await rabbitmq.confirm_select()
+            for size in sizes:
+                results.append(await publish(
+                    rabbitmq, queue, max(1, min(
+                        count, MAX_BYTES_PER_SIZE // max(size, 1))),
+                    size, confirm))
+            await rabbitmq.queue_delete(queue)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    benchmarks.add_url_argument(parser)
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=DEFAULT_SIZES)
+    args = parser.parse_args()
+    benchmarks.emit(asyncio.run(measure(args.url, args.count, args.sizes)))
+
+
+if __name__ == '__main__':
+    main()
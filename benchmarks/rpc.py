@@ -0,0 +1,58 @@
+"""Measure the round-trip latency of declaring and deleting queues and
+exchanges, the RPCs that applications most often make while running.
+
+Each RPC is invoked ``--count`` times and its latency is summarized in
+percentiles.
+
+    python -m benchmarks.rpc --count 1000
+
+"""
+import argparse
+import asyncio
+import time
+import typing
+import uuid
+
+import aiorabbit
+import benchmarks
+
+
+async def measure(url: str, count: int) \
+        -> typing.List[typing.Dict[str, typing.Any]]:
+    name = 'benchmark-{}'.format(uuid.uuid4())
+    rpcs = (
+        ('queue_declare', lambda rabbitmq: rabbitmq.queue_declare(name)),
+        ('queue_declare_passive',
+         lambda rabbitmq: rabbitmq.queue_declare(name, passive=True)),
+        ('exchange_declare',
+         lambda rabbitmq: rabbitmq.exchange_declare(name, 'topic')),
+        ('queue_bind',
+         lambda rabbitmq: rabbitmq.queue_bind(name, name, '#')),
+        ('queue_purge', lambda rabbitmq: rabbitmq.queue_purge(name)))
+    results = []
+    async with aiorabbit.connect(url) as rabbitmq:
+        for rpc, invoke in rpcs:
+            latencies = []
+            for _offset in range(count):
+                start = time.perf_counter()
+                await invoke(rabbitmq)
+                latencies.append(time.perf_counter() - start)
+            results.append({'name': 'rpc',
+                            'rpc': rpc,
+                            'count': count,
+                            'latency': benchmarks.summarize(latencies)})
+        await rabbitmq.queue_delete(name)
+        await rabbitmq.exchange_delete(name)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    benchmarks.add_url_argument(parser)
+    parser.add_argument('--count', type=int, default=1000)
+    args = parser.parse_args()
+    benchmarks.emit(asyncio.run(measure(args.url, args.count)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,9 @@
+import asyncio
 import uuid
 
 from pamqp import body, commands, header
 
-from aiorabbit import exceptions, message
+from aiorabbit import client, exceptions, message
 from . import testing
 
 
@@ -16,6 +17,181 @@ class BasicAckTestCase(testing.ClientTestCase):
         with self.assertRaises(TypeError):
             await self.client.basic_ack(1, 1)
 
+    @testing.async_test
+    async def test_settle_while_receiving_a_message(self):
+        await self.connect()
+        write_frames = self.client._write_frames
+        self.client._write_frames = lambda *frames: None
+        for state in (client.STATE_CONTENT_HEADER_RECEIVED,
+                      client.STATE_QUEUE_DECLARE_SENT):
+            self.client._state = state
+            await self.client.basic_ack(1)
+            await self.client.basic_nack(2)
+            await self.client.basic_reject(3)
+            self.assert_state(state)
+        self.client._state = client.STATE_MESSAGE_ASSEMBLED
+        await self.client.basic_ack(4)
+        self.assert_state(client.STATE_BASIC_ACK_SENT)
+        self.client._write_frames = write_frames
+
+
+class CoalesceAcksTestCase(testing.ClientTestCase):
+
+    async def connect(self) -> None:
+        await super().connect()
+        self.frames = []
+        write_frames = self.client._write_frames
+
+        def capture(*frames):
+            self.frames.append(frames)
+            write_frames(*frames)
+
+        self.client._write_frames = capture
+
+    def acks(self):
+        return [[(value.delivery_tag, value.multiple) for value in frames]
+                for frames in self.frames
+                if isinstance(frames[0], commands.Basic.Ack)]
+
+    @testing.async_test
+    async def test_contiguous_acks_are_coalesced(self):
+        await self.connect()
+        self.client.coalesce_acks(max_pending=3, flush_interval=10)
+        for delivery_tag in [2, 1]:
+            await self.client.basic_ack(delivery_tag)
+        self.assertListEqual(self.frames, [])
+        await self.client.basic_ack(3)
+        self.assertListEqual(self.acks(), [[(3, True)]])
+        self.assertIsNone(self.client._ack_timer)
+
+    @testing.async_test
+    async def test_non_contiguous_acks_are_sent_individually(self):
+        await self.connect()
+        self.client.coalesce_acks(max_pending=4, flush_interval=10)
+        for delivery_tag in [1, 2, 4, 6]:
+            await self.client.basic_ack(delivery_tag)
+        self.assertListEqual(
+            self.acks(), [[(2, True), (4, False), (6, False)]])
+        for delivery_tag in [3, 5, 7, 8]:
+            await self.client.basic_ack(delivery_tag)
+        self.assertListEqual(self.acks()[1], [(8, True)])
+        self.assertEqual(self.client._ack_floor, 8)
+        self.assertListEqual(self.client._ack_settled, [])
+
+    @testing.async_test
+    async def test_acks_held_back_by_an_unsettled_tag(self):
+        await self.connect()
+        self.client.coalesce_acks(max_pending=100, flush_interval=10)
+        for delivery_tag in range(2, 5002):
+            await self.client.basic_ack(delivery_tag)
+        self.assertEqual(len(self.frames), 50)
+        self.assertEqual(self.client._ack_floor, 0)
+        self.assertEqual(len(self.client._ack_settled), 5000)
+        self.assertEqual(self.client._ack_settled[0], 2)
+        await self.client.basic_ack(1)
+        self.client._flush_acks()
+        self.assertListEqual(self.acks()[-1], [(5001, True)])
+        self.assertEqual(self.client._ack_floor, 5001)
+        self.assertListEqual(self.client._ack_settled, [])
+
+    @testing.async_test
+    async def test_no_ack_deliveries_do_not_hold_back_acks(self):
+        await self.connect()
+        no_ack_queue, queue = self.uuid4(), self.uuid4()
+        await self.client.queue_declare(no_ack_queue)
+        await self.client.queue_declare(queue)
+        self.client.coalesce_acks(max_pending=100, flush_interval=10)
+        received = []
+        no_ack_tag = await self.client.basic_consume(
+            no_ack_queue, no_ack=True, callback=received.append)
+        await self.client.basic_consume(queue, callback=received.append)
+        for offset in range(10):
+            await self.client.publish(
+                '', no_ack_queue if offset % 2 else queue, str(offset))
+        while len(received) < 10:
+            await asyncio.sleep(0.01)
+        await self.client.basic_cancel(no_ack_tag)
+        self.assertSetEqual(self.client._no_ack_consumers, set())
+        await self.client.publish('', no_ack_queue, b'get')
+        self.assertIsNotNone(await self.client.basic_get(no_ack_queue, True))
+        for value in received:
+            if value.consumer_tag != no_ack_tag:
+                await self.client.basic_ack(value.delivery_tag)
+        self.client._flush_acks()
+        self.assertListEqual(self.acks(), [[(11, True)]])
+        self.assertEqual(self.client._ack_floor, 11)
+        self.assertListEqual(self.client._ack_settled, [])
+
+    @testing.async_test
+    async def test_flush_interval(self):
+        await self.connect()
+        self.client.coalesce_acks(flush_interval=0.01)
+        await self.client.basic_ack(1)
+        await self.client.basic_ack(2)
+        self.assertListEqual(self.frames, [])
+        await asyncio.sleep(0.05)
+        self.assertListEqual(self.acks(), [[(2, True)]])
+
+    @testing.async_test
+    async def test_rejected_tags_are_contiguous(self):
+        await self.connect()
+        self.client.coalesce_acks(flush_interval=10)
+        await self.client.basic_ack(1)
+        self.client._state = client.STATE_MESSAGE_ASSEMBLED
+        await self.client.basic_reject(2)
+        await self.client.basic_ack(3)
+        self.client._state = client.STATE_MESSAGE_ASSEMBLED
+        await self.client.basic_nack(5, multiple=True)
+        await self.client.basic_ack(6)
+        await self.client.basic_ack(7)
+        await self.client.basic_ack(9)
+        self.client._state = client.STATE_MESSAGE_ASSEMBLED
+        await self.client.basic_ack(10, multiple=True)
+        self.assertListEqual(
+            [[(value.delivery_tag, getattr(value, 'multiple', False))
+              for value in frames] for frames in self.frames],
+            [[(1, True)], [(2, False)], [(3, True)], [(5, True)],
+             [(7, True), (9, False)], [(10, True)]])
+
+    @testing.async_test
+    async def test_flushed_before_rpc(self):
+        await self.connect()
+        self.client.coalesce_acks(flush_interval=10)
+        await self.client.basic_ack(1)
+        await self.client.queue_declare(self.uuid4())
+        self.assertListEqual(self.acks(), [[(1, True)]])
+
+    @testing.async_test
+    async def test_reset_when_channel_is_reopened(self):
+        await self.connect()
+        self.client.coalesce_acks(flush_interval=10)
+        await self.client.basic_ack(1)
+        with self.assertRaises(exceptions.NotFound):
+            await self.client.queue_declare(self.uuid4(), passive=True)
+        self.assertListEqual(self.acks(), [[(1, True)]])
+        self.assertEqual(self.client._ack_floor, 0)
+        await self.client.basic_ack(1)
+        self.assertSetEqual(self.client._ack_pending, {1})
+        self.client._frame_handlers[commands.Channel.Close](
+            commands.Channel.Close(404, 'NOT_FOUND', 50, 10))
+        self.assertSetEqual(self.client._ack_pending, set())
+        self.assertIsNone(self.client._ack_timer)
+        self.client._state = client.STATE_CHANNEL_OPENOK_RECEIVED
+
+    @testing.async_test
+    async def test_validation_errors(self):
+        await self.connect()
+        with self.assertRaises(TypeError):
+            self.client.coalesce_acks('1')
+        with self.assertRaises(TypeError):
+            self.client.coalesce_acks(True)
+        with self.assertRaises(TypeError):
+            self.client.coalesce_acks(10, '1')
+        with self.assertRaises(ValueError):
+            self.client.coalesce_acks(0)
+        with self.assertRaises(ValueError):
+            self.client.coalesce_acks(10, -1)
+
 
 class BasicCancelTestCase(testing.ClientTestCase):
 
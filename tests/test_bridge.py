@@ -0,0 +1,174 @@
+import asyncio
+import collections
+import concurrent.futures
+import logging
+import threading
+from unittest import mock
+
+from aiorabbit import bridge, exceptions
+from . import testing
+
+
+class ThreadSafePublisherTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.queue = self.uuid4()
+        self.executor = concurrent.futures.ThreadPoolExecutor(4)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+        super().tearDown()
+
+    async def setup_queue(self) -> None:
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+
+    async def wait_for_messages(self, count: int) -> None:
+        msgs, _consumers = await self.client.queue_declare(self.queue)
+        while msgs < count:
+            await asyncio.sleep(0.05)
+            msgs, _consumers = await self.client.queue_declare(self.queue)
+        self.assertEqual(msgs, count)
+
+    @staticmethod
+    async def wait_for_publisher(publisher: bridge.ThreadSafePublisher) \
+            -> None:
+        while publisher.pending or publisher._task is not None:
+            await asyncio.sleep(0.01)
+
+    def run_in_threads(self, target: callable, count: int) -> asyncio.Future:
+        return asyncio.gather(*[
+            self.loop.run_in_executor(self.executor, target, offset)
+            for offset in range(count)])
+
+    @testing.async_test
+    async def test_publish_from_threads(self):
+        await self.setup_queue()
+        publisher = self.client.threadsafe_publisher()
+        self.assertIsInstance(publisher, bridge.ThreadSafePublisher)
+
+        def publish(offset):
+            for value in range(25):
+                self.assertIsNone(publisher.publish(
+                    '', self.queue, '{}-{}'.format(offset, value)))
+            publisher.flush(5)
+            return publisher.pending
+
+        with mock.patch.object(self.loop, 'call_soon_threadsafe',
+                               wraps=self.loop.call_soon_threadsafe) as wake:
+            await self.run_in_threads(publish, 4)
+        self.assertEqual(publisher.pending, 0)
+        self.assertLess(wake.call_count, 200)
+        await self.wait_for_messages(100)
+
+    @testing.async_test
+    async def test_publish_while_task_is_exiting(self):
+        await self.setup_queue()
+        publisher = self.client.threadsafe_publisher()
+        queue = self.queue
+
+        class Queue(collections.deque):
+            """Queues a message from a thread just after the publishing
+            task finds the queue empty, before its done callback runs
+
+            """
+            empty_checks = 0
+            published = False
+
+            def __bool__(self):
+                if not len(self):
+                    self.empty_checks += 1
+                if self.empty_checks == 2 and not self.published:
+                    self.published = True  # The last check before exiting
+                    thread = threading.Thread(
+                        target=publisher.publish, args=('', queue, b'late'))
+                    thread.start()
+                    thread.join()
+                    return False
+                return bool(len(self))
+
+        publisher._queue = Queue()
+        await self.loop.run_in_executor(
+            self.executor, publisher.publish, '', self.queue, b'first')
+        await asyncio.wait_for(self.wait_for_publisher(publisher), 2)
+        self.assertTrue(publisher._queue.published)
+        await self.wait_for_messages(2)
+
+    @testing.async_test
+    async def test_publish_with_confirmations(self):
+        await self.setup_queue()
+        await self.client.confirm_select(max_in_flight=10)
+        publisher = self.client.threadsafe_publisher(futures=True)
+
+        def publish(offset):
+            futures = [publisher.publish('', self.queue, str(value))
+                       for value in range(25)]
+            return [future.result(5) for future in futures]
+
+        results = await self.run_in_threads(publish, 2)
+        self.assertListEqual(results, [[True] * 25, [True] * 25])
+        await self.wait_for_messages(50)
+
+    @testing.async_test
+    async def test_publish_without_confirmations_future(self):
+        await self.setup_queue()
+        publisher = self.client.threadsafe_publisher(futures=True)
+        future = await self.loop.run_in_executor(
+            self.executor, publisher.publish, '', self.queue, b'test')
+        self.assertIsNone(await asyncio.wrap_future(future))
+        await self.wait_for_messages(1)
+
+    @testing.async_test
+    async def test_confirmation_failures_are_logged(self):
+        nacked = self.loop.create_future()
+        nacked.set_result(False)
+        with self.assertLogs('aiorabbit.bridge', logging.WARNING):
+            bridge.ThreadSafePublisher._on_confirmation(None, nacked)
+        failed = self.loop.create_future()
+        failed.set_exception(exceptions.NotFound('Test'))
+        with self.assertLogs('aiorabbit.bridge', logging.ERROR):
+            bridge.ThreadSafePublisher._on_confirmation(None, failed)
+        future = concurrent.futures.Future()
+        bridge.ThreadSafePublisher._on_confirmation(future, failed)
+        with self.assertRaises(exceptions.NotFound):
+            future.result()
+
+    @testing.async_test
+    async def test_publish_error_sets_future_exception(self):
+        await self.setup_queue()
+        publisher = self.client.threadsafe_publisher(futures=True)
+        with mock.patch.object(self.client, '_write_messages') as write:
+            write.side_effect = exceptions.ConnectionClosedException('Test')
+            future = await self.loop.run_in_executor(
+                self.executor, publisher.publish, '', self.queue, b'test')
+            with self.assertRaises(exceptions.ConnectionClosedException):
+                await asyncio.wrap_future(future)
+
+    @testing.async_test
+    async def test_publish_validation_errors(self):
+        await self.connect()
+        publisher = self.client.threadsafe_publisher()
+        with self.assertRaises(TypeError):
+            publisher.publish('', self.queue, 1)
+        with self.assertRaises(ValueError):
+            publisher.publish('', self.queue, b'', delivery_mode=3)
+        self.assertEqual(publisher.pending, 0)
+        self.assertFalse(publisher._scheduled)
+
+    @testing.async_test
+    async def test_flush_in_loop_raises(self):
+        await self.connect()
+        publisher = self.client.threadsafe_publisher()
+        with self.assertRaises(RuntimeError):
+            publisher.flush()
+
+    @testing.async_test
+    async def test_validation_errors(self):
+        await self.connect()
+        with self.assertRaises(TypeError):
+            self.client.threadsafe_publisher(futures='true')
+        with self.assertRaises(TypeError):
+            self.client.threadsafe_publisher(max_batch='1')
+        with self.assertRaises(ValueError):
+            self.client.threadsafe_publisher(max_batch=0)
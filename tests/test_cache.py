@@ -0,0 +1,110 @@
+import datetime
+import decimal
+import unittest
+import uuid
+
+from pamqp import commands, frame, header
+
+from aiorabbit import cache, client
+from . import testing
+
+
+class PropertiesCacheTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache = cache.PropertiesCache(2)
+
+    @staticmethod
+    def content_header(**kwargs) -> header.ContentHeader:
+        return header.ContentHeader(
+            0, 1024, commands.Basic.Properties(**kwargs))
+
+    def test_marshal_matches_pamqp(self):
+        value = self.content_header(
+            app_id='test', content_type='application/json',
+            delivery_mode=2, message_id=str(uuid.uuid4()), priority=5,
+            timestamp=datetime.datetime(2020, 4, 1, 12, 30, 0),
+            headers={'foo': 'bar', 'baz': [1, 2.5, decimal.Decimal('1.1')],
+                     'nested': {'qux': True, 'data': bytearray(b'\x00')}})
+        for channel in [1, 2, 1]:
+            self.assertEqual(self.cache.marshal(value, channel),
+                             frame.marshal(value, channel))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_marshal_empty_properties(self):
+        value = self.content_header()
+        self.assertEqual(self.cache.marshal(value, 1),
+                         frame.marshal(value, 1))
+
+    def test_equal_values_of_different_types_are_not_shared(self):
+        for value in [1, True, 1.0]:
+            properties = commands.Basic.Properties(headers={'value': value})
+            self.assertEqual(self.cache.marshal_properties(properties),
+                             properties.marshal())
+        self.assertEqual(self.cache.misses, 3)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_least_recently_used_is_evicted(self):
+        first, second, third = (
+            commands.Basic.Properties(message_id=str(value))
+            for value in range(3))
+        self.cache.marshal_properties(first)
+        self.cache.marshal_properties(second)
+        self.cache.marshal_properties(first)
+        self.cache.marshal_properties(third)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.hits, 1)
+        self.cache.marshal_properties(first)
+        self.assertEqual(self.cache.hits, 2)
+        self.cache.marshal_properties(second)
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_clear(self):
+        self.cache.marshal_properties(commands.Basic.Properties())
+        self.cache.marshal_properties(commands.Basic.Properties())
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_validation_errors(self):
+        with self.assertRaises(TypeError):
+            cache.PropertiesCache('1')
+        with self.assertRaises(TypeError):
+            cache.PropertiesCache(True)
+        with self.assertRaises(ValueError):
+            cache.PropertiesCache(0)
+        self.assertEqual(cache.PropertiesCache(10).max_size, 10)
+
+
+class ClientPropertiesCacheTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = client.Client(
+            self.rabbitmq_url, loop=self.loop, properties_cache_size=10)
+
+    @testing.async_test
+    async def test_publish_uses_cache(self):
+        await self.connect()
+        queue = self.uuid4()
+        await self.client.queue_declare(queue)
+        for _offset in range(3):
+            await self.client.publish(
+                '', queue, b'test', content_type='text/plain',
+                headers={'foo': 'bar'})
+        self.assertEqual(self.client.properties_cache.misses, 1)
+        self.assertEqual(self.client.properties_cache.hits, 2)
+        msg = await self.client.basic_get(queue)
+        self.assertEqual(msg.body, b'test')
+        self.assertEqual(msg.content_type, 'text/plain')
+        self.assertDictEqual(msg.headers, {'foo': 'bar'})
+        await self.client.queue_delete(queue)
+
+    @testing.async_test
+    async def test_channel_shares_cache(self):
+        await self.connect()
+        channel = await self.client.channel()
+        self.assertIs(channel.properties_cache, self.client.properties_cache)
+        await channel.close()
@@ -0,0 +1,142 @@
+import asyncio
+import uuid
+
+from aiorabbit import channel, client, exceptions
+from . import testing
+
+
+class ChannelTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.queue = self.uuid4()
+        self.body = uuid.uuid4().bytes
+
+    @testing.async_test
+    async def test_channel_is_opened(self):
+        await self.connect()
+        value = await self.client.channel()
+        self.assertIsInstance(value, channel.Channel)
+        self.assertEqual(value._channel, self.client._channel + 1)
+        self.assertIs(self.client._channels[value._channel], value)
+        self.assertFalse(value.is_closed)
+        self.assertEqual(value.state, value.state_description(
+            client.STATE_CHANNEL_OPENOK_RECEIVED))
+        other = await value.channel()
+        self.assertEqual(other._channel, value._channel + 1)
+
+    @testing.async_test
+    async def test_channel_when_closed(self):
+        with self.assertRaises(exceptions.ConnectionClosedException):
+            await self.client.channel()
+
+    @testing.async_test
+    async def test_channel_connect_raises(self):
+        await self.connect()
+        value = await self.client.channel()
+        with self.assertRaises(RuntimeError):
+            await value.connect()
+
+    @testing.async_test
+    async def test_concurrent_rpcs(self):
+        await self.connect()
+        value = await self.client.channel()
+        queue = self.uuid4()
+        results = await asyncio.gather(
+            self.client.queue_declare(self.queue),
+            value.queue_declare(queue))
+        self.assertListEqual(results, [(0, 0), (0, 0)])
+        await asyncio.gather(
+            self.client.queue_delete(queue),
+            value.queue_delete(self.queue))
+
+    @testing.async_test
+    async def test_publish_and_get(self):
+        await self.connect()
+        value = await self.client.channel()
+        await value.confirm_select()
+        self.assertFalse(self.client._publisher_confirms)
+        await value.queue_declare(self.queue)
+        self.assertTrue(await value.publish('', self.queue, self.body))
+        msg = await self.client.basic_get(self.queue)
+        self.assertEqual(msg.body, self.body)
+        await self.client.basic_ack(msg.delivery_tag)
+        await value.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_consume(self):
+        await self.connect()
+        value = await self.client.channel()
+        await value.queue_declare(self.queue)
+        received = asyncio.Event()
+
+        async def on_message(msg):
+            self.assertEqual(msg.body, self.body)
+            await value.basic_ack(msg.delivery_tag)
+            received.set()
+
+        consumer_tag = await value.basic_consume(
+            self.queue, callback=on_message)
+        self.assertIn(consumer_tag, value._consumers)
+        self.assertDictEqual(self.client._consumers, {})
+        await self.client.publish('', self.queue, self.body)
+        await received.wait()
+        await value.basic_cancel(consumer_tag)
+        await value.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_channel_error_reopens_channel(self):
+        await self.connect()
+        value = await self.client.channel()
+        channel_id = value._channel
+        with self.assertRaises(exceptions.NotFound):
+            await value.queue_declare(self.queue, passive=True)
+        self.assertFalse(value.is_closed)
+        self.assertEqual(value._channel, channel_id)
+        self.assertEqual(
+            await value.queue_declare(self.queue), (0, 0))
+        self.assert_state(client.STATE_CHANNEL_OPENOK_RECEIVED)
+        await value.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_close(self):
+        await self.connect()
+        value = await self.client.channel()
+        await value.close()
+        self.assertTrue(value.is_closed)
+        self.assertNotIn(value._channel, self.client._channels)
+        with self.assertRaises(exceptions.ChannelClosedException):
+            await value.queue_declare(self.queue)
+        with self.assertRaises(exceptions.ChannelClosedException):
+            await value.publish('', self.queue, self.body)
+        await value.close()
+        self.assertFalse(self.client.is_closed)
+        self.assertEqual(
+            await self.client.queue_declare(self.queue), (0, 0))
+        await self.client.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_closed_with_connection(self):
+        await self.connect()
+        value = await self.client.channel()
+        future = self.loop.create_future()
+        value._delivery_tags[1] = future
+        await self.close()
+        self.assertTrue(value.is_closed)
+        self.assertDictEqual(self.client._channels, {})
+        with self.assertRaises(exceptions.ConnectionClosedException):
+            await future
+        with self.assertRaises(exceptions.ChannelClosedException):
+            await value.basic_ack(1)
+
+    @testing.async_test
+    async def test_next_channel_skips_channels_in_use(self):
+        await self.connect()
+        self.client._channels[self.client._channel + 1] = self.client
+        self.assertEqual(
+            self.client._next_channel(), self.client._channel + 2)
+        self.client._channels.clear()
+        channel_id = self.client._channel
+        self.client._channel = self.client._channel0.max_channels
+        self.assertEqual(self.client._next_channel(), 1)
+        self.client._channel = channel_id
@@ -7,7 +7,7 @@ import uuid
 
 from pamqp import commands, constants, frame, heartbeat
 
-from aiorabbit import channel0, exceptions, state, version
+from aiorabbit import channel0, exceptions, metrics, state, version
 from . import testing
 
 LOGGER = logging.getLogger(__name__)
@@ -158,6 +158,19 @@ class ConnectionBlockedTestCase(TestCase):
         self.assert_state(channel0.STATE_UNBLOCKED_RECEIVED)
         self.assertFalse(self.channel0.blocked.is_set())
 
+    def test_block_unblock_metrics(self):
+        self.channel0._metrics = metrics.Metrics()
+        self.loop.run_until_complete(self.open())
+        self.assertEqual(self.channel0._metrics.frames_sent, 4)
+        self.assertGreater(self.channel0._metrics.bytes_sent, 0)
+        self.channel0.process(commands.Connection.Blocked())
+        self.channel0._blocked_at -= 1.5
+        self.channel0.process(commands.Connection.Blocked())
+        self.channel0.process(commands.Connection.Unblocked())
+        self.assertEqual(self.channel0._metrics.blocked, 1)
+        self.assertGreaterEqual(self.channel0._metrics.blocked_seconds, 1.5)
+        self.assertIsNone(self.channel0._blocked_at)
+
 
 class HeartbeatTestCase(TestCase):
 
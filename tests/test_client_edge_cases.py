@@ -74,11 +74,41 @@ class BasicNackReceivedTestCase(testing.ClientTestCase):
     async def test_basic_nack_received(self):
         await self.connect()
         delivery_tag = 10
-        self.client._delivery_tags[delivery_tag] = asyncio.Event()
+        future = self.loop.create_future()
+        self.client._delivery_tags[delivery_tag] = future
         self.client._set_state(client.STATE_MESSAGE_PUBLISHED)
         self.client._on_frame(1, commands.Basic.Nack(delivery_tag))
-        await self.client._delivery_tags[delivery_tag].wait()
-        self.assertFalse(self.client._confirmation_result[delivery_tag])
+        self.assertFalse(await future)
+        self.assertDictEqual(self.client._delivery_tags, {})
+
+
+class BasicAckMultipleReceivedTestCase(testing.ClientTestCase):
+
+    @testing.async_test
+    async def test_basic_ack_multiple_received(self):
+        await self.connect()
+        futures = {tag: self.loop.create_future() for tag in range(1, 6)}
+        self.client._delivery_tags.update(futures)
+        self.client._on_frame(1, commands.Basic.Ack(2))
+        self.client._on_frame(1, commands.Basic.Ack(4, True))
+        self.assertListEqual(
+            [futures[tag].done() for tag in range(1, 6)],
+            [True, True, True, True, False])
+        self.assertListEqual(list(self.client._delivery_tags), [5])
+        self.assertEqual(self.client._confirmed_tag, 4)
+
+    @testing.async_test
+    async def test_basic_ack_multiple_skips_confirmed_tags(self):
+        await self.connect()
+        futures = {tag: self.loop.create_future() for tag in range(1, 4)}
+        self.client._delivery_tags.update(futures)
+        self.client._on_frame(1, commands.Basic.Ack(2, True))
+        self.client._delivery_tags[1] = self.loop.create_future()
+        self.client._on_frame(1, commands.Basic.Ack(3, True))
+        self.assertFalse(self.client._delivery_tags[1].done())
+        self.assertTrue(futures[3].done())
+        self.client._fail_confirmations(exceptions.ConnectionClosedException())
+        self.assertEqual(self.client._confirmed_tag, 0)
 
 
 class BasicRejectReceivedTestCase(testing.ClientTestCase):
@@ -87,11 +117,12 @@ class BasicRejectReceivedTestCase(testing.ClientTestCase):
     async def test_basic_nack_received(self):
         await self.connect()
         delivery_tag = 10
-        self.client._delivery_tags[delivery_tag] = asyncio.Event()
+        future = self.loop.create_future()
+        self.client._delivery_tags[delivery_tag] = future
         self.client._set_state(client.STATE_MESSAGE_PUBLISHED)
         self.client._on_frame(1, commands.Basic.Reject(delivery_tag))
-        await self.client._delivery_tags[delivery_tag].wait()
-        self.assertFalse(self.client._confirmation_result[delivery_tag])
+        self.assertFalse(await future)
+        self.assertDictEqual(self.client._delivery_tags, {})
 
 
 class UnsupportedFrameOnFrameTestCase(testing.ClientTestCase):
@@ -140,6 +171,37 @@ class InvalidUsernameTestCase(testing.ClientTestCase):
             await self.connect()
 
 
+class WriteBufferLimitsTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        self._old_uri = os.environ['RABBITMQ_URI']
+        os.environ['RABBITMQ_URI'] = '{}?high_water_mark={}'.format(
+            os.environ['RABBITMQ_URI'], 131072)
+        super().setUp()
+
+    def tearDown(self) -> None:
+        os.environ['RABBITMQ_URI'] = self._old_uri
+        super().tearDown()
+
+    @testing.async_test
+    async def test_write_buffer_limits(self):
+        await self.connect()
+        self.assertEqual(
+            self.client._transport.get_write_buffer_limits(),
+            (131072 // 4, 131072))
+
+    @testing.async_test
+    async def test_publish_waits_for_drain(self):
+        await self.connect()
+        self.client._protocol.pause_writing()
+        task = self.loop.create_task(
+            self.client.publish('amq.direct', 'foo', b'bar'))
+        await asyncio.sleep(0.01)
+        self.assertFalse(task.done())
+        self.client._protocol.resume_writing()
+        await task
+
+
 class InvalidProtocolTestCase(testing.ClientTestCase):
 
     def setUp(self) -> None:
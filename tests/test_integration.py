@@ -167,6 +167,69 @@ class ConsumeTestCase(testing.ClientTestCase):
         msgs, _consumers = await self.client.queue_declare(self.queue)
         self.assertEqual(msgs, 0)
 
+    @testing.async_test
+    async def test_consume_lazy_properties(self):
+        await self.connect()
+        eager_queue = self.uuid4()
+        await self.client.queue_declare(self.queue)
+        await self.client.queue_declare(eager_queue)
+        await self.client.publish(
+            '', self.queue, b'lazy', message_id='1', headers={'foo': 'bar'})
+        await self.client.publish('', eager_queue, b'eager', message_id='2')
+        consumer = self.client.consume(self.queue, lazy_properties=True)
+        message = await consumer.__anext__()
+        await consumer.aclose()
+        self.assertSetEqual(self.client._lazy_consumers, set())
+        self.assertEqual(message.body, b'lazy')
+        with self.assertRaises(AttributeError):
+            commands.Basic.Properties.headers.__get__(
+                message.header.properties)
+        self.assertEqual(message.message_id, '1')
+        self.assertDictEqual(message.headers, {'foo': 'bar'})
+        async for message in self.client.consume(eager_queue):
+            await self.client.basic_ack(message.delivery_tag)
+            break
+        self.assertEqual(message.body, b'eager')
+        self.assertIsNone(commands.Basic.Properties.headers.__get__(
+            message.header.properties))
+        self.assertEqual(message.message_id, '2')
+        await self.client.queue_delete(eager_queue)
+
+    @testing.async_test
+    async def test_republish_multiple_frame_body(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        value = os.urandom(self.client._channel0.max_frame_size * 2)
+        await self.client.publish('', self.queue, value)
+        consumer = self.client.consume(self.queue)
+        message = await consumer.__anext__()
+        await self.client.basic_ack(message.delivery_tag)
+        await consumer.aclose()
+        self.assertIsInstance(message.body, bytes)
+        self.assertEqual(message.body, value)
+        await self.client.publish('', self.queue, message.body)
+        msgs, _consumers = await self.client.queue_declare(self.queue)
+        self.assertEqual(msgs, 1)
+
+    @testing.async_test
+    async def test_idle_consumer_woken_on_close(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        received = []
+
+        async def consume_messages():
+            async for message in self.client.consume(self.queue):
+                received.append(message)
+
+        task = self.loop.create_task(consume_messages())
+        while not self.client._consume_queues:
+            await asyncio.sleep(0.01)
+        self.assertFalse(task.done())
+        await self.client.close()
+        await asyncio.wait_for(task, timeout=1)
+        self.assertListEqual(received, [])
+        self.assertSetEqual(self.client._consume_queues, set())
+
 
 class ContextManagerConsumeTestCase(ConsumeTestCase):
 
@@ -4,7 +4,7 @@ import time
 import unittest
 import uuid
 
-from pamqp import body, commands, constants, header
+from pamqp import body, commands, constants, exceptions, header
 
 from aiorabbit import message
 
@@ -51,7 +51,7 @@ class TestCase(unittest.TestCase):
 
         value = bytes(self.body)
         while value:
-            self.message.body_frames.append(
+            self.message.add_body_frame(
                 body.ContentBody(value[:constants.FRAME_MAX_SIZE]))
             value = value[constants.FRAME_MAX_SIZE:]
 
@@ -139,3 +139,125 @@ class BasicReturnTestCase(TestCase):
         self.assertIsNone(self.message.message_count)
         self.assertIsNone(self.message.redelivered)
         self.compare_message()
+
+
+class BodyAssemblyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.message = message.Message(
+            commands.Basic.Deliver('ctag', 1, False, 'exchange', 'rk'))
+        self.body = uuid.uuid4().bytes * 100
+        self.message.header = header.ContentHeader(
+            0, len(self.body), commands.Basic.Properties())
+
+    def test_single_frame_body_is_not_copied(self):
+        self.message.add_body_frame(body.ContentBody(self.body))
+        self.assertTrue(self.message.is_complete)
+        self.assertIs(self.message.body, self.body)
+
+    def test_multiple_frame_body(self):
+        for offset in range(0, len(self.body), 64):
+            self.assertFalse(self.message.is_complete)
+            self.assertEqual(self.message.body, self.body[:offset])
+            self.message.add_body_frame(
+                body.ContentBody(self.body[offset:offset + 64]))
+            self.assertEqual(self.message.body_size,
+                             min(offset + 64, len(self.body)))
+        self.assertTrue(self.message.is_complete)
+        self.assertIsInstance(self.message.body, bytes)
+        self.assertIs(self.message.body, self.message.body)
+        self.assertIsNone(self.message._buffer)
+        self.assertIs(bytes(self.message), self.message.body)
+        self.assertEqual(self.message.body, self.body)
+        self.assertEqual(len(self.message), len(self.body))
+
+    def test_message_is_slotted(self):
+        self.assertFalse(hasattr(self.message, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.message.foo = 'bar'
+
+    def test_empty_body(self):
+        self.message.header = header.ContentHeader(
+            0, 0, commands.Basic.Properties())
+        self.assertTrue(self.message.is_complete)
+        self.assertEqual(self.message.body, b'')
+
+
+class LazyPropertiesTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.properties = commands.Basic.Properties(
+            app_id='test', content_type='application/json',
+            correlation_id=str(uuid.uuid4()), delivery_mode=2,
+            headers={'foo': 'bar', 'nested': {'baz': [1, 2, 3]}},
+            message_id=str(uuid.uuid4()), priority=5,
+            timestamp=datetime.datetime(
+                2020, 4, 1, 12, 30, 0, tzinfo=datetime.timezone.utc))
+        self.value = header.ContentHeader(0, 1024, self.properties)
+
+    def unmarshal(self) -> header.ContentHeader:
+        return message.unmarshal_content_header(self.value.marshal())
+
+    @staticmethod
+    def is_decoded(properties: commands.Basic.Properties, name: str) -> bool:
+        try:
+            getattr(commands.Basic.Properties, name).__get__(properties)
+        except AttributeError:
+            return False
+        return True
+
+    def test_content_header(self):
+        value = self.unmarshal()
+        self.assertIsInstance(value.properties, message.LazyProperties)
+        self.assertEqual(value.class_id, commands.Basic.frame_id)
+        self.assertEqual(value.body_size, 1024)
+        self.assertEqual(value.properties, self.properties)
+        self.assertEqual(value.marshal(), self.value.marshal())
+
+    def test_properties_are_decoded_on_access(self):
+        properties = self.unmarshal().properties
+        self.assertEqual(properties.message_id, self.properties.message_id)
+        self.assertTrue(self.is_decoded(properties, 'message_id'))
+        for name in ['headers', 'timestamp', 'app_id', 'user_id']:
+            self.assertFalse(self.is_decoded(properties, name))
+        self.assertEqual(properties.timestamp, self.properties.timestamp)
+        self.assertFalse(self.is_decoded(properties, 'headers'))
+        self.assertIsNone(properties.user_id)
+        self.assertEqual(properties.cluster_id, '')
+
+    def test_decode(self):
+        properties = self.unmarshal().properties
+        properties.decode()
+        for name in commands.Basic.Properties.__slots__:
+            self.assertTrue(self.is_decoded(properties, name))
+            self.assertEqual(getattr(properties, name),
+                             getattr(self.properties, name))
+
+    def test_decoded(self):
+        properties = self.unmarshal().properties
+        self.assertEqual(properties.app_id, 'test')
+        value = properties.decoded()
+        self.assertIs(value.__class__, commands.Basic.Properties)
+        self.assertEqual(value, self.properties)
+
+    def test_message_accessors(self):
+        msg = message.Message(
+            commands.Basic.Deliver('ctag', 1, False, 'exchange', 'rk'))
+        msg.header = self.unmarshal()
+        self.assertDictEqual(msg.headers, self.properties.headers)
+        self.assertEqual(msg.priority, 5)
+        self.assertIsNone(msg.expiration)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.unmarshal().properties.foo
+
+    def test_truncated_properties(self):
+        data = self.value.marshal()[:-8]
+        properties = message.unmarshal_content_header(data).properties
+        with self.assertRaises(exceptions.UnmarshalingException):
+            properties.app_id
+
+    def test_truncated_content_header(self):
+        with self.assertRaises(exceptions.UnmarshalingException):
+            message.unmarshal_content_header(b'\x00\x3c\x00')
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import unittest
+
+from aiorabbit import client, metrics
+from . import testing
+
+
+class HistogramTestCase(unittest.TestCase):
+
+    def test_observe(self):
+        histogram = metrics.Histogram((1, 2, 4))
+        for value in (0.5, 1, 1.5, 3, 3, 10):
+            histogram.observe(value)
+        self.assertListEqual(list(histogram.counts), [2, 1, 2, 1])
+        self.assertEqual(histogram.count, 6)
+        self.assertEqual(histogram.sum, 19)
+
+    def test_percentile(self):
+        histogram = metrics.Histogram((1, 2, 4))
+        self.assertIsNone(histogram.percentile(50))
+        for value in (0.5, 0.5, 1.5, 1.5):
+            histogram.observe(value)
+        self.assertEqual(histogram.percentile(25), 0.5)
+        self.assertEqual(histogram.percentile(50), 1)
+        self.assertEqual(histogram.percentile(100), 2)
+        histogram.observe(100)
+        self.assertEqual(histogram.percentile(100), 4)
+
+    def test_reset(self):
+        histogram = metrics.Histogram()
+        histogram.observe(0.01)
+        histogram.reset()
+        self.assertEqual(histogram.count, 0)
+        self.assertEqual(histogram.sum, 0)
+        self.assertEqual(sum(histogram.counts), 0)
+
+    def test_snapshot(self):
+        histogram = metrics.Histogram((1, 2))
+        histogram.observe(0.5)
+        histogram.observe(5)
+        self.assertDictEqual(histogram.snapshot(), {
+            'count': 2,
+            'sum': 5.5,
+            'p50': 1.0,
+            'p90': 2,
+            'p99': 2,
+            'buckets': {'1': 1, '2': 0, '+Inf': 1}})
+
+    def test_invalid_bounds(self):
+        for value in [(), (2, 1), (1, 1)]:
+            with self.assertRaises(ValueError):
+                metrics.Histogram(value)
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def test_observe_rpc(self):
+        obj = metrics.Metrics((1, 2))
+        obj.observe_rpc('Queue.Declare', 0.5)
+        obj.observe_rpc('Queue.Declare', 1.5)
+        self.assertEqual(obj.rpc_latency['Queue.Declare'].count, 2)
+        self.assertTupleEqual(obj.rpc_latency['Queue.Declare'].bounds, (1, 2))
+
+    def test_reset(self):
+        obj = metrics.Metrics()
+        obj.published = 10
+        obj.blocked_seconds = 1.5
+        obj.confirm_latency.observe(0.1)
+        obj.observe_rpc('Queue.Declare', 0.5)
+        obj.reset()
+        self.assertEqual(obj.published, 0)
+        self.assertEqual(obj.blocked_seconds, 0)
+        self.assertEqual(obj.confirm_latency.count, 0)
+        self.assertDictEqual(obj.rpc_latency, {})
+
+    def test_snapshot_is_json_serializable(self):
+        obj = metrics.Metrics()
+        obj.observe_rpc('Queue.Declare', 0.5)
+        value = json.loads(json.dumps(obj.snapshot()))
+        self.assertEqual(value['published'], 0)
+        self.assertEqual(value['rpc_latency']['Queue.Declare']['count'], 1)
+
+
+class ClientMetricsTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.metrics = metrics.Metrics()
+        self.client = client.Client(
+            self.rabbitmq_url, loop=self.loop, metrics=self.metrics)
+        self.queue = self.uuid4()
+
+    @testing.async_test
+    async def test_metrics(self):
+        self.assertIs(self.client.metrics, self.metrics)
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        await self.client.confirm_select()
+        for _offset in range(3):
+            self.assertTrue(
+                await self.client.publish('', self.queue, b'test'))
+        template = self.client.publish_template('', self.queue)
+        self.assertTrue(await template.publish(b'test'))
+        received = 0
+        async for value in self.client.consume(self.queue):
+            received += 1
+            if received == 1:
+                await self.client.basic_nack(value.delivery_tag, requeue=False)
+            elif received == 2:
+                await self.client.basic_reject(value.delivery_tag, False)
+            else:
+                await self.client.basic_ack(value.delivery_tag)
+            if received == 4:
+                break
+        await asyncio.sleep(0.1)
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['published'], 4)
+        self.assertEqual(snapshot['confirmed'], 4)
+        self.assertEqual(snapshot['confirm_latency']['count'], 4)
+        self.assertEqual(snapshot['deliveries'], 4)
+        self.assertEqual(snapshot['acks'], 2)
+        self.assertEqual(snapshot['nacks'], 1)
+        self.assertEqual(snapshot['rejects'], 1)
+        for name in ['Confirm.Select', 'Queue.Declare',
+                     'Basic.Consume']:
+            self.assertEqual(snapshot['rpc_latency'][name]['count'], 1)
+        self.assertGreater(snapshot['frames_sent'], 20)
+        self.assertGreater(snapshot['bytes_sent'], 0)
+        self.assertGreater(snapshot['frames_received'], 20)
+        self.assertGreater(snapshot['bytes_received'], 0)
+        self.assertDictEqual(self.client._publish_times, {})
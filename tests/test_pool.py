@@ -0,0 +1,104 @@
+import os
+
+from aiorabbit import pool
+from . import testing
+
+
+class PoolTestCase(testing.AsyncTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.rabbitmq_url = os.environ['RABBITMQ_URI']
+        self.pool = None
+
+    def tearDown(self) -> None:
+        if self.pool and not self.pool.is_closed:
+            self.loop.run_until_complete(self.pool.close())
+        super().tearDown()
+
+    def create_pool(self, **kwargs) -> pool.Pool:
+        self.pool = pool.Pool(self.rabbitmq_url, loop=self.loop, **kwargs)
+        return self.pool
+
+    @testing.async_test
+    async def test_lazy_warmup(self):
+        obj = self.create_pool(min_size=2, max_size=4)
+        self.assertEqual(obj.size, 0)
+        async with obj.acquire() as client:
+            self.assertTrue(client.is_connected)
+            self.assertEqual(obj.size, 2)
+            self.assertEqual(obj.in_use, 1)
+        self.assertEqual(obj.in_use, 0)
+
+    @testing.async_test
+    async def test_least_loaded_client_is_acquired(self):
+        obj = self.create_pool(min_size=2, max_size=2)
+        async with obj.acquire() as first:
+            async with obj.acquire() as second:
+                self.assertIsNot(first, second)
+                async with obj.acquire() as third:
+                    self.assertIn(third, [first, second])
+                    self.assertEqual(obj.size, 2)
+                    self.assertEqual(obj.in_use, 3)
+            async with obj.acquire() as fourth:
+                self.assertIs(fourth, second)
+
+    @testing.async_test
+    async def test_pool_grows_to_max_size(self):
+        obj = self.create_pool(min_size=0, max_size=2)
+        async with obj.acquire() as first:
+            self.assertEqual(obj.size, 1)
+            async with obj.acquire() as second:
+                self.assertIsNot(first, second)
+                self.assertEqual(obj.size, 2)
+                async with obj.acquire():
+                    self.assertEqual(obj.size, 2)
+        async with obj.acquire() as client:
+            self.assertIs(client, first)
+
+    @testing.async_test
+    async def test_disconnected_client_is_removed(self):
+        obj = self.create_pool(min_size=1, max_size=2)
+        async with obj.acquire() as first:
+            await first.close()
+        async with obj.acquire() as second:
+            self.assertIsNot(first, second)
+            self.assertTrue(second.is_connected)
+            self.assertEqual(obj.size, 1)
+
+    @testing.async_test
+    async def test_idle_client_is_evicted(self):
+        obj = self.create_pool(min_size=1, max_size=3, idle_timeout=0)
+        async with obj.acquire() as first:
+            async with obj.acquire() as second:
+                async with obj.acquire():
+                    self.assertEqual(obj.size, 3)
+        async with obj.acquire():
+            self.assertEqual(obj.size, 1)
+        self.assertTrue(first.is_closed or second.is_closed)
+
+    @testing.async_test
+    async def test_close(self):
+        obj = self.create_pool()
+        async with obj.acquire() as client:
+            pass
+        await obj.close()
+        self.assertTrue(obj.is_closed)
+        self.assertTrue(client.is_closed)
+        self.assertEqual(obj.size, 0)
+        with self.assertRaises(RuntimeError):
+            async with obj.acquire():
+                pass
+
+    @testing.async_test
+    async def test_validation_errors(self):
+        with self.assertRaises(TypeError):
+            pool.Pool(min_size='1', loop=self.loop)
+        with self.assertRaises(TypeError):
+            pool.Pool(max_size=1.5, loop=self.loop)
+        with self.assertRaises(ValueError):
+            pool.Pool(max_size=0, loop=self.loop)
+        with self.assertRaises(ValueError):
+            pool.Pool(min_size=3, max_size=2, loop=self.loop)
+        with self.assertRaises(ValueError):
+            pool.Pool(min_size=-1, loop=self.loop)
@@ -1,9 +1,18 @@
 import asyncio
 
+from pamqp import body, frame
+
 from aiorabbit import protocol
 from . import testing
 
 
+def feed(obj: protocol.AMQP, data: bytes) -> None:
+    """Feed data to the protocol the way a transport would"""
+    buffer = obj.get_buffer(len(data))
+    buffer[:len(data)] = data
+    obj.buffer_updated(len(data))
+
+
 class TestCase(testing.AsyncTestCase):
 
     @testing.async_test
@@ -13,20 +22,20 @@ class TestCase(testing.AsyncTestCase):
         obj = protocol.AMQP(callback, callback, callback)
         frame_data = (b'\x01\x00\x01\x00\x00\x00\x00\x00<\x00P\x00\x00\x00\x00'
                       b'\x00\x00\x00\x01\x00\xce')
-        obj.data_received(frame_data)
-        self.assertEqual(len(frame_data), len(obj.buffer))
+        feed(obj, frame_data)
+        self.assertEqual(len(frame_data), obj.pending)
 
     @testing.async_test
     async def test_split_frame(self):
         def callback(*args):
-            self.assertEqual(args[1].name, 'Tx.Select')
+            self.assertEqual(args[0][0][1].name, 'Tx.Select')
         obj = protocol.AMQP(callback, callback, callback)
         frame_data = b'\x01\x00\x01\x00\x00\x00\x04\x00'
-        obj.data_received(frame_data)
-        self.assertEqual(len(frame_data), len(obj.buffer))
+        feed(obj, frame_data)
+        self.assertEqual(len(frame_data), obj.pending)
         frame_data = b'Z\x00\n\xce'
-        obj.data_received(frame_data)
-        self.assertEqual(len(obj.buffer), 0)
+        feed(obj, frame_data)
+        self.assertEqual(obj.pending, 0)
 
     @testing.async_test
     async def test_multiple_frame(self):
@@ -38,17 +47,83 @@ class TestCase(testing.AsyncTestCase):
         def _on_disconnected(_exc):
             pass
 
-        def _on_frame(channel, frame):
-            calls.append((channel, frame))
+        def _on_frames(frames):
+            calls.append(frames)
 
-        obj = protocol.AMQP(_on_connected, _on_disconnected, _on_frame)
+        obj = protocol.AMQP(_on_connected, _on_disconnected, _on_frames)
         frame_data = b'\x01\x00\x01\x00\x00\x00\x04\x00Z\x00\n\xce'
         frame_data += b'\x01\x00\x01\x00\x00\x00\x04\x00Z\x00\n\xce'
         self.assertEqual(len(frame_data), 24)
-        obj.data_received(frame_data)
+        feed(obj, frame_data)
         await asyncio.sleep(0.1)  # Let the loop process calls
-        self.assertEqual(len(obj.buffer), 0)
-        self.assertEqual(len(calls), 2)
-        for call in calls:
+        self.assertEqual(obj.pending, 0)
+        self.assertEqual(len(calls), 1)  # Both frames in a single callback
+        self.assertEqual(len(calls[0]), 2)
+        for call in calls[0]:
             self.assertEqual(call[0], 1)  # Channel
             self.assertEqual(call[1].name, 'Tx.Select')
+
+    @testing.async_test
+    async def test_frame_larger_than_buffer(self):
+        calls = []
+
+        def callback(*args):
+            calls.append(args)
+
+        obj = protocol.AMQP(callback, callback, callback, 16)
+        frame_data = frame.marshal(body.ContentBody(b'0' * 1024), 1)
+        for offset in range(0, len(frame_data), 100):
+            feed(obj, frame_data[offset:offset + 100])
+        self.assertEqual(obj.pending, 0)
+        self.assertGreaterEqual(len(obj.buffer), len(frame_data))
+        await asyncio.sleep(0)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][0][0][1].value, b'0' * 1024)
+
+    @testing.async_test
+    async def test_buffer_is_compacted(self):
+        calls = []
+
+        def callback(*args):
+            calls.append(args)
+
+        obj = protocol.AMQP(callback, callback, callback, 8192)
+        obj._read_offset = obj._write_offset = 4091  # Simulate parsed data
+        frame_data = b'\x01\x00\x01\x00\x00\x00\x04\x00Z\x00\n\xce'
+        feed(obj, frame_data[:6])
+        self.assertEqual(obj.pending, 6)
+        feed(obj, frame_data[6:])
+        self.assertEqual(obj.pending, 0)
+        self.assertEqual(len(obj.buffer), 8192)
+        await asyncio.sleep(0)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][0][0][1].name, 'Tx.Select')
+
+    @testing.async_test
+    async def test_drain_waits_while_paused(self):
+        def callback(*args):
+            pass
+
+        obj = protocol.AMQP(callback, callback, callback)
+        self.assertFalse(obj.is_paused)
+        await obj.drain()
+        obj.pause_writing()
+        self.assertTrue(obj.is_paused)
+        task = self.loop.create_task(obj.drain())
+        await asyncio.sleep(0)
+        self.assertFalse(task.done())
+        obj.resume_writing()
+        await task
+        self.assertFalse(obj.is_paused)
+
+    @testing.async_test
+    async def test_connection_lost_releases_drain(self):
+        def callback(*args):
+            pass
+
+        obj = protocol.AMQP(callback, callback, callback)
+        obj.pause_writing()
+        task = self.loop.create_task(obj.drain())
+        await asyncio.sleep(0)
+        obj.connection_lost(None)
+        await task
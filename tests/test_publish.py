@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from unittest import mock
 import uuid
 
 from pamqp import constants
@@ -132,6 +133,17 @@ class PublishingTestCase(testing.ClientTestCase):
         await self.connect()
         await self.client.publish(self.exchange, self.routing_key, self.body)
 
+    @testing.async_test
+    async def test_publish_is_a_single_write(self):
+        await self.connect()
+        with mock.patch.object(
+                self.client._transport, 'writelines',
+                wraps=self.client._transport.writelines) as writelines:
+            await self.client.publish(
+                self.exchange, self.routing_key, self.body)
+        writelines.assert_called_once()
+        self.assertEqual(len(writelines.call_args[0][0]), 3)
+
     @testing.async_test
     async def test_minimal_publish_with_empty_routing_key(self):
         await self.connect()
@@ -205,3 +217,141 @@ class PublishingTestCase(testing.ClientTestCase):
         result = await self.client.publish(
             '', self.routing_key, self.body, mandatory=True)
         self.assertTrue(result)
+
+
+class PipelinedPublishingTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.routing_key = str(uuid.uuid4())
+        self.body = bytes(uuid.uuid4().hex, 'latin-1')
+
+    @testing.async_test
+    async def test_publish_pipelined(self):
+        await self.connect()
+        await self.client.confirm_select(max_in_flight=10)
+        confirmations = [
+            await self.client.publish_pipelined('', self.routing_key, body)
+            for body in [self.body] * 50]
+        self.assertListEqual(
+            await asyncio.gather(*confirmations), [True] * 50)
+        self.assertDictEqual(self.client._delivery_tags, {})
+
+    @testing.async_test
+    async def test_publish_pipelined_without_confirms(self):
+        await self.connect()
+        with self.assertRaises(RuntimeError):
+            await self.client.publish_pipelined(
+                '', self.routing_key, self.body)
+
+    @testing.async_test
+    async def test_publish_pipelined_waits_on_window(self):
+        await self.connect()
+        await self.client.confirm_select(max_in_flight=1)
+        self.client._delivery_tags[1000] = self.loop.create_future()
+        task = self.loop.create_task(
+            self.client.publish_pipelined('', self.routing_key, self.body))
+        await asyncio.sleep(0.01)
+        self.assertFalse(task.done())
+        self.client._set_delivery_tag_result(1000, False, True)
+        self.assertTrue(await (await task))
+
+    @testing.async_test
+    async def test_publish_pipelined_channel_closed(self):
+        await self.connect()
+        await self.client.confirm_select()
+        future = await self.client.publish_pipelined(
+            self.uuid4(), self.routing_key, self.body)
+        with self.assertRaises(exceptions.NotFound):
+            await future
+        self.assertTrue(await self.client.publish(
+            '', self.routing_key, self.body))
+
+    @testing.async_test
+    async def test_confirm_select_validation_errors(self):
+        await self.connect()
+        with self.assertRaises(TypeError):
+            await self.client.confirm_select('1')
+        with self.assertRaises(ValueError):
+            await self.client.confirm_select(0)
+
+
+class PublishManyTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.queue = self.uuid4()
+        self.messages = [
+            {'exchange': '', 'routing_key': self.queue,
+             'message_body': self.uuid4(), 'delivery_mode': 2}
+            for _offset in range(10)]
+
+    async def setup_queue(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+
+    async def message_count(self) -> int:
+        msgs, _consumers = await self.client.queue_declare(self.queue)
+        return msgs
+
+    def patch_writelines(self):
+        return mock.patch.object(
+            self.client._transport, 'writelines',
+            wraps=self.client._transport.writelines)
+
+    @testing.async_test
+    async def test_publish_many(self):
+        await self.setup_queue()
+        with self.patch_writelines() as writelines:
+            self.assertIsNone(
+                await self.client.publish_many(iter(self.messages)))
+        writelines.assert_called_once()
+        self.assertEqual(len(writelines.call_args[0][0]), 30)
+        self.assertEqual(await self.message_count(), 10)
+        await self.client.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_publish_many_with_confirms(self):
+        await self.setup_queue()
+        await self.client.confirm_select()
+        with self.patch_writelines() as writelines:
+            self.assertListEqual(
+                await self.client.publish_many(self.messages), [True] * 10)
+        writelines.assert_called_once()
+        self.assertDictEqual(self.client._delivery_tags, {})
+        await self.client.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_publish_many_with_confirm_window(self):
+        await self.setup_queue()
+        await self.client.confirm_select(max_in_flight=3)
+        with self.patch_writelines() as writelines:
+            self.assertListEqual(
+                await self.client.publish_many(self.messages), [True] * 10)
+        self.assertEqual(writelines.call_count, 4)
+        self.assertEqual(await self.message_count(), 10)
+        await self.client.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_publish_many_validates_before_writing(self):
+        await self.setup_queue()
+        self.messages[5]['delivery_mode'] = 3
+        with self.patch_writelines() as writelines:
+            with self.assertRaises(ValueError):
+                await self.client.publish_many(self.messages)
+        writelines.assert_not_called()
+        with self.assertRaises(TypeError):
+            await self.client.publish_many([{'body': b'foo'}])
+        self.assertEqual(await self.message_count(), 0)
+        await self.client.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_publish_many_channel_closed(self):
+        await self.connect()
+        await self.client.confirm_select()
+        for value in self.messages:
+            value['exchange'] = self.uuid4()
+        with self.assertRaises(exceptions.NotFound):
+            await self.client.publish_many(self.messages)
+        self.assertTrue(await self.client.publish(
+            '', self.queue, b'Hello World!'))
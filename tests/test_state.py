@@ -1,3 +1,5 @@
+import asyncio
+
 from aiorabbit import exceptions, state
 from . import testing
 
@@ -79,3 +81,33 @@ class TestCase(testing.AsyncTestCase):
         self.loop.call_soon(self.obj.set_exception, RuntimeError)
         with self.assertRaises(RuntimeError):
             await self.obj._wait_on_state(STATE_BAR)
+
+    @testing.async_test
+    async def test_exception_set_before_waiting(self):
+        self.obj.set_exception(RuntimeError('foo'))
+        with self.assertRaises(RuntimeError):
+            await self.obj._wait_on_state(STATE_BAR)
+        self.assertIsNone(self.obj.exception)
+
+    @testing.async_test
+    async def test_multiple_waiters(self):
+        waiters = asyncio.gather(
+            self.obj._wait_on_state(STATE_FOO),
+            self.obj._wait_on_state(STATE_FOO, STATE_BAR))
+        await asyncio.sleep(0)
+        self.obj.set_state(STATE_FOO)
+        results = await waiters
+        self.assertListEqual(results, [STATE_FOO, STATE_FOO])
+        self.assertFalse(any(self.obj._waits.values()))
+
+    @testing.async_test
+    async def test_cancelled_waiter_is_cleared(self):
+        task = self.loop.create_task(self.obj._wait_on_state(STATE_FOO))
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.obj._waits[STATE_FOO]), 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertDictEqual(self.obj._waits[STATE_FOO], {})
+        self.obj.set_state(STATE_FOO)
+        self.assert_state(STATE_FOO)
@@ -0,0 +1,125 @@
+import datetime
+import uuid
+
+from pamqp import frame
+
+from aiorabbit import exceptions, template
+from . import testing
+
+
+class PublishTemplateTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.queue = self.uuid4()
+        self.properties = {
+            'app_id': 'test',
+            'content_encoding': 'gzip',
+            'content_type': 'application/json',
+            'correlation_id': self.uuid4(),
+            'delivery_mode': 2,
+            'expiration': '60000',
+            'message_type': 'test',
+            'priority': 5,
+            'reply_to': self.uuid4(),
+            'user_id': 'guest'}
+
+    def expectation(self, channel: int, **kwargs) -> bytes:
+        frames = self.client._message_frames(
+            'amq.direct', self.queue, mandatory=True,
+            **self.properties, **kwargs)
+        return b''.join(frame.marshal(value, channel) for value in frames)
+
+    @staticmethod
+    def marshal(obj: template.PublishTemplate, channel: int,
+                message_body: bytes = b'', message_id=None,
+                timestamp=None, headers=None) -> bytes:
+        return b''.join(obj._marshal(
+            message_body, message_id, timestamp, headers, channel))
+
+    @testing.async_test
+    async def test_marshal_matches_publish(self):
+        await self.connect()
+        obj = self.client.publish_template(
+            'amq.direct', self.queue, True, **self.properties)
+        body = uuid.uuid4().bytes * 10000
+        headers = {'foo': 'bar', 'nested': {'baz': [1, 2, 3]}}
+        message_id = self.uuid4()
+        timestamp = datetime.datetime(2020, 4, 1, 12, 30, 0)
+        self.assertEqual(
+            self.marshal(obj, 1), self.expectation(1))
+        self.assertEqual(
+            self.marshal(obj, 2, body, message_id, timestamp, headers),
+            self.expectation(
+                2, message_body=body, message_id=message_id,
+                timestamp=timestamp, headers=headers))
+        self.assertEqual(
+            self.marshal(obj, 3, body, headers=headers),
+            self.expectation(3, message_body=body, headers=headers))
+        self.assertEqual(
+            self.marshal(obj, 4, timestamp=timestamp),
+            self.expectation(4, timestamp=timestamp))
+        self.assertListEqual(sorted(obj._method_frames), [1, 2, 3, 4])
+
+    @testing.async_test
+    async def test_marshal_without_properties(self):
+        await self.connect()
+        self.properties = {}
+        obj = self.client.publish_template('amq.direct', self.queue, True)
+        self.assertEqual(self.marshal(obj, 1, b'foo', message_id='1'),
+                         self.expectation(1, message_body=b'foo',
+                                          message_id='1'))
+
+    @testing.async_test
+    async def test_publish(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        await self.client.confirm_select()
+        obj = self.client.publish_template(
+            '', self.queue, content_type='text/plain', delivery_mode=2)
+        self.assertTrue(await obj.publish(
+            'Hello World!', message_id='1', headers={'foo': 'bar'}))
+        self.assertTrue(await (await obj.publish_pipelined(b'Bye')))
+        msg = await self.client.basic_get(self.queue)
+        self.assertEqual(msg.body, b'Hello World!')
+        self.assertEqual(msg.content_type, 'text/plain')
+        self.assertEqual(msg.delivery_mode, 2)
+        self.assertEqual(msg.message_id, '1')
+        self.assertDictEqual(msg.headers, {'foo': 'bar'})
+        msg = await self.client.basic_get(self.queue)
+        self.assertEqual(msg.body, b'Bye')
+        self.assertIsNone(msg.message_id)
+        await self.client.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_publish_after_channel_reopened(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        obj = self.client.publish_template('', self.queue)
+        await obj.publish(b'first')
+        with self.assertRaises(exceptions.NotFound):
+            await self.client.queue_declare(self.uuid4(), passive=True)
+        await obj.publish(b'second')
+        self.assertEqual(len(obj._method_frames), 2)
+        msgs, _consumers = await self.client.queue_declare(self.queue)
+        self.assertEqual(msgs, 2)
+        await self.client.queue_delete(self.queue)
+
+    @testing.async_test
+    async def test_validation_errors(self):
+        await self.connect()
+        with self.assertRaises(TypeError):
+            self.client.publish_template(1)
+        with self.assertRaises(ValueError):
+            self.client.publish_template(delivery_mode=3)
+        obj = self.client.publish_template()
+        with self.assertRaises(TypeError):
+            await obj.publish(1)
+        with self.assertRaises(TypeError):
+            await obj.publish(b'', message_id=1)
+        with self.assertRaises(TypeError):
+            await obj.publish(b'', timestamp=1)
+        with self.assertRaises(TypeError):
+            await obj.publish(b'', headers=1)
+        with self.assertRaises(RuntimeError):
+            await obj.publish_pipelined(b'')
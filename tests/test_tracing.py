@@ -0,0 +1,82 @@
+import time
+
+from pamqp import commands, frame
+
+from aiorabbit import tracing
+from . import testing
+
+
+class FrameTracingTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.queue = self.uuid4()
+        self.received = []
+        self.sent = []
+        self.client.register_frame_received_callback(self.on_received)
+        self.client.register_frame_sent_callback(self.on_sent)
+
+    def on_received(self, *args) -> None:
+        self.received.append(args)
+
+    def on_sent(self, *args) -> None:
+        self.sent.append(args)
+
+    @testing.async_test
+    async def test_connection_frames(self):
+        start = time.monotonic()
+        await self.connect()
+        self.assertEqual(self.sent[0][:3], (0, 'ProtocolHeader', 8))
+        self.assertListEqual(
+            [value[1] for value in self.sent[1:]],
+            ['Connection.StartOk', 'Connection.TuneOk', 'Connection.Open',
+             'Channel.Open'])
+        self.assertEqual(self.sent[-1][0], self.client._channel)
+        self.assertListEqual(
+            [value[1] for value in self.received],
+            ['Connection.Start', 'Connection.Tune', 'Connection.OpenOk',
+             'Channel.OpenOk'])
+        for value in self.sent + self.received:
+            self.assertGreaterEqual(value[3], start)
+        self.assertEqual(
+            self.received[-1][2],
+            len(frame.marshal(commands.Channel.OpenOk(), 1)))
+
+    @testing.async_test
+    async def test_publish_frames(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        self.sent.clear()
+        await self.client.publish('', self.queue, b'x' * 10)
+        channel = self.client._channel
+        expectation = [
+            (channel, value.name, len(frame.marshal(value, channel)))
+            for value in self.client._message_frames(
+                '', self.queue, b'x' * 10)]
+        self.assertListEqual(
+            [value[:3] for value in self.sent], expectation)
+        self.sent.clear()
+        await self.client.publish_template('', self.queue).publish(
+            b'x' * 10)
+        self.assertListEqual(
+            [value[:3] for value in self.sent], expectation)
+
+    @testing.async_test
+    async def test_unregister(self):
+        self.client.unregister_frame_callback(self.on_received)
+        self.client.unregister_frame_callback(self.on_sent)
+        await self.connect()
+        self.assertListEqual(self.received, [])
+        self.assertListEqual(self.sent, [])
+        with self.assertRaises(ValueError):
+            self.client.unregister_frame_callback(self.on_sent)
+
+    @testing.async_test
+    async def test_callback_error_is_logged(self):
+        def on_frame(*_args):
+            raise RuntimeError('callback failure')
+
+        self.client.register_frame_sent_callback(on_frame)
+        with self.assertLogs(tracing.LOGGER, 'ERROR'):
+            await self.connect()
+        self.assertEqual(len(self.sent), 5)
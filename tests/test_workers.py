@@ -0,0 +1,565 @@
+import asyncio
+import concurrent.futures
+import os
+from unittest import mock
+
+from pamqp import commands
+
+from aiorabbit import client, message, workers
+from . import testing
+
+
+def reverse_body(body: bytes, properties: dict) -> bytes:
+    if properties['content_type'] != 'text/plain':
+        raise ValueError('Unsupported content type')
+    return body[::-1]
+
+
+class WorkerPoolTestCase(testing.AsyncTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = mock.Mock(spec=client.Client)
+        self.client._loop = self.loop
+        self.processing = 0
+        self.max_processing = 0
+        self.processed = []
+        self.release = asyncio.Event()
+        self.pool = None
+
+    def tearDown(self) -> None:
+        if self.pool:
+            self.pool.cancel()
+            self.loop.run_until_complete(self.wait_for_workers())
+        super().tearDown()
+
+    def create_pool(self, *args) -> workers.WorkerPool:
+        self.pool = workers.WorkerPool(self.client, *args)
+        return self.pool
+
+    async def wait_for_workers(self) -> None:
+        while self.pool._workers:
+            await asyncio.sleep(0.01)
+
+    @staticmethod
+    def new_message(delivery_tag: int) -> message.Message:
+        return message.Message(commands.Basic.Deliver(
+            'ctag', delivery_tag, False, 'exchange', 'rk'))
+
+    async def callback(self, value: message.Message) -> None:
+        self.processing += 1
+        self.max_processing = max(self.processing, self.max_processing)
+        await self.release.wait()
+        self.processing -= 1
+        self.processed.append(value.delivery_tag)
+
+    @testing.async_test
+    async def test_concurrency_limit(self):
+        pool = self.create_pool(self.callback, 3)
+        for delivery_tag in range(1, 6):
+            pool(self.new_message(delivery_tag))
+        await asyncio.sleep(0)
+        self.assertEqual(self.processing, 3)
+        self.assertEqual(len(pool._workers), 3)
+        self.assertEqual(pool._queue.qsize(), 2)
+        self.assertEqual(pool.busy, 5)
+        self.release.set()
+        while len(self.processed) < 5:
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.max_processing, 3)
+        self.assertListEqual(sorted(self.processed), [1, 2, 3, 4, 5])
+        self.assertEqual(pool.busy, 0)
+
+    @testing.async_test
+    async def test_sync_callback(self):
+        pool = self.create_pool(
+            lambda value: self.processed.append(value), 2)
+        value = self.new_message(1)
+        pool(value)
+        await asyncio.sleep(0)
+        self.assertListEqual(self.processed, [value])
+
+    @testing.async_test
+    async def test_on_error(self):
+        error = RuntimeError('Test')
+
+        def callback(_value):
+            raise error
+
+        on_error = mock.Mock()
+        pool = self.create_pool(callback, 1, on_error)
+        value = self.new_message(1)
+        pool(value)
+        pool(self.new_message(2))
+        await asyncio.sleep(0.01)
+        self.client._execute_callback.assert_called_with(
+            on_error, mock.ANY, error)
+        self.assertEqual(self.client._execute_callback.call_count, 2)
+        self.assertEqual(pool.busy, 0)
+
+    @testing.async_test
+    async def test_error_is_logged(self):
+        def callback(_value):
+            raise RuntimeError('Test')
+
+        pool = self.create_pool(callback, 1)
+        with self.assertLogs('aiorabbit.workers', 'ERROR'):
+            pool(self.new_message(1))
+            await asyncio.sleep(0.01)
+
+    @testing.async_test
+    async def test_close_processes_queued_messages(self):
+        pool = self.create_pool(self.callback, 2)
+        for delivery_tag in range(1, 5):
+            pool(self.new_message(delivery_tag))
+        pool.close()
+        self.release.set()
+        await asyncio.wait_for(self.wait_for_workers(), 1)
+        self.assertListEqual(sorted(self.processed), [1, 2, 3, 4])
+
+    @testing.async_test
+    async def test_cancel(self):
+        pool = self.create_pool(self.callback, 1)
+        pool(self.new_message(1))
+        pool(self.new_message(2))
+        await asyncio.sleep(0)
+        pool.cancel()
+        await asyncio.wait_for(self.wait_for_workers(), 1)
+        self.assertListEqual(self.processed, [])
+
+
+class PartitionedWorkerPoolTestCase(WorkerPoolTestCase):
+
+    def create_pool(self, callback, concurrency, on_error=None):
+        self.pool = workers.PartitionedWorkerPool(
+            self.client, callback, concurrency,
+            lambda value: value.delivery_tag % 2, on_error)
+        return self.pool
+
+    async def callback(self, value: message.Message) -> None:
+        self.processing += 1
+        self.max_processing = max(self.processing, self.max_processing)
+        await asyncio.sleep(0.001 * (10 - value.delivery_tag))
+        self.processing -= 1
+        self.processed.append(value.delivery_tag)
+
+    @testing.async_test
+    async def test_concurrency_limit(self):
+        pool = self.create_pool(self.callback, 2)
+        for delivery_tag in range(1, 9):
+            pool(self.new_message(delivery_tag))
+        await asyncio.sleep(0)
+        self.assertEqual(self.processing, 2)
+        self.assertListEqual(
+            [lane.qsize() for lane in pool._lanes], [3, 3])
+        while len(self.processed) < 8:
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.max_processing, 2)
+        self.assertListEqual(
+            [value for value in self.processed if value % 2], [1, 3, 5, 7])
+        self.assertListEqual(
+            [value for value in self.processed if not value % 2],
+            [2, 4, 6, 8])
+
+    @testing.async_test
+    async def test_key_error(self):
+        error = KeyError('customer_id')
+
+        def key(_value):
+            raise error
+
+        on_error = mock.Mock()
+        self.pool = workers.PartitionedWorkerPool(
+            self.client, self.callback, 2, key, on_error)
+        self.pool(self.new_message(1))
+        self.client._execute_callback.assert_called_once_with(
+            on_error, mock.ANY, error)
+        self.assertEqual(self.pool.busy, 0)
+        self.assertDictEqual(self.pool._workers, {})
+
+    @testing.async_test
+    async def test_cancel(self):
+        self.release.clear()
+        pool = workers.PartitionedWorkerPool(
+            self.client, super().callback, 1, lambda value: 0)
+        self.pool = pool
+        pool(self.new_message(1))
+        pool(self.new_message(2))
+        await asyncio.sleep(0)
+        pool.cancel()
+        await asyncio.wait_for(self.wait_for_workers(), 1)
+        self.assertListEqual(self.processed, [])
+
+
+class ExecutorWorkerPoolTestCase(WorkerPoolTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.executor = concurrent.futures.ThreadPoolExecutor(2)
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.executor.shutdown()
+
+    def create_pool(self, *args, **kwargs) -> workers.WorkerPool:
+        self.pool = workers.ExecutorWorkerPool(
+            self.client, reverse_body, 2, self.executor,
+            ('content_type',), *args, **kwargs)
+        return self.pool
+
+    @staticmethod
+    def new_message(delivery_tag: int,
+                    content_type: str = 'text/plain') -> message.Message:
+        value = message.Message(commands.Basic.Deliver(
+            'ctag', delivery_tag, False, 'exchange', 'rk'))
+        value.header = mock.Mock(
+            properties=commands.Basic.Properties(content_type=content_type))
+        value._body = b'body'
+        return value
+
+    @testing.async_test
+    async def test_concurrency_limit(self):
+        pool = self.create_pool()
+        for delivery_tag in range(1, 4):
+            pool(self.new_message(delivery_tag))
+        self.assertEqual(len(pool._workers), 2)
+        while pool.busy:
+            await asyncio.sleep(0.01)
+        self.client.basic_ack.assert_has_calls(
+            [mock.call(1), mock.call(2), mock.call(3)], any_order=True)
+
+    @testing.async_test
+    async def test_sync_callback(self):
+        results = []
+        pool = self.create_pool(
+            lambda value, result: results.append((value.delivery_tag, result)))
+        pool(self.new_message(1))
+        while pool.busy:
+            await asyncio.sleep(0.01)
+        self.assertListEqual(results, [(1, b'ydob')])
+        self.client.basic_ack.assert_not_called()
+
+    @testing.async_test
+    async def test_on_result_coroutine(self):
+        async def on_result(value, result):
+            await self.client.basic_nack(value.delivery_tag)
+            results.append(result)
+
+        results = []
+        pool = self.create_pool(on_result)
+        pool(self.new_message(1))
+        while pool.busy:
+            await asyncio.sleep(0.01)
+        self.assertListEqual(results, [b'ydob'])
+        self.client.basic_nack.assert_called_once_with(1)
+
+    @testing.async_test
+    async def test_on_result_error(self):
+        def on_result(_value, _result):
+            raise RuntimeError('on_result failure')
+
+        pool = self.create_pool(on_result)
+        with self.assertLogs('aiorabbit.workers', 'ERROR'):
+            pool(self.new_message(1))
+            while pool.busy:
+                await asyncio.sleep(0.01)
+
+    @testing.async_test
+    async def test_on_error(self):
+        on_error = mock.Mock()
+        pool = self.create_pool(None, on_error)
+        value = self.new_message(1, 'application/json')
+        pool(value)
+        while pool.busy:
+            await asyncio.sleep(0.01)
+        args = self.client._execute_callback.call_args[0]
+        self.assertEqual(args[:2], (on_error, value))
+        self.assertIsInstance(args[2], ValueError)
+        self.client.basic_reject.assert_not_called()
+
+    @testing.async_test
+    async def test_error_is_logged(self):
+        pool = self.create_pool()
+        with self.assertLogs('aiorabbit.workers', 'ERROR'):
+            pool(self.new_message(1, 'application/json'))
+            while pool.busy:
+                await asyncio.sleep(0.01)
+        self.client.basic_reject.assert_called_once_with(1, False)
+
+    @testing.async_test
+    async def test_close_processes_queued_messages(self):
+        pool = self.create_pool()
+        for delivery_tag in range(1, 4):
+            pool(self.new_message(delivery_tag))
+        pool.close()
+        await asyncio.wait_for(self.wait_for_workers(), 1)
+        self.assertEqual(self.client.basic_ack.call_count, 3)
+
+    @testing.async_test
+    async def test_cancel(self):
+        pool = self.create_pool()
+        pool(self.new_message(1))
+        pool.cancel()
+        await asyncio.wait_for(self.wait_for_workers(), 1)
+        self.client.basic_ack.assert_not_called()
+
+
+class ConcurrentConsumerTestCase(testing.ClientTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.queue = self.uuid4()
+        self.received = []
+
+    async def on_message(self, value: message.Message) -> None:
+        await asyncio.sleep(0.01)
+        self.received.append(value.body)
+        await self.client.basic_ack(value.delivery_tag)
+
+    async def wait_for_received(self, count: int) -> None:
+        while len(self.received) < count:
+            await asyncio.sleep(0.01)
+
+    @testing.async_test
+    async def test_consume_with_concurrency(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        for offset in range(10):
+            await self.client.publish('', self.queue, str(offset))
+        consumer_tag = await self.client.basic_consume(
+            self.queue, callback=self.on_message, concurrency=3)
+        pool = self.client._consumers[consumer_tag]
+        self.assertIsInstance(pool, workers.WorkerPool)
+        while len(self.received) < 10:
+            await asyncio.sleep(0.01)
+        self.assertLessEqual(len(pool._workers), 3)
+        await self.client.basic_cancel(consumer_tag)
+        self.assertNotIn(consumer_tag, self.client._consumers)
+        while pool._workers:
+            await asyncio.sleep(0.01)
+        self.assertSetEqual(
+            set(self.received), {str(v).encode() for v in range(10)})
+
+    @testing.async_test
+    async def test_consume_with_partition_key(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        for offset in range(10):
+            await self.client.publish(
+                '', self.queue, str(offset), headers={'key': offset % 3})
+        consumer_tag = await self.client.basic_consume(
+            self.queue, callback=self.on_message, concurrency=3,
+            partition_key=lambda value: value.headers['key'])
+        self.assertIsInstance(self.client._consumers[consumer_tag],
+                              workers.PartitionedWorkerPool)
+        while len(self.received) < 10:
+            await asyncio.sleep(0.01)
+        await self.client.basic_cancel(consumer_tag)
+        for key in range(3):
+            self.assertListEqual(
+                [value for value in self.received if int(value) % 3 == key],
+                [str(value).encode() for value in range(key, 10, 3)])
+
+    @testing.async_test
+    async def test_prefetch_is_not_changed(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        await self.client.qos_prefetch(25, True)
+        with mock.patch.object(self.client, '_send_rpc',
+                               wraps=self.client._send_rpc) as send_rpc:
+            consumer_tag = await self.client.basic_consume(
+                self.queue, callback=self.on_message, concurrency=3)
+            await self.client.basic_consume(
+                self.queue, callback=self.on_message)
+        self.assertListEqual(
+            [call[0][0].name for call in send_rpc.call_args_list],
+            ['Basic.Consume', 'Basic.Consume'])
+        await self.client.basic_cancel(consumer_tag)
+
+    @testing.async_test
+    async def test_callback_waits_for_publisher_confirmations(self):
+        await self.connect()
+        await self.client.confirm_select()
+        await self.client.queue_declare(self.queue)
+        for offset in range(10):
+            await self.client.publish('', self.queue, str(offset))
+        forwarded = self.uuid4()
+        await self.client.queue_declare(forwarded)
+
+        async def on_message(value: message.Message) -> None:
+            self.assertTrue(self.client._transport.is_reading())
+            self.assertTrue(
+                await self.client.publish('', forwarded, value.body))
+            self.received.append(value.body)
+            await self.client.basic_ack(value.delivery_tag)
+
+        consumer_tag = await self.client.basic_consume(
+            self.queue, callback=on_message, concurrency=1)
+        await asyncio.wait_for(self.wait_for_received(10), 5)
+        await self.client.basic_cancel(consumer_tag)
+        msgs, _consumers = await self.client.queue_declare(forwarded)
+        self.assertEqual(msgs, 10)
+
+    @testing.async_test
+    async def test_partitioned_callback_waits_for_publisher_confirmations(
+            self):
+        await self.connect()
+        await self.client.confirm_select()
+        await self.client.queue_declare(self.queue)
+        for offset in range(10):
+            await self.client.publish(
+                '', self.queue, str(offset), headers={'key': offset % 2})
+        forwarded = self.uuid4()
+        await self.client.queue_declare(forwarded)
+
+        async def on_message(value: message.Message) -> None:
+            self.assertTrue(self.client._transport.is_reading())
+            self.assertTrue(
+                await self.client.publish('', forwarded, value.body))
+            self.received.append(value.body)
+            await self.client.basic_ack(value.delivery_tag)
+
+        consumer_tag = await self.client.basic_consume(
+            self.queue, callback=on_message, concurrency=2,
+            partition_key=lambda value: value.headers['key'])
+        await asyncio.wait_for(self.wait_for_received(10), 5)
+        await self.client.basic_cancel(consumer_tag)
+        for key in range(2):
+            self.assertListEqual(
+                [value for value in self.received if int(value) % 2 == key],
+                [str(value).encode() for value in range(key, 10, 2)])
+        msgs, _consumers = await self.client.queue_declare(forwarded)
+        self.assertEqual(msgs, 10)
+
+    @testing.async_test
+    async def test_workers_cancelled_on_close(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        await self.client.publish('', self.queue, b'test')
+        release = asyncio.Event()
+        consumer_tag = await self.client.basic_consume(
+            self.queue, callback=lambda _value: release.wait(),
+            concurrency=1)
+        pool = self.client._consumers[consumer_tag]
+        while not pool._workers:
+            await asyncio.sleep(0.01)
+        await self.client.close()
+        while pool._workers:
+            await asyncio.sleep(0.01)
+
+    @testing.async_test
+    async def test_validation_errors(self):
+        await self.connect()
+        with self.assertRaises(TypeError):
+            await self.client.basic_consume(
+                self.queue, callback=self.on_message, concurrency='1')
+        with self.assertRaises(ValueError):
+            await self.client.basic_consume(
+                self.queue, callback=self.on_message, concurrency=0)
+        with self.assertRaises(TypeError):
+            await self.client.basic_consume(
+                self.queue, callback=self.on_message, concurrency=1,
+                on_error=1)
+        with self.assertRaises(TypeError):
+            await self.client.basic_consume(
+                self.queue, callback=self.on_message, concurrency=1,
+                partition_key='routing_key')
+        with self.assertRaises(ValueError):
+            await self.client.basic_consume(
+                self.queue, callback=self.on_message,
+                partition_key=lambda value: value.routing_key)
+
+    @testing.async_test
+    async def test_consume_in_executor(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        for offset in range(5):
+            await self.client.publish(
+                '', self.queue, 'test-{}'.format(offset),
+                content_type='text/plain')
+        await self.client.publish(
+            '', self.queue, b'{}', content_type='application/json')
+        errors = []
+
+        async def on_error(value, error):
+            errors.append((value.body, error))
+            await self.client.basic_reject(value.delivery_tag, False)
+
+        async def on_result(value, result):
+            self.received.append(result)
+            await self.client.basic_ack(value.delivery_tag)
+
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            consumer_tag = await self.client.consume_in_executor(
+                self.queue, reverse_body, executor, 2,
+                on_result=on_result, on_error=on_error)
+            self.assertIsInstance(self.client._consumers[consumer_tag],
+                                  workers.ExecutorWorkerPool)
+            while len(self.received) + len(errors) < 6:
+                await asyncio.sleep(0.01)
+            await self.client.basic_cancel(consumer_tag)
+        self.assertSetEqual(
+            set(self.received),
+            {'test-{}'.format(v).encode()[::-1] for v in range(5)})
+        self.assertEqual(errors[0][0], b'{}')
+        self.assertIsInstance(errors[0][1], ValueError)
+        msgs, _consumers = await self.client.queue_declare(self.queue)
+        self.assertEqual(msgs, 0)
+
+    @testing.async_test
+    async def test_consume_in_executor_multiple_frame_body(self):
+        await self.connect()
+        await self.client.queue_declare(self.queue)
+        await self.client.qos_prefetch(5, True)
+        value = os.urandom(self.client._channel0.max_frame_size * 2)
+        await self.client.publish(
+            '', self.queue, value, content_type='text/plain')
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            with mock.patch.object(self.client, '_send_rpc',
+                                   wraps=self.client._send_rpc) as send_rpc:
+                consumer_tag = await self.client.consume_in_executor(
+                    self.queue, reverse_body, executor, 2,
+                    on_result=lambda _value, result:
+                    self.received.append(result))
+            self.assertListEqual(
+                [call[0][0].name for call in send_rpc.call_args_list],
+                ['Basic.Consume'])
+            while not self.received:
+                await asyncio.sleep(0.01)
+            await self.client.basic_cancel(consumer_tag)
+        self.assertIsInstance(self.received[0], bytes)
+        self.assertEqual(self.received[0], value[::-1])
+
+    @testing.async_test
+    async def test_consume_in_executor_validation_errors(self):
+        await self.connect()
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            with self.assertRaises(ValueError):
+                await self.client.consume_in_executor(
+                    self.queue, None, executor)
+            with self.assertRaises(TypeError):
+                await self.client.consume_in_executor(
+                    self.queue, 'reverse_body', executor)
+            with self.assertRaises(TypeError):
+                await self.client.consume_in_executor(
+                    self.queue, reverse_body, object())
+            with self.assertRaises(TypeError):
+                await self.client.consume_in_executor(
+                    self.queue, reverse_body, executor, '1')
+            with self.assertRaises(ValueError):
+                await self.client.consume_in_executor(
+                    self.queue, reverse_body, executor, 0)
+            with self.assertRaises(TypeError):
+                await self.client.consume_in_executor(
+                    self.queue, reverse_body, executor,
+                    properties='headers')
+            with self.assertRaises(ValueError):
+                await self.client.consume_in_executor(
+                    self.queue, reverse_body, executor,
+                    properties=['body'])
+            with self.assertRaises(TypeError):
+                await self.client.consume_in_executor(
+                    self.queue, reverse_body, executor, on_result=1)
+            with self.assertRaises(TypeError):
+                await self.client.consume_in_executor(
+                    self.queue, reverse_body, executor, on_error=1)